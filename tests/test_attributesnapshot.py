@@ -0,0 +1,66 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for attributes snapshot file format
+"""
+
+import os
+from collections import OrderedDict
+
+from tpRigToolkit.dccs.maya.data import attributesnapshot
+
+
+def _get_snapshot():
+    return OrderedDict([
+        ('ctrl_a', OrderedDict([('translateX', 1.5), ('visibility', True), ('rotateOrder', 3)])),
+        (u'ctrl_b', OrderedDict([('displayName', u'Contñol'), ('color', [0.1, 0.2, 0.3])])),
+        ('ctrl_c', OrderedDict([('scaleY', 2.0)])),
+    ])
+
+
+def test_snapshot_round_trip(tmp_path):
+    folder_path = str(tmp_path)
+    assert not attributesnapshot.has_snapshot_file(folder_path)
+    attributesnapshot.write_snapshot(folder_path, _get_snapshot())
+    assert attributesnapshot.has_snapshot_file(folder_path)
+
+    snapshot = attributesnapshot.read_snapshot(folder_path)
+    assert list(snapshot.keys()) == ['ctrl_a', 'ctrl_b', 'ctrl_c']
+    for node, attribute_values in _get_snapshot().items():
+        assert snapshot[node] == list(attribute_values.items())
+
+
+def test_snapshot_partial_read(tmp_path):
+    folder_path = str(tmp_path)
+    attributesnapshot.write_snapshot(folder_path, _get_snapshot())
+
+    assert list(attributesnapshot.read_index(folder_path).keys()) == ['ctrl_a', 'ctrl_b', 'ctrl_c']
+    snapshot = attributesnapshot.read_snapshot(folder_path, nodes=['ctrl_c', 'missing', 'ctrl_b'])
+    assert list(snapshot.keys()) == ['ctrl_c', 'ctrl_b']
+    assert snapshot['ctrl_b'] == [('displayName', u'Contñol'), ('color', [0.1, 0.2, 0.3])]
+
+
+def _write_legacy_files(tmp_path):
+    # Legacy exports store one <node>.attr file per node with one [attribute, value] line per attribute
+    (tmp_path / 'ctrl_a.attr').write_text(u"['translateX', 1.5]\n['visibility', True]\n")
+    (tmp_path / 'ctrl_b.attr').write_text(u"['rotateOrder', 3]\n")
+
+
+def test_legacy_folder_has_no_snapshot(tmp_path):
+    folder_path = str(tmp_path)
+    _write_legacy_files(tmp_path)
+    assert not attributesnapshot.has_snapshot_file(folder_path)
+    assert attributesnapshot.read_index(folder_path) is None
+    assert attributesnapshot.read_snapshot(folder_path) is None
+
+
+def test_remove_legacy_files(tmp_path):
+    folder_path = str(tmp_path)
+    _write_legacy_files(tmp_path)
+    (tmp_path / 'notes.txt').write_text(u'keep')
+    attributesnapshot.write_snapshot(folder_path, _get_snapshot())
+
+    assert sorted(attributesnapshot.remove_legacy_files(folder_path)) == ['ctrl_a.attr', 'ctrl_b.attr']
+    assert sorted(os.listdir(folder_path)) == [attributesnapshot.SNAPSHOT_FILE_NAME, 'notes.txt']
+    assert list(attributesnapshot.read_index(folder_path).keys()) == ['ctrl_a', 'ctrl_b', 'ctrl_c']
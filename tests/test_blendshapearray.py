@@ -0,0 +1,71 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for NumPy based blendShape weights file format
+"""
+
+from collections import OrderedDict
+
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from tpRigToolkit.dccs.maya.data import blendshapearray
+
+
+def _get_weights():
+    target_names = OrderedDict([(0, 'smile'), (2, 'blink')])
+    geometry_weights = {
+        1: (numpy.ones(3), numpy.array([[0.0, 0.5, 1.0], [1.0, 1.0, 1.0]]))
+    }
+    return target_names, geometry_weights
+
+
+def test_weights_round_trip(tmp_path):
+    folder_path = str(tmp_path)
+    target_names, geometry_weights = _get_weights()
+    blendshapearray.write_weights(folder_path, target_names, geometry_weights, geometry_names={1: 'bodyShape'})
+
+    weights_data = blendshapearray.read_weights(folder_path)
+    assert weights_data['target_names'] == {0: 'smile', 2: 'blink'}
+    assert weights_data['geometry_names'] == {1: 'bodyShape'}
+    geometry_data = weights_data['geometries'][1]
+    assert geometry_data['targets'].tolist() == [0, 2]
+    assert geometry_data['constant'].tolist() == [False, True]
+    numpy.testing.assert_allclose(geometry_data['weights'], [[0.0, 0.5, 1.0], [1.0, 1.0, 1.0]])
+    numpy.testing.assert_allclose(geometry_data['base'], [1.0, 1.0, 1.0])
+
+
+def test_weights_without_geometry_names(tmp_path):
+    folder_path = str(tmp_path)
+    target_names, geometry_weights = _get_weights()
+    blendshapearray.write_weights(folder_path, target_names, geometry_weights, compress=False)
+    assert blendshapearray.read_weights(folder_path)['geometry_names'] == dict()
+
+
+def test_weights_without_targets(tmp_path):
+    folder_path = str(tmp_path)
+    geometry_weights = {0: (numpy.ones(4), numpy.zeros((0, 4)))}
+    blendshapearray.write_weights(folder_path, OrderedDict(), geometry_weights)
+
+    weights_data = blendshapearray.read_weights(folder_path)
+    assert weights_data['target_names'] == dict()
+    geometry_data = weights_data['geometries'][0]
+    assert geometry_data['targets'].tolist() == []
+    assert geometry_data['weights'].shape == (0, 4)
+    numpy.testing.assert_allclose(geometry_data['base'], [1.0, 1.0, 1.0, 1.0])
+
+def test_targets_round_trip(tmp_path):
+    folder_path = str(tmp_path)
+    target_names = OrderedDict([(0, 'smile')])
+    geometry_targets = {0: [(0, 6000, numpy.array([1, 4]), numpy.array([[0.0, 1.0, 0.0], [0.5, 0.0, 0.0]]))]}
+    blendshapearray.write_targets(folder_path, target_names, OrderedDict([(0, 'bodyShape')]), geometry_targets)
+
+    targets_data = blendshapearray.read_targets(folder_path)
+    assert targets_data['geometry_names'] == {0: 'bodyShape'}
+    (target_index, item_index, indices, deltas), = targets_data['geometries'][0]
+    assert (target_index, item_index) == (0, 6000)
+    assert indices.tolist() == [1, 4]
+    numpy.testing.assert_allclose(deltas, [[0.0, 1.0, 0.0], [0.5, 0.0, 0.0]])
+    assert blendshapearray.read_targets(str(tmp_path / 'missing')) is None
@@ -0,0 +1,30 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for bounded LRU cache
+"""
+
+from tpRigToolkit.dccs.maya.data import cache
+
+
+def test_least_recently_used_entry_is_discarded():
+    lru_cache = cache.LRUCache(2)
+    lru_cache.set('a', 1)
+    lru_cache.set('b', 2)
+    assert lru_cache.get('a') == 1
+    lru_cache.set('c', 3)
+    assert len(lru_cache) == 2
+    assert 'b' not in lru_cache
+    assert lru_cache.keys() == ['a', 'c']
+
+
+def test_pop_and_clear():
+    lru_cache = cache.LRUCache(4)
+    lru_cache.set(('folder', '.curves'), [1])
+    lru_cache.set('b', 2)
+    assert lru_cache.pop(('folder', '.curves')) == [1]
+    assert lru_cache.pop('missing', 'default') == 'default'
+    assert lru_cache.get(('folder', '.curves')) is None
+    lru_cache.clear()
+    assert len(lru_cache) == 0
@@ -0,0 +1,53 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for data files codec
+"""
+
+import io
+
+import pytest
+
+from tpRigToolkit.dccs.maya.data import codec
+
+
+def test_encode_decode_round_trip():
+    value = {'name': 'joint1', 'position': [0.0, 1.5, -2.0], 'index': 3, 'enabled': True, 'parent': None}
+    encoded = codec.encode(value)
+    assert '\n' not in encoded
+    assert codec.decode(encoded) == value
+
+
+def test_encode_numpy_values():
+    numpy = pytest.importorskip('numpy')
+    value = {'weight': numpy.float64(0.25), 'index': numpy.int32(2), 'weights': numpy.array([0.5, 1.0])}
+    assert codec.decode(codec.encode(value)) == {'weight': 0.25, 'index': 2, 'weights': [0.5, 1.0]}
+
+
+def test_decode_legacy_literals():
+    assert codec.decode("{'joint1': {'index': 0, 'position': (0.0, 1.0, 0.0)}}") == {
+        'joint1': {'index': 0, 'position': (0.0, 1.0, 0.0)}}
+    assert codec.decode('[0.0, 0.5, 1.0]') == [0.0, 0.5, 1.0]
+    assert codec.decode('   ') is None
+
+
+def test_write_read_values(tmp_path):
+    file_path = str(tmp_path / 'influence.info')
+    values = [{'joint1': {'index': 0}}, ['blendWeights', [0.0, 1.0]], 'name']
+    codec.write_values(file_path, values)
+    assert codec.read_values(file_path) == values
+    assert codec.read_value(file_path) == values[0]
+
+
+def test_read_legacy_file(tmp_path):
+    file_path = str(tmp_path / 'settings.info')
+    with io.open(file_path, 'w', encoding='utf-8') as fh:
+        fh.write(u"['skinningMethod', 0]\n\n['blendWeights', (0.0, 1.0)]\n")
+    assert codec.read_values(file_path) == [['skinningMethod', 0], ['blendWeights', (0.0, 1.0)]]
+
+
+def test_assignment_round_trip():
+    line = codec.encode_assignment('translateX', 1.5)
+    assert codec.decode_assignment(line) == ('translateX', 1.5)
+    assert codec.decode_assignment('invalid line') is None
@@ -0,0 +1,63 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for control color indexed store
+"""
+
+import io
+
+from tpRigToolkit.dccs.maya.data import colorstore
+
+
+def _create_store(tmp_path, content=u''):
+    file_path = str(tmp_path / 'controls.color')
+    with io.open(file_path, 'w', encoding='utf-8') as fh:
+        fh.write(content)
+    return colorstore.ColorStore(file_path)
+
+
+def test_store_round_trip(tmp_path):
+    store = _create_store(tmp_path)
+    store.update({'ctrl_b': {'main': 17, 'sub': [0]}, 'ctrl_a': {'main': None, 'sub': [13, 6]}})
+    assert store.get_names() == ['ctrl_a', 'ctrl_b']
+
+    store = colorstore.ColorStore(store.file_path)
+    assert len(store) == 2
+    assert store.get('ctrl_b') == {'main': 17, 'sub': [0]}
+    assert store.get('missing', default=-1) == -1
+    assert list(store.get_all().keys()) == ['ctrl_a', 'ctrl_b']
+
+
+def test_store_in_place_updates(tmp_path):
+    store = _create_store(tmp_path)
+    store.update({'ctrl_a': {'main': 17, 'sub': [13, 6]}, 'ctrl_b': {'main': 4, 'sub': []}})
+
+    # Shorter value is written over its current line, longer value is appended and its old line is blanked
+    store.update({'ctrl_a': {'main': 1, 'sub': []}})
+    store.update({'ctrl_b': {'main': [4, [[1.0, 0.0, 0.0]], True], 'sub': [1, 2, 3]}})
+    assert store.remove(['ctrl_c']) == list()
+
+    store = colorstore.ColorStore(store.file_path)
+    assert store.get_all() == {
+        'ctrl_a': {'main': 1, 'sub': []}, 'ctrl_b': {'main': [4, [[1.0, 0.0, 0.0]], True], 'sub': [1, 2, 3]}}
+
+    assert store.remove(['ctrl_a']) == ['ctrl_a']
+    store.compact()
+    with io.open(store.file_path, 'r', encoding='utf-8') as fh:
+        lines = fh.read().splitlines()
+    assert len(lines) == 1 and lines[0].startswith('ctrl_b = ')
+    assert colorstore.ColorStore(store.file_path).get_names() == ['ctrl_b']
+
+
+def test_legacy_file(tmp_path):
+    store = _create_store(
+        tmp_path, u"ctrl_a = {'main': 17, 'sub': [0]}\r\n\r\n"
+                  u"ctrl_b = {'main': None, 'sub': [[13, (1.0, 0.0, 0.0), True]]}\r\n")
+    assert store.get_names() == ['ctrl_a', 'ctrl_b']
+    assert store.get('ctrl_b') == {'main': None, 'sub': [[13, (1.0, 0.0, 0.0), True]]}
+
+    store.update({'ctrl_a': {'main': 6, 'sub': [0]}})
+    store = colorstore.ColorStore(store.file_path)
+    assert store.get('ctrl_a') == {'main': 6, 'sub': [0]}
+    assert store.get('ctrl_b') == {'main': None, 'sub': [[13, (1.0, 0.0, 0.0), True]]}
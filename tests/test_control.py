@@ -0,0 +1,78 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for control shapes cache
+Control module depends on Maya, tpDcc and control library, so these tests only run within mayapy
+"""
+
+import os
+import array
+
+import pytest
+
+pytest.importorskip('maya.cmds')
+pytest.importorskip('tpDcc')
+pytest.importorskip('tpRigToolkit.libs.controlrig')
+
+from tpRigToolkit.dccs.maya.core import control, curve
+
+SQUARE_DATA = '1 4 0 no 3 5 0 1 2 3 4 5 -1 0 -1 -1 0 1 1 0 1 1 0 -1 -1 0 -1'
+
+
+def _write_library(folder_path, curve_name, curve_data, mtime=None):
+    library_path = os.path.join(folder_path, 'default_curves.curves')
+    with open(library_path, 'w') as fh:
+        fh.write('-> {} {}\n{}\n'.format(curve_name, curve_name, curve_data))
+    if mtime is not None:
+        os.utime(library_path, (mtime, mtime))
+        os.utime(folder_path, (mtime, mtime))
+
+    return library_path
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    control.clear_control_cache()
+    yield
+    control.clear_control_cache()
+
+
+def test_get_control_shape(tmp_path):
+    controls_path = str(tmp_path)
+    _write_library(controls_path, 'square', SQUARE_DATA)
+
+    curve_data_list = control.get_control_shape('square', controls_path=controls_path)
+    assert len(curve_data_list) == 1
+    assert curve_data_list[0].degree == 1
+    assert list(curve_data_list[0].cvs[:3]) == [-1.0, 0.0, -1.0]
+    assert control.get_control_shape('missing', controls_path=controls_path) is None
+    assert control.get_control_shape('square', controls_path=str(tmp_path / 'missing')) is None
+
+
+def test_get_control_shape_returns_copies(tmp_path):
+    controls_path = str(tmp_path)
+    _write_library(controls_path, 'square', SQUARE_DATA)
+
+    control.get_control_shape('square', controls_path=controls_path)[0].cvs[0] = 10.0
+    assert control.get_control_shape('square', controls_path=controls_path)[0].cvs[0] == -1.0
+
+
+def test_control_shape_cache_invalidation(tmp_path):
+    controls_path = str(tmp_path)
+    _write_library(controls_path, 'square', SQUARE_DATA, mtime=1000000000)
+    assert control.get_control_shape('square', controls_path=controls_path)[0].cvs[0] == -1.0
+
+    _write_library(controls_path, 'square', SQUARE_DATA.replace('5 -1 0 -1', '5 -2 0 -1', 1), mtime=1000000010)
+    assert control.get_control_shape('square', controls_path=controls_path)[0].cvs[0] == -2.0
+
+    _write_library(controls_path, 'circle', SQUARE_DATA, mtime=1000000020)
+    assert control.get_control_shape('square', controls_path=controls_path) is None
+
+
+def test_get_shapes_size():
+    square = curve.NurbsCurveData(
+        1, 0, array.array('d', [0, 1, 2, 3, 4]), array.array('d', [-1, 0, -1, -1, 0, 1, 1, 0, 1, 1, 0, -1, -1, 0, -1]))
+    assert control._get_shapes_size([square]) == 2.0
+    assert control._get_shapes_size(control.scale_control_shapes([square], 2.5, offset=[1.0, 0.0, 0.0])) == 5.0
+    assert control._get_shapes_size([]) == 0.0
@@ -0,0 +1,70 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for binary curve library file format
+"""
+
+import io
+import array
+
+import pytest
+
+from tpRigToolkit.dccs.maya.data import curvelibrary
+
+
+def _get_library_curves():
+    square = curvelibrary.NurbsCurveData(
+        1, 0, array.array('d', [0.0, 1.0, 2.0, 3.0, 4.0]),
+        array.array('d', [-1, 0, -1, -1, 0, 1, 1, 0, 1, 1, 0, -1, -1, 0, -1]))
+    circle = curvelibrary.NurbsCurveData(
+        3, 2, [float(i) for i in range(-2, 11)],
+        [float(value) for value in range(33)])
+    return {
+        'square': ([square], 'square'),
+        'circle_square': ([circle, square], None),
+    }
+
+
+def _assert_curve_data(curve_data_list, expected_data_list):
+    assert len(curve_data_list) == len(expected_data_list)
+    for curve_data, expected_data in zip(curve_data_list, expected_data_list):
+        assert curve_data.degree == expected_data.degree
+        assert curve_data.form == expected_data.form
+        assert list(curve_data.knots) == list(expected_data.knots)
+        assert list(curve_data.cvs) == list(expected_data.cvs)
+
+
+def test_pack_unpack_curve():
+    curve_data_list = _get_library_curves()['circle_square'][0]
+    _assert_curve_data(curvelibrary.unpack_curve(curvelibrary.pack_curve(curve_data_list)), curve_data_list)
+
+
+def test_library_round_trip(tmp_path):
+    file_path = str(tmp_path / 'default_curves.curves')
+    library_curves = _get_library_curves()
+    curvelibrary.write_library(file_path, library_curves)
+    assert curvelibrary.is_binary_library(file_path)
+
+    library = curvelibrary.CurveLibraryFile(file_path)
+    assert library.get_curve_names() == ['circle_square', 'square']
+    assert library.get_curve_type('square') == 'square'
+    assert library.get_curve_type('circle_square') == ''
+    assert library.get_curve_type('missing') is None
+    assert library.get_curve('missing') is None
+    for curve_name, (curve_data_list, _) in library_curves.items():
+        _assert_curve_data(library.get_curve(curve_name), curve_data_list)
+
+    all_curves = library.read_all()
+    assert list(all_curves.keys()) == ['circle_square', 'square']
+    _assert_curve_data(all_curves['square'][0], library_curves['square'][0])
+
+
+def test_legacy_text_library(tmp_path):
+    file_path = str(tmp_path / 'default_curves.curves')
+    with io.open(file_path, 'w', encoding='utf-8') as fh:
+        fh.write(u'-> square\n 1 4 0 no 3 5 0 1 2 3 4 5 -1 0 -1 -1 0 1 1 0 1 1 0 -1 -1 0 -1\n')
+    assert not curvelibrary.is_binary_library(file_path)
+    assert not curvelibrary.is_binary_library(str(tmp_path / 'missing.curves'))
+    with pytest.raises(ValueError):
+        curvelibrary.CurveLibraryFile(file_path)
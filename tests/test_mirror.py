@@ -0,0 +1,39 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for control shapes mirroring functions
+Mirror module depends on Maya and tpDcc, so these tests only run within mayapy
+"""
+
+import pytest
+
+numpy = pytest.importorskip('numpy')
+pytest.importorskip('maya.api.OpenMaya')
+pytest.importorskip('tpDcc')
+
+from tpRigToolkit.dccs.maya.core import mirror
+
+
+@pytest.mark.parametrize('side, mirror_side', [
+    ('l', 'r'), ('R', 'L'), ('left', 'right'), ('Right', 'Left'), ('LF', 'RT'), ('center', None), ('', None)])
+def test_get_mirror_side(side, mirror_side):
+    assert mirror.get_mirror_side(side) == mirror_side
+
+
+def test_reflect_points():
+    points = numpy.array([[1.0, 2.0, 3.0], [-0.5, 0.0, 1.0]])
+    numpy.testing.assert_allclose(mirror.reflect_points(points), [[-1.0, 2.0, 3.0], [0.5, 0.0, 1.0]])
+    numpy.testing.assert_allclose(
+        mirror.reflect_points(points, normal=(0.0, 0.0, 2.0), origin=(0.0, 0.0, 1.0)),
+        [[1.0, 2.0, -1.0], [-0.5, 0.0, 1.0]])
+
+
+def test_get_mirror_name_fallback(monkeypatch):
+    # Names that cannot be parsed with naming rules fall back to side token replacement
+    monkeypatch.setattr(mirror.names, 'parse_name', lambda *args, **kwargs: None)
+    assert mirror.get_mirror_name('l_arm_ctrl') == 'r_arm_ctrl'
+    assert mirror.get_mirror_name('Left_eyelid_CTRL') == 'Right_eyelid_CTRL'
+    assert mirror.get_mirror_name('arm_lf_ctrl') == 'arm_rt_ctrl'
+    assert mirror.get_mirror_name('spine_ctrl') is None
+    assert mirror.get_name_side('spine_R_ctrl') == 'R'
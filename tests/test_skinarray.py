@@ -0,0 +1,138 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for NumPy based sparse skin weights file format
+"""
+
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from tpRigToolkit.dccs.maya.data import skinarray
+
+
+def _get_influence_weights():
+    return [
+        (0, [1.0, 0.5, 0.0, 0.25]),
+        (2, [0.0, 0.5, 1.0, 0.75]),
+    ]
+
+
+@pytest.mark.parametrize('compress', [True, False])
+def test_weights_round_trip(tmp_path, compress):
+    folder_path = str(tmp_path)
+    vertices, influences, weights, vertex_count = skinarray.pack_weights(_get_influence_weights())
+    skinarray.write_weights(folder_path, vertices, influences, weights, vertex_count, 3, compress=compress)
+    assert skinarray.has_weights_file(folder_path)
+
+    weights_data = skinarray.read_weights(folder_path)
+    assert weights_data['vertex_count'] == 4
+    assert weights_data['influence_count'] == 3
+    skin_weights = skinarray.SkinWeights.from_data(weights_data)
+    numpy.testing.assert_allclose(skin_weights.get_influence_weights(0), [1.0, 0.5, 0.0, 0.25])
+    numpy.testing.assert_allclose(skin_weights.get_influence_weights(1), [0.0, 0.0, 0.0, 0.0])
+    numpy.testing.assert_allclose(skin_weights.get_influence_weights(2), [0.0, 0.5, 1.0, 0.75])
+
+
+def test_memory_mapped_read(tmp_path):
+    folder_path = str(tmp_path)
+    vertices, influences, weights, vertex_count = skinarray.pack_weights(_get_influence_weights())
+    skinarray.write_weights(folder_path, vertices, influences, weights, vertex_count, 3, compress=False)
+
+    mapped_data = skinarray.read_weights(folder_path, mmap=True)
+    loaded_data = skinarray.read_weights(folder_path)
+    for key in ('vertices', 'influences', 'weights'):
+        numpy.testing.assert_array_equal(mapped_data[key], loaded_data[key])
+
+
+def test_legacy_folder_has_no_weights_file(tmp_path):
+    folder_path = str(tmp_path)
+    (tmp_path / 'joint1.weights').write_text(u'[1.0, 0.5]\n')
+    assert not skinarray.has_weights_file(folder_path)
+    assert skinarray.read_weights(folder_path) is None
+    assert skinarray.read_mesh(folder_path) is None
+
+
+def test_mesh_round_trip(tmp_path):
+    folder_path = str(tmp_path)
+    points = numpy.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    triangles = numpy.array([[0, 1, 2]])
+    skinarray.write_mesh(folder_path, points, triangles)
+    rest_points, rest_triangles = skinarray.read_mesh(folder_path)
+    numpy.testing.assert_allclose(rest_points, points)
+    numpy.testing.assert_array_equal(rest_triangles, triangles)
+
+
+def test_prune_and_limit_influences():
+    skin_weights = skinarray.SkinWeights.from_influence_weights([
+        (0, [0.6, 0.00005]),
+        (1, [0.3, 0.99995]),
+        (2, [0.1, 0.0]),
+    ])
+    pruned = skin_weights.prune(skinarray.PRUNE_THRESHOLD)
+    assert pruned.get_counts().tolist() == [3, 1]
+    numpy.testing.assert_allclose(pruned.get_influence_weights(1), [0.3, 1.0], rtol=1e-6)
+
+    limited = skin_weights.limit_influences(2)
+    assert limited.get_counts().tolist() == [2, 2]
+    numpy.testing.assert_allclose(limited.get_influence_weights(2), [0.0, 0.0])
+    numpy.testing.assert_allclose(limited.get_influence_weights(0) + limited.get_influence_weights(1), [1.0, 1.0])
+
+
+def test_delta_weights(tmp_path):
+    folder_path = str(tmp_path)
+    vertices, influences, weights, vertex_count = skinarray.pack_weights(_get_influence_weights())
+    skinarray.write_weights(folder_path, vertices, influences, weights, vertex_count, 3)
+    assert skinarray.write_delta_weights(folder_path, vertices, influences, weights, vertex_count, 3) is None
+
+    weights = weights.copy()
+    weights[0] = 0.5
+    delta_file = skinarray.write_delta_weights(folder_path, vertices, influences, weights, vertex_count, 3)
+    assert delta_file.endswith(skinarray.DELTA_FILE_NAME.format(1))
+    skin_weights = skinarray.SkinWeights.from_data(skinarray.read_weights(folder_path))
+    numpy.testing.assert_allclose(skin_weights.get_influence_weights(0), [0.5, 0.5, 0.0, 0.25])
+
+    assert skinarray.compact_weights(folder_path)
+    assert not skinarray.get_delta_files(folder_path)
+    skin_weights = skinarray.SkinWeights.from_data(skinarray.read_weights(folder_path, apply_deltas=False))
+    numpy.testing.assert_allclose(skin_weights.get_influence_weights(0), [0.5, 0.5, 0.0, 0.25])
+
+
+def test_delta_index_skips_missing_files(tmp_path):
+    folder_path = str(tmp_path)
+    vertices, influences, weights, vertex_count = skinarray.pack_weights(_get_influence_weights())
+    skinarray.write_weights(folder_path, vertices, influences, weights, vertex_count, 3)
+    delta_files = list()
+    for weight in (0.9, 0.8):
+        weights = weights.copy()
+        weights[0] = weight
+        delta_files.append(
+            skinarray.write_delta_weights(folder_path, vertices, influences, weights, vertex_count, 3))
+
+    (tmp_path / skinarray.DELTA_FILE_NAME.format(1)).unlink()
+    weights = weights.copy()
+    weights[0] = 0.7
+    delta_file = skinarray.write_delta_weights(folder_path, vertices, influences, weights, vertex_count, 3)
+    assert delta_file.endswith(skinarray.DELTA_FILE_NAME.format(3))
+    assert delta_file not in delta_files
+
+
+def test_influence_count_uses_highest_index():
+    skin_weights = skinarray.SkinWeights.from_influence_weights([(0, [1.0, 0.0]), (3, [0.0, 1.0])])
+    assert skin_weights.influence_count == 4
+    numpy.testing.assert_allclose(skin_weights.get_influence_weights(3), [0.0, 1.0])
+
+
+def test_remap_influences():
+    skin_weights = skinarray.SkinWeights.from_influence_weights(_get_influence_weights())
+    remapped = skin_weights.remap_influences({0: 5, 2: 1})
+    assert remapped.influence_count == 6
+    assert remapped.get_vertices().tolist() == [0, 1, 1, 2, 3, 3]
+    assert remapped.influences.tolist() == [5, 1, 5, 1, 1, 5]
+    numpy.testing.assert_allclose(remapped.get_influence_weights(5), [1.0, 0.5, 0.0, 0.25])
+    numpy.testing.assert_allclose(remapped.get_influence_weights(1), [0.0, 0.5, 1.0, 0.75])
+
+    dropped = skin_weights.remap_influences({2: 0})
+    numpy.testing.assert_allclose(dropped.get_influence_weights(0), [0.0, 0.5, 1.0, 0.75])
+    assert dropped.influence_count == 1
@@ -0,0 +1,47 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for data worker pool
+"""
+
+import threading
+
+import pytest
+
+from tpRigToolkit.dccs.maya.data import workers
+
+
+def test_map_keeps_order():
+    with workers.WorkerPool(max_workers=4) as pool:
+        assert pool.map(lambda value: value * 2, range(10)) == [value * 2 for value in range(10)]
+
+
+def test_imap_window():
+    lock = threading.Lock()
+    started = list()
+
+    def _task(value):
+        with lock:
+            started.append(value)
+        return value
+
+    with workers.WorkerPool(max_workers=2) as pool:
+        results = pool.imap(_task, range(20), window=3)
+        assert next(results) == 0
+        # Only the items of the window can be submitted before the first result is consumed
+        assert len(started) <= 3
+        assert list(results) == list(range(1, 20))
+
+
+def test_imap_raises_task_errors():
+    def _task(value):
+        if value == 2:
+            raise ValueError('Invalid value')
+        return value
+
+    with workers.WorkerPool(max_workers=2) as pool:
+        results = pool.imap(_task, range(5))
+        with pytest.raises(ValueError):
+            list(results)
+        pool.terminate()
@@ -0,0 +1,223 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains attribute functions for tpRigToolkit-dccs-maya that work directly with OpenMaya API
+"""
+
+import logging
+from collections import OrderedDict
+
+import maya.cmds
+import maya.api.OpenMaya as OpenMaya
+
+LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
+
+INTEGER_TYPES = (
+    OpenMaya.MFnNumericData.kByte, OpenMaya.MFnNumericData.kChar, OpenMaya.MFnNumericData.kShort,
+    OpenMaya.MFnNumericData.kInt, OpenMaya.MFnNumericData.kLong, OpenMaya.MFnNumericData.kAddr)
+FLOAT_TYPES = (OpenMaya.MFnNumericData.kFloat, OpenMaya.MFnNumericData.kDouble)
+# Numeric values whose difference is lower than this value are considered equal
+VALUE_TOLERANCE = 0.000001
+
+
+class _UnsupportedValue(object):
+    """
+    Marker returned when the value of a plug cannot be read through OpenMaya API
+    """
+
+    pass
+
+
+UNSUPPORTED_VALUE = _UnsupportedValue()
+
+
+def get_plug(node, attribute):
+    """
+    Returns OpenMaya plug of the given node attribute
+    :param node: str
+    :param attribute: str, attribute name. Can be a nested attribute path (pnts[0].pntx)
+    :return: OpenMaya.MPlug or None
+    """
+
+    selection = OpenMaya.MSelectionList()
+    try:
+        selection.add('{}.{}'.format(node, attribute))
+        return selection.getPlug(0)
+    except (RuntimeError, TypeError):
+        return None
+
+
+def get_plug_value(plug):
+    """
+    Returns the value of the given scalar plug. Angle, distance and time values are returned in UI units, so they
+    match the values returned by getAttr command
+    :param plug: OpenMaya.MPlug
+    :return: object, plug value or UNSUPPORTED_VALUE if the plug type cannot be read through OpenMaya API
+    """
+
+    if plug.isArray or plug.isCompound:
+        return UNSUPPORTED_VALUE
+
+    attribute = plug.attribute()
+    if attribute.hasFn(OpenMaya.MFn.kNumericAttribute):
+        numeric_type = OpenMaya.MFnNumericAttribute(attribute).numericType()
+        if numeric_type == OpenMaya.MFnNumericData.kBoolean:
+            return plug.asBool()
+        elif numeric_type in INTEGER_TYPES:
+            return plug.asInt()
+        elif numeric_type in FLOAT_TYPES:
+            return plug.asDouble()
+    elif attribute.hasFn(OpenMaya.MFn.kUnitAttribute):
+        unit_type = OpenMaya.MFnUnitAttribute(attribute).unitType()
+        if unit_type == OpenMaya.MFnUnitAttribute.kAngle:
+            return plug.asMAngle().asUnits(OpenMaya.MAngle.uiUnit())
+        elif unit_type == OpenMaya.MFnUnitAttribute.kDistance:
+            return plug.asMDistance().asUnits(OpenMaya.MDistance.uiUnit())
+        elif unit_type == OpenMaya.MFnUnitAttribute.kTime:
+            return plug.asMTime().asUnits(OpenMaya.MTime.uiUnit())
+    elif attribute.hasFn(OpenMaya.MFn.kEnumAttribute):
+        return plug.asShort()
+    elif attribute.hasFn(OpenMaya.MFn.kTypedAttribute):
+        if OpenMaya.MFnTypedAttribute(attribute).attrType() == OpenMaya.MFnData.kString:
+            return plug.asString()
+
+    return UNSUPPORTED_VALUE
+
+
+def get_attribute_values(node, attributes, skip_connected=True):
+    """
+    Returns the values of the given attributes of a node. Values are read through OpenMaya API, getAttr command
+    is only used for attributes whose type cannot be read through the API
+    :param node: str
+    :param attributes: list(str)
+    :param skip_connected: bool, whether or not attributes driven by a connection are skipped
+    :return: OrderedDict(str, object), dictionary mapping attribute names with their values. Attributes that do not
+        exist or whose value cannot be read are not included
+    """
+
+    values = OrderedDict()
+
+    node_fn = _get_node_function(node)
+    if node_fn is None:
+        LOGGER.warning('Impossible to get attribute values of "{}". Node does not exist!'.format(node))
+        return values
+
+    for attribute in attributes:
+        plug = _find_plug(node_fn, node, attribute)
+        if plug is None:
+            continue
+        if skip_connected and plug.isDestination:
+            continue
+
+        try:
+            values[attribute] = _get_value(node, attribute, plug)
+        except Exception:
+            continue
+
+    return values
+
+
+def get_attribute_changes(node, attribute_values, tolerance=VALUE_TOLERANCE):
+    """
+    Compares given attribute values with the current values of the node attributes
+    Locked and connected attributes, and attributes with no value, are skipped because their value cannot be set
+    :param node: str
+    :param attribute_values: list(tuple(str, object)), list of (attribute name, value) tuples
+    :param tolerance: float, numeric values whose difference is lower than this value are considered equal
+    :return: tuple(OrderedDict(str, object), list(str)), dictionary mapping the attributes whose value is different
+        with the new value and list of attributes that do not exist in the node
+    """
+
+    changes = OrderedDict()
+    missing = list()
+
+    node_fn = _get_node_function(node)
+    if node_fn is None:
+        return changes, [attribute for attribute, _ in attribute_values]
+
+    for attribute, value in attribute_values:
+        plug = _find_plug(node_fn, node, attribute)
+        if plug is None:
+            missing.append(attribute)
+            continue
+        if value is None or plug.isLocked or plug.isDestination:
+            continue
+        try:
+            current_value = _get_value(node, attribute, plug)
+        except Exception:
+            changes[attribute] = value
+            continue
+        if not is_equal(current_value, value, tolerance=tolerance):
+            changes[attribute] = value
+
+    return changes, missing
+
+
+def is_equal(value, other_value, tolerance=VALUE_TOLERANCE):
+    """
+    Returns whether or not given attribute values are equal. Numeric values are compared using given tolerance and
+    sequences are compared element by element
+    :param value: object
+    :param other_value: object
+    :param tolerance: float
+    :return: bool
+    """
+
+    if isinstance(value, (list, tuple)) and isinstance(other_value, (list, tuple)):
+        if len(value) != len(other_value):
+            return False
+        return all(is_equal(item, other_item, tolerance) for item, other_item in zip(value, other_value))
+
+    if isinstance(value, (bool, int, float)) and isinstance(other_value, (bool, int, float)):
+        return abs(value - other_value) <= tolerance
+
+    return value == other_value
+
+
+def _get_node_function(node):
+    """
+    Internal function that returns OpenMaya dependency node function set of the given node
+    :param node: str
+    :return: OpenMaya.MFnDependencyNode or None
+    """
+
+    selection = OpenMaya.MSelectionList()
+    try:
+        selection.add(node)
+        return OpenMaya.MFnDependencyNode(selection.getDependNode(0))
+    except RuntimeError:
+        return None
+
+
+def _find_plug(node_fn, node, attribute):
+    """
+    Internal function that returns the plug of the given node attribute
+    :param node_fn: OpenMaya.MFnDependencyNode
+    :param node: str
+    :param attribute: str
+    :return: OpenMaya.MPlug or None
+    """
+
+    if '.' not in attribute and '[' not in attribute and node_fn.hasAttribute(attribute):
+        return node_fn.findPlug(attribute, False)
+
+    # Nested attributes, and shape attributes accessed through their transform, are resolved by name
+    return get_plug(node, attribute)
+
+
+def _get_value(node, attribute, plug):
+    """
+    Internal function that returns the value of the given plug, using getAttr command if plug value cannot be read
+    through OpenMaya API
+    :param node: str
+    :param attribute: str
+    :param plug: OpenMaya.MPlug
+    :return: object
+    """
+
+    value = get_plug_value(plug)
+    if value is UNSUPPORTED_VALUE:
+        value = maya.cmds.getAttr('{}.{}'.format(node, attribute))
+
+    return value
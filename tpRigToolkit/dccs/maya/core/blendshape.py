@@ -0,0 +1,334 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains blendShape functions for tpRigToolkit-dccs-maya that work with whole weight maps at once
+"""
+
+import re
+import logging
+from collections import OrderedDict
+
+import maya.cmds
+import maya.api.OpenMaya as OpenMaya
+import maya.api.OpenMayaAnim as OpenMayaAnim
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
+
+WEIGHT_ALIAS_REGEX = re.compile(r'^weight\[(\d+)\]$')
+COMPONENT_REGEX = re.compile(r'\[(\d+)(?::(\d+))?\]$')
+# Target item index of the full weight target. In-between targets are stored between 5001 and 5999
+TARGET_ITEM_INDEX = 6000
+# Point offsets lower than this value are not considered target deltas
+DELTA_TOLERANCE = 0.00001
+
+
+def get_target_names(blendshape):
+    """
+    Returns the targets of the given blendShape node
+    :param blendshape: str
+    :return: OrderedDict(int, str), dictionary mapping target indices with target names
+    """
+
+    targets = dict()
+    aliases = maya.cmds.aliasAttr(blendshape, query=True) or list()
+    for alias, attribute in zip(aliases[::2], aliases[1::2]):
+        match = WEIGHT_ALIAS_REGEX.match(attribute)
+        if match:
+            targets[int(match.group(1))] = alias
+
+    return OrderedDict(sorted(targets.items()))
+
+
+def get_geometry_indices(blendshape):
+    """
+    Returns the indices and names of the geometries deformed by the given blendShape node
+    :param blendshape: str
+    :return: OrderedDict(int, str), dictionary mapping geometry indices with geometry names
+    """
+
+    indices = maya.cmds.blendShape(blendshape, query=True, geometryIndices=True) or list()
+    geometries = maya.cmds.blendShape(blendshape, query=True, geometry=True) or list()
+
+    return OrderedDict(zip(indices, geometries))
+
+
+def get_point_count(geometry):
+    """
+    Returns number of deformable points of the given geometry
+    :param geometry: str
+    :return: int
+    """
+
+    selection = OpenMaya.MSelectionList()
+    selection.add(geometry)
+
+    return OpenMaya.MItGeometry(selection.getDagPath(0)).count()
+
+
+def get_base_weights_attribute(blendshape, geometry_index=0):
+    """
+    Returns the base weights multi attribute of the given blendShape geometry
+    :param blendshape: str
+    :param geometry_index: int
+    :return: str
+    """
+
+    return '{}.inputTarget[{}].baseWeights'.format(blendshape, geometry_index)
+
+
+def get_target_weights_attribute(blendshape, target_index, geometry_index=0):
+    """
+    Returns the target weights multi attribute of the given blendShape target and geometry
+    :param blendshape: str
+    :param target_index: int
+    :param geometry_index: int
+    :return: str
+    """
+
+    return '{}.inputTarget[{}].inputTargetGroup[{}].targetWeights'.format(blendshape, geometry_index, target_index)
+
+
+def get_weights(blendshape, geometry_index=0, target_indices=None, point_count=None):
+    """
+    Returns base weights and the per point weights of all the given targets of a blendShape geometry
+    Only existing weight elements are queried, using one query per contiguous range of elements
+    :param blendshape: str
+    :param geometry_index: int
+    :param target_indices: list(int) or None, targets to get weights of. If not given, all targets are used
+    :param point_count: int or None, number of points of the geometry. If not given, it is retrieved from geometry
+    :return: tuple(numpy.array, numpy.array), (P, ) base weights and (T, P) target weights
+    """
+
+    if target_indices is None:
+        target_indices = list(get_target_names(blendshape).keys())
+    if point_count is None:
+        point_count = get_point_count(get_geometry_indices(blendshape)[geometry_index])
+
+    base_weights = get_array_values(get_base_weights_attribute(blendshape, geometry_index), point_count)
+    target_weights = numpy.ones((len(target_indices), point_count), dtype='float32')
+    for i, target_index in enumerate(target_indices):
+        target_weights[i] = get_array_values(
+            get_target_weights_attribute(blendshape, target_index, geometry_index), point_count)
+
+    return base_weights, target_weights
+
+
+def get_array_values(attribute, count, default=1.0):
+    """
+    Returns values of the given numeric multi attribute as a NumPy array
+    Elements that do not exist are returned with the given default value
+    :param attribute: str
+    :param count: int, number of elements to return
+    :param default: float
+    :return: numpy.array
+    """
+
+    values = numpy.full(count, default, dtype='float32')
+    selection = OpenMaya.MSelectionList()
+    try:
+        selection.add(attribute)
+    except RuntimeError:
+        return values
+    indices = numpy.array(selection.getPlug(0).getExistingArrayAttributeIndices(), dtype='int64')
+    indices = indices[indices < count]
+    if not len(indices):
+        return values
+
+    for run in numpy.split(indices, numpy.flatnonzero(numpy.diff(indices) != 1) + 1):
+        values[run] = numpy.atleast_1d(maya.cmds.getAttr('{}[{}:{}]'.format(attribute, run[0], run[-1])))
+
+    return values
+
+
+def set_weights(blendshape, target_weights, geometry_index=0, base_weights=None):
+    """
+    Sets base weights and the per point weights of the given targets of a blendShape geometry
+    Each weight map is set in a single bulk attribute call
+    :param blendshape: str
+    :param target_weights: dict(int, list(float)), dictionary mapping target indices with per point weights
+    :param geometry_index: int
+    :param base_weights: list(float) or None
+    """
+
+    if base_weights is not None:
+        set_array_values(get_base_weights_attribute(blendshape, geometry_index), base_weights)
+    for target_index, weights in target_weights.items():
+        set_array_values(get_target_weights_attribute(blendshape, target_index, geometry_index), weights)
+
+
+def set_array_values(attribute, values):
+    """
+    Sets all the values of the given numeric multi attribute in a single call
+    :param attribute: str
+    :param values: list(float) or numpy.array
+    """
+
+    values = values.tolist() if hasattr(values, 'tolist') else list(values)
+    if not values:
+        return
+
+    maya.cmds.setAttr('{}[0:{}]'.format(attribute, len(values) - 1), *values, size=len(values))
+
+
+def get_target_item_attribute(blendshape, target_index, item_index=TARGET_ITEM_INDEX, geometry_index=0):
+    """
+    Returns the input target item attribute of the given blendShape target and geometry
+    :param blendshape: str
+    :param target_index: int
+    :param item_index: int
+    :param geometry_index: int
+    :return: str
+    """
+
+    return '{}.inputTarget[{}].inputTargetGroup[{}].inputTargetItem[{}]'.format(
+        blendshape, geometry_index, target_index, item_index)
+
+
+def get_target_items(blendshape, target_index, geometry_index=0):
+    """
+    Returns the target item indices (full target and in-betweens) of the given blendShape target
+    :param blendshape: str
+    :param target_index: int
+    :param geometry_index: int
+    :return: list(int)
+    """
+
+    selection = OpenMaya.MSelectionList()
+    try:
+        selection.add('{}.inputTarget[{}].inputTargetGroup[{}].inputTargetItem'.format(
+            blendshape, geometry_index, target_index))
+    except RuntimeError:
+        return list()
+
+    return list(selection.getPlug(0).getExistingArrayAttributeIndices())
+
+
+def get_input_points(blendshape, geometry_index=0):
+    """
+    Returns the object space points of the input (not deformed) geometry of the given blendShape geometry
+    :param blendshape: str
+    :param geometry_index: int
+    :return: numpy.array, (P, 3) array of points
+    """
+
+    selection = OpenMaya.MSelectionList()
+    selection.add(blendshape)
+    input_shape = OpenMayaAnim.MFnGeometryFilter(selection.getDependNode(0)).inputShapeAtIndex(geometry_index)
+
+    return _get_points(OpenMaya.MFnMesh(input_shape).getPoints(OpenMaya.MSpace.kObject))
+
+
+def get_target_deltas(
+        blendshape, target_index, item_index=TARGET_ITEM_INDEX, geometry_index=0, input_points=None,
+        tolerance=DELTA_TOLERANCE):
+    """
+    Returns the sparse point deltas of the given blendShape target item
+    If a target geometry is connected to the target item, deltas are computed from the target geometry
+    :param blendshape: str
+    :param target_index: int
+    :param item_index: int
+    :param geometry_index: int
+    :param input_points: numpy.array or None, input geometry points. Only used if a target geometry is connected.
+        If not given, they are retrieved from the blendShape input geometry
+    :param tolerance: float, offsets lower than this value are ignored when computing deltas from target geometry
+    :return: tuple(numpy.array, numpy.array), (N, ) point indices and (N, 3) point deltas
+    """
+
+    item_attribute = get_target_item_attribute(blendshape, target_index, item_index, geometry_index)
+
+    target_geometries = maya.cmds.listConnections(
+        '{}.inputGeomTarget'.format(item_attribute), source=True, destination=False, shapes=True) or list()
+    if target_geometries:
+        if input_points is None:
+            input_points = get_input_points(blendshape, geometry_index)
+        selection = OpenMaya.MSelectionList()
+        selection.add(target_geometries[0])
+        target_points = _get_points(OpenMaya.MFnMesh(selection.getDagPath(0)).getPoints(OpenMaya.MSpace.kObject))
+        deltas = target_points - input_points
+        indices = numpy.flatnonzero(numpy.abs(deltas).max(axis=1) > tolerance).astype('int32')
+        return indices, deltas[indices].astype('float32')
+
+    components = maya.cmds.getAttr('{}.inputComponentsTarget'.format(item_attribute)) or list()
+    points = maya.cmds.getAttr('{}.inputPointsTarget'.format(item_attribute)) or list()
+    index_ranges = list()
+    for component in components:
+        match = COMPONENT_REGEX.search(component)
+        if not match:
+            continue
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) is not None else start
+        index_ranges.append(numpy.arange(start, end + 1, dtype='int32'))
+    indices = numpy.concatenate(index_ranges) if index_ranges else numpy.zeros(0, dtype='int32')
+    deltas = numpy.array(points, dtype='float32').reshape(-1, 4)[:, :3] if points else numpy.zeros((0, 3), 'float32')
+    count = min(len(indices), len(deltas))
+
+    return indices[:count], deltas[:count]
+
+
+def set_target_deltas(
+        blendshape, target_index, indices, deltas, item_index=TARGET_ITEM_INDEX, geometry_index=0, target_name=None):
+    """
+    Sets the sparse point deltas of the given blendShape target item. Target is created if it does not exist
+    :param blendshape: str
+    :param target_index: int
+    :param indices: numpy.array, (N, ) point indices
+    :param deltas: numpy.array, (N, 3) point deltas
+    :param item_index: int
+    :param geometry_index: int
+    :param target_name: str or None, name of the target. Used to create the target weight alias
+    """
+
+    order = numpy.argsort(indices, kind='mergesort')
+    indices = numpy.asarray(indices, dtype='int64')[order]
+    deltas = numpy.asarray(deltas, dtype='float64').reshape(-1, 3)[order]
+
+    item_attribute = get_target_item_attribute(blendshape, target_index, item_index, geometry_index)
+    points = numpy.hstack([deltas, numpy.ones((len(deltas), 1))])
+    maya.cmds.setAttr(
+        '{}.inputPointsTarget'.format(item_attribute), len(points), *[tuple(point) for point in points.tolist()],
+        type='pointArray')
+    components = get_component_ranges(indices)
+    maya.cmds.setAttr(
+        '{}.inputComponentsTarget'.format(item_attribute), len(components), *components, type='componentList')
+
+    weight_attribute = '{}.weight[{}]'.format(blendshape, target_index)
+    if target_name and not maya.cmds.aliasAttr(weight_attribute, query=True):
+        maya.cmds.setAttr(weight_attribute, 0.0)
+        maya.cmds.aliasAttr(target_name, weight_attribute)
+
+
+def get_component_ranges(indices, component='vtx'):
+    """
+    Returns compact component list (vtx[0:10], vtx[12], ...) of the given sorted point indices
+    :param indices: numpy.array
+    :param component: str
+    :return: list(str)
+    """
+
+    indices = numpy.asarray(indices, dtype='int64')
+    if not len(indices):
+        return list()
+
+    breaks = numpy.flatnonzero(numpy.diff(indices) != 1) + 1
+    starts = indices[numpy.concatenate([[0], breaks])]
+    ends = indices[numpy.concatenate([breaks - 1, [len(indices) - 1]])]
+
+    return [
+        '{}[{}:{}]'.format(component, start, end) if start != end else '{}[{}]'.format(component, start)
+        for start, end in zip(starts.tolist(), ends.tolist())]
+
+
+def _get_points(points):
+    """
+    Internal function that converts given OpenMaya point array into a NumPy array
+    :param points: OpenMaya.MPointArray
+    :return: numpy.array, (P, 3) array of points
+    """
+
+    return numpy.array([(point.x, point.y, point.z) for point in points], dtype='float64').reshape(-1, 3)
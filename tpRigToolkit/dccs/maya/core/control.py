@@ -5,6 +5,8 @@
 Module that contains rig control implementation for Maya
 """
 
+import os
+import array
 import logging
 
 import maya.cmds
@@ -16,9 +18,20 @@ from tpDcc.dccs.maya.core import curve as curve_utils, name as name_utils, trans
 from tpDcc.dccs.maya.core import attribute as attr_utils, color as color_utils
 
 from tpRigToolkit.libs.controlrig.core import controllib
+from tpRigToolkit.dccs.maya.core import curve as rig_curve_utils
+from tpRigToolkit.dccs.maya.data import cache
 
 LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
 
+# Maximum number of resolved control shapes kept in cache
+MAX_CACHED_CONTROL_SHAPES = 256
+
+# Process-wide cache of resolved control shapes shared by core and metarig controls. Entries are keyed by controls
+# path, control type and modification time of the controls path libraries, so entries of changed libraries are never
+# used again and are discarded when the cache is full
+_CONTROL_SHAPE_CACHE = cache.LRUCache(MAX_CACHED_CONTROL_SHAPES)
+_MISSING = object()
+
 
 class RigControl(object):
     """
@@ -349,23 +362,29 @@ class RigControl(object):
             keep_color = False
         color = color or (node_utils.get_rgb_color(shapes[0]) if shapes else 0)
 
-        control_exists = controllib.control_exists(type_name, controls_path=self._controls_path)
-        if not control_exists:
-            LOGGER.warning(
-                'Impossible to set curve type because control library does not contains shape {}'.format(type_name))
-            return False
-
         control_size = kwargs.pop('control_size', None)
         auto_scale = kwargs.pop('auto_scale', True)
         auto_scale = auto_scale if control_size is None else False
-        controllib.replace_control_curves(
-            self._control, type_name, controls_path=self._controls_path, keep_color=keep_color, color=color,
-            auto_scale=auto_scale, control_size=control_size, **kwargs)
+
+        # Shapes stored in the curve libraries of the controls path are applied from the shared library cache. Other
+        # shapes, or shape options not supported by the cached path, are handled by the control library
+        control_shape = get_control_shape(type_name, controls_path=self._controls_path)
+        if control_shape and shapes and control_size is None and not kwargs:
+            self._apply_control_shape(control_shape, color, auto_scale=auto_scale)
+        else:
+            if not control_shape and not controllib.control_exists(type_name, controls_path=self._controls_path):
+                LOGGER.warning(
+                    'Impossible to set curve type because control library does not contains shape {}'.format(
+                        type_name))
+                return False
+            controllib.replace_control_curves(
+                self._control, type_name, controls_path=self._controls_path, keep_color=keep_color, color=color,
+                auto_scale=auto_scale, control_size=control_size, **kwargs)
 
         self.update_shapes()
-        string_attr = attr_utils.StringAttribute('curveType')
-        string_attr.create(self._control)
-        string_attr.set_value(type_name)
+        if not maya.cmds.attributeQuery('curveType', node=self._control, exists=True):
+            maya.cmds.addAttr(self._control, longName='curveType', dataType='string')
+        maya.cmds.setAttr('{}.curveType'.format(self._control), type_name, type='string')
         maya.cmds.select(clear=True)
 
         return True
@@ -591,6 +610,24 @@ class RigControl(object):
         if copy_scale_tracker:
             None
 
+    def _apply_control_shape(self, curve_data_list, color, auto_scale=True):
+        """
+        Internal function that replaces the shapes of the control with the given library shapes
+        Shapes geometry is set through nurbsCurve setAttr, so the change can be undone
+        :param curve_data_list: list(NurbsCurveData)
+        :param color: int or tuple(float, float, float), color applied to the new shapes
+        :param auto_scale: bool, whether to scale the new shapes to match the size of the current ones
+        """
+
+        if auto_scale:
+            current_size = _get_shapes_size(rig_curve_utils.CurveToData(self._control).create_curve_data())
+            shape_size = _get_shapes_size(curve_data_list)
+            if current_size and shape_size:
+                curve_data_list = scale_control_shapes(curve_data_list, scale=current_size / shape_size)
+
+        set_control_shapes(self._control, curve_data_list, color=color)
+        self.update_shapes()
+
     def _create(self, tag=True):
         """
         Internal function that forces the creation of the control curve
@@ -678,3 +715,163 @@ def rename_control(old_name, new_name):
     """
 
     return RigControl(old_name).rename(new_name)
+
+
+def get_controls_path(controls_path=None):
+    """
+    Returns the directory where control curve libraries are stored
+    :param controls_path: str or None, controls directory. If not given, default curve libraries directory is used
+    :return: str or None, normalized controls directory or None if the directory does not exist
+    """
+
+    controls_path = controls_path or rig_curve_utils.get_curves_data_path()
+    if not controls_path or not os.path.isdir(controls_path):
+        return None
+
+    return os.path.normpath(os.path.abspath(controls_path))
+
+
+def get_control_shape(type_name, controls_path=None):
+    """
+    Returns the shapes of the given control type stored in the curve libraries of the given controls path
+    Resolved shapes are cached per controls path, control type and libraries modification time, so libraries are
+    only read again when they change
+    :param type_name: str
+    :param controls_path: str or None, directory where control curve libraries are stored. If not given, default
+        curve libraries directory is used
+    :return: list(NurbsCurveData) or None if the control type is not stored in any curve library of the given path.
+        Returned shapes are a copy, so they can be modified by the caller
+    """
+
+    controls_path = get_controls_path(controls_path)
+    if not type_name or not controls_path:
+        return None
+
+    library_paths = [
+        os.path.join(controls_path, library_file)
+        for library_file in sorted(rig_curve_utils.get_library_files(controls_path))]
+    cache_key = (controls_path, type_name, _get_libraries_mtime([controls_path] + library_paths))
+    curve_data_list = _CONTROL_SHAPE_CACHE.get(cache_key, _MISSING)
+    if curve_data_list is _MISSING:
+        curve_data_list = None
+        for library_path in library_paths:
+            curve_data_list = rig_curve_utils.get_library_curve(library_path, type_name)
+            if curve_data_list:
+                break
+        _CONTROL_SHAPE_CACHE.set(cache_key, curve_data_list or None)
+    if not curve_data_list:
+        return None
+
+    return scale_control_shapes(curve_data_list)
+
+
+def set_control_shapes(control, curve_data_list, color=None):
+    """
+    Replaces the shapes of the given control with the given shapes
+    Shapes are created or deleted to match the number of given shapes and their geometry is set within an undo chunk
+    :param control: str, control transform node
+    :param curve_data_list: list(NurbsCurveData)
+    :param color: int or tuple(float, float, float) or None, color applied to the shapes
+    :return: list(str), control shapes
+    """
+
+    if not rig_curve_utils.get_shapes(control):
+        maya.cmds.createNode('nurbsCurve', parent=control)
+    rig_curve_utils.match_shapes_to_data(control, curve_data_list)
+    rig_curve_utils.set_nurbs_data_api(control, curve_data_list)
+    shape_utils.rename_shapes(control)
+    shapes = shape_utils.get_shapes(control)
+    if color is not None and shapes:
+        node_utils.set_color(shapes, color)
+
+    return shapes
+
+
+def scale_control_shapes(curve_data_list, scale=1.0, offset=None):
+    """
+    Returns a copy of the given shapes with their CVs scaled and offset
+    :param curve_data_list: list(NurbsCurveData)
+    :param scale: float
+    :param offset: list(float, float, float) or None
+    :return: list(NurbsCurveData)
+    """
+
+    offset = offset or (0.0, 0.0, 0.0)
+    transformed_shapes = list()
+    for curve_data in curve_data_list:
+        cvs = array.array('d', curve_data.cvs)
+        if scale != 1.0 or any(offset):
+            cvs = array.array('d', [cv * scale + offset[i % 3] for i, cv in enumerate(cvs)])
+        transformed_shapes.append(curve_data._replace(knots=array.array('d', curve_data.knots), cvs=cvs))
+
+    return transformed_shapes
+
+
+def control_exists(type_name, controls_path=None):
+    """
+    Returns whether or not given control type exists in the control library
+    Control types stored in the curve libraries of the given controls path are resolved from the curve library cache
+    :param type_name: str
+    :param controls_path: str or None
+    :return: bool
+    """
+
+    if get_control_shape(type_name, controls_path=controls_path):
+        return True
+
+    return bool(controllib.control_exists(type_name, controls_path=controls_path))
+
+
+def clear_control_cache(controls_path=None):
+    """
+    Clears cached control shapes and control curve libraries
+    :param controls_path: str or None, controls path to clear cached shapes and libraries of. If not given, all cached
+        shapes and libraries are cleared
+    """
+
+    if not controls_path:
+        _CONTROL_SHAPE_CACHE.clear()
+        rig_curve_utils.clear_curve_library_cache()
+        return
+
+    controls_path = os.path.normpath(os.path.abspath(controls_path))
+    for cache_key in _CONTROL_SHAPE_CACHE.keys():
+        if cache_key[0] == controls_path:
+            _CONTROL_SHAPE_CACHE.pop(cache_key)
+    if not os.path.isdir(controls_path):
+        return
+    for library_file in rig_curve_utils.get_library_files(controls_path):
+        rig_curve_utils.clear_curve_library_cache(os.path.join(controls_path, library_file))
+
+
+def _get_shapes_size(curve_data_list):
+    """
+    Internal function that returns the size of the biggest axis of the bounding box of the given shapes CVs
+    :param curve_data_list: list(NurbsCurveData)
+    :return: float
+    """
+
+    size = 0.0
+    for axis in range(3):
+        values = [value for curve_data in curve_data_list for value in curve_data.cvs[axis::3]]
+        if values:
+            size = max(size, max(values) - min(values))
+
+    return size
+
+
+def _get_libraries_mtime(file_paths):
+    """
+    Internal function that returns the latest modification time of the given files
+    :param file_paths: list(str)
+    :return: float or None if none of the files exist
+    """
+
+    mtimes = list()
+    for file_path in file_paths:
+        try:
+            mtimes.append(os.path.getmtime(file_path))
+        except OSError:
+            continue
+
+    return max(mtimes) if mtimes else None
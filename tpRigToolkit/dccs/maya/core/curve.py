@@ -6,21 +6,39 @@ Module that contains functions to handle curve related data in Maya
 """
 
 import os
+import array
 import logging
 
 import maya.cmds
 import maya.mel
+import maya.api.OpenMaya as OpenMaya
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 from tpDcc import dcc
 from tpDcc.dccs.maya import api
-from tpDcc.dccs.maya.core import shape as shape_utils
+from tpDcc.dccs.maya.core import shape as shape_utils, decorators as maya_decorators
 from tpDcc.libs.python import python, folder, fileio, path as path_utils
 
 from tpRigToolkit.core import utils
-from tpRigToolkit.dccs.maya.data import curves
+from tpRigToolkit.dccs.maya.data import curves, curvelibrary, cache
 
 LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
 
+# Maximum number of curve libraries and listed directories kept in cache
+MAX_CACHED_LIBRARIES = 32
+MAX_CACHED_DIRECTORIES = 32
+
+# Process-wide caches shared by all CurveDataInfo instances. Entries are invalidated when the modification time
+# (or size) of their file or directory changes
+_LIBRARY_CACHE = cache.LRUCache(MAX_CACHED_LIBRARIES)
+_DIRECTORY_CACHE = cache.LRUCache(MAX_CACHED_DIRECTORIES)
+
+NurbsCurveData = curvelibrary.NurbsCurveData
+
 
 class CurveToData(object):
     def __init__(self, curve):
@@ -139,6 +157,17 @@ class CurveToData(object):
 
         return curve_arrays
 
+    def create_curve_data(self):
+        """
+        Returns binary NURBS curve payload of all the shapes of the curve
+        :return: list(NurbsCurveData)
+        """
+
+        return [
+            NurbsCurveData(
+                self.get_degree(i), self.get_form(i), array.array('d', self.get_knots(i)),
+                array.array('d', self.get_cvs(i))) for i in range(len(self._curves))]
+
     def create_mel_list(self):
         mel_curve_data_list = list()
 
@@ -152,12 +181,172 @@ class CurveToData(object):
         return mel_curve_data_list
 
 
+class CurveArrays(object):
+    """
+    Packed NURBS data of the shapes of many curves
+    Shapes of all curves are stored one after another. Knots and CVs of all shapes are stored in single arrays and
+    offset arrays store where the knots and CVs of each shape start
+    """
+
+    def __init__(self, curves, shape_offsets, degrees, forms, knot_offsets, knots, cv_offsets, cvs):
+        self._curves = list(curves)
+        self._shape_offsets = shape_offsets
+        self._degrees = degrees
+        self._forms = forms
+        self._knot_offsets = knot_offsets
+        self._knots = knots
+        self._cv_offsets = cv_offsets
+        self._cvs = cvs
+
+    def __len__(self):
+        return len(self._curves)
+
+    @property
+    def curves(self):
+        return self._curves
+
+    @property
+    def shape_offsets(self):
+        return self._shape_offsets
+
+    @property
+    def degrees(self):
+        return self._degrees
+
+    @property
+    def forms(self):
+        return self._forms
+
+    @property
+    def knot_offsets(self):
+        return self._knot_offsets
+
+    @property
+    def knots(self):
+        return self._knots
+
+    @property
+    def cv_offsets(self):
+        return self._cv_offsets
+
+    @property
+    def cvs(self):
+        return self._cvs
+
+    def get_shape_indices(self, index):
+        """
+        Returns the indices of the shapes of the curve in given index
+        :param index: int
+        :return: list(int)
+        """
+
+        return range(int(self._shape_offsets[index]), int(self._shape_offsets[index + 1]))
+
+    def get_shape_cvs(self, shape_index):
+        """
+        Returns CVs of the shape in given index
+        :param shape_index: int
+        :return: numpy.array, (N, 3) array of CV positions
+        """
+
+        return self._cvs[self._cv_offsets[shape_index]:self._cv_offsets[shape_index + 1]]
+
+    def get_shape_knots(self, shape_index):
+        """
+        Returns knots of the shape in given index
+        :param shape_index: int
+        :return: numpy.array
+        """
+
+        return self._knots[self._knot_offsets[shape_index]:self._knot_offsets[shape_index + 1]]
+
+    def get_curve_data(self, index):
+        """
+        Returns binary NURBS curve payload of all the shapes of the curve in given index
+        :param index: int
+        :return: list(NurbsCurveData)
+        """
+
+        return [
+            NurbsCurveData(
+                int(self._degrees[shape_index]), int(self._forms[shape_index]),
+                array.array('d', self.get_shape_knots(shape_index).tolist()),
+                array.array('d', self.get_shape_cvs(shape_index).ravel().tolist()))
+            for shape_index in self.get_shape_indices(index)]
+
+
+def get_curve_arrays(curves, space=OpenMaya.MSpace.kObject):
+    """
+    Extracts NURBS data of the shapes of all the given curves into packed NumPy arrays
+    Shapes are found and read through OpenMaya API, with a single CVs and knots query per shape
+    :param curves: list(str), curve transforms or shapes
+    :param space: OpenMaya.MSpace, space CV positions are returned in
+    :return: CurveArrays
+    """
+
+    curves = python.force_list(curves)
+    shape_counts = list()
+    degrees = list()
+    forms = list()
+    knot_arrays = list()
+    cv_arrays = list()
+    for curve in curves:
+        curve_functions = _get_curve_functions(curve)
+        shape_counts.append(len(curve_functions))
+        for curve_fn in curve_functions:
+            degrees.append(curve_fn.degree)
+            forms.append(curve_fn.form - 1)
+            knot_arrays.append(numpy.array(curve_fn.knots(), dtype='float64'))
+            cv_arrays.append(
+                numpy.array(curve_fn.cvPositions(space), dtype='float64').reshape(-1, 4)[:, :3])
+
+    return CurveArrays(
+        curves,
+        numpy.concatenate([[0], numpy.cumsum(shape_counts, dtype='int64')]).astype('int64'),
+        numpy.array(degrees, dtype='int32'),
+        numpy.array(forms, dtype='int32'),
+        numpy.concatenate([[0], numpy.cumsum([len(knots) for knots in knot_arrays], dtype='int64')]).astype('int64'),
+        numpy.concatenate(knot_arrays) if knot_arrays else numpy.zeros(0, dtype='float64'),
+        numpy.concatenate([[0], numpy.cumsum([len(cvs) for cvs in cv_arrays], dtype='int64')]).astype('int64'),
+        numpy.concatenate(cv_arrays) if cv_arrays else numpy.zeros((0, 3), dtype='float64'))
+
+
+def _get_curve_functions(curve):
+    """
+    Internal function that returns OpenMaya NURBS curve function sets of the non intermediate shapes of given curve
+    :param curve: str, curve transform or shape
+    :return: list(OpenMaya.MFnNurbsCurve)
+    """
+
+    selection = OpenMaya.MSelectionList()
+    try:
+        selection.add(curve)
+    except RuntimeError:
+        LOGGER.warning('{} does not exist'.format(curve))
+        return list()
+    dag_path = selection.getDagPath(0)
+    if dag_path.apiType() == OpenMaya.MFn.kNurbsCurve:
+        return [OpenMaya.MFnNurbsCurve(dag_path)]
+
+    curve_functions = list()
+    for i in range(dag_path.childCount()):
+        child = dag_path.child(i)
+        if not child.hasFn(OpenMaya.MFn.kNurbsCurve) or OpenMaya.MFnDagNode(child).isIntermediateObject:
+            continue
+        curve_functions.append(OpenMaya.MFnNurbsCurve(OpenMaya.MDagPath.getAPathTo(child)))
+
+    return curve_functions
+
+
 class CurveDataInfo(object):
-    def __init__(self, extension=None):
+    def __init__(self, extension=None, binary=False):
         self._libraries = dict()
         self._library_curves = dict()
+        self._library_files = dict()
         self._active_library = None
         self._curves_data_path = None
+        # New libraries are written in binary format. Existing libraries always keep their format
+        self._binary = binary
 
         extension = extension or '.curves'
         if not extension.startswith('.'):
@@ -199,7 +388,9 @@ class CurveDataInfo(object):
         else:
             file_name = library_name
 
-        library_path = fileio.create_file(file_name, self._curves_data_path)
+        library_path = path_utils.join_path(self._curves_data_path, file_name)
+        if not os.path.isfile(library_path):
+            library_path = fileio.create_file(file_name, self._curves_data_path)
         self._active_library = library_name
         self._library_curves[library_name] = dict()
         if skip_extension:
@@ -225,65 +416,45 @@ class CurveDataInfo(object):
             file_path = path_utils.join_path(
                 self._curves_data_path, '{}{}'.format(self._active_library, self._extension))
 
-        last_line_curve = False
-        curve_name = ''
-        curve_data = ''
-        curve_type = ''
-        curve_data_lines = list()
-
-        read_file = fileio.FileReader(file_path)
-        data_lines = read_file.read()
-        for line in data_lines:
-            if line.startswith('->'):
-                if curve_data_lines:
-                    self._library_curves[self._active_library][curve_name] = [curve_data_lines, curve_type]
-                    curve_type = ''
-                    curve_name = ''
-                    curve_data = ''
-                line_split = line.split()
-                curve_name = line_split[1]
-                if len(line_split) > 2:
-                    curve_type = line_split[2]
-                    if not curve_type:
-                        curve_type = ''
-                curve_name = curve_name.strip()
-                last_line_curve = True
-                curve_data_lines = list()
-            if not line.startswith('->') and last_line_curve:
-                line = line.strip()
-                if line:
-                    curve_data = line
-                    curve_data = curve_data.strip()
-                    curve_data_lines.append(curve_data)
-
-        if curve_data_lines:
-            self._library_curves[self._active_library][curve_name] = [curve_data_lines, curve_type]
+        # Curves of binary libraries are not read until they are used
+        self._library_files[self._active_library] = file_path
+        self._library_curves[self._active_library].update(get_curve_library(file_path))
 
     def write_data_to_file(self):
         if not self._active_library:
             LOGGER.warning('Must set active library before running this function')
             return
 
-        file_path = path_utils.join_path(self._curves_data_path, '{}{}'.format(self._active_library, self._extension))
-        write_file = fileio.FileWriter(file_path)
+        file_path = self._library_files.get(self._active_library, None) or path_utils.join_path(
+            self._curves_data_path, '{}{}'.format(self._active_library, self._extension))
         current_library = self._library_curves[self._active_library]
+        file_stamp = _get_file_stamp(file_path)
+        binary = curvelibrary.is_binary_library(file_path) if file_stamp and file_stamp[1] else self._binary
+        library_curves = dict()
         lines = list()
-        curves = current_library.keys()
-        curves.sort()
-        for curve in curves:
-            curve_data_lines, curve_type = current_library[curve]
+        for curve in sorted(current_library):
+            curve_data_lines, curve_type = self._get_curve_data(curve, self._active_library)
             if not curve_type:
                 if dcc.attribute_exists(curve, 'curveType'):
                     curve_type = dcc.get_attribute_value(curve, 'curveType')
+            if binary:
+                library_curves[curve] = ([_get_nurbs_data(curve_data) for curve_data in curve_data_lines], curve_type)
+                continue
+
             if curve != curve_type:
                 lines.append('-> {} {}'.format(curve, curve_type))
             if curve == curve_type:
                 lines.append('-> {}'.format(curve))
 
             for curve_data in curve_data_lines:
-                lines.append('{}'.format(curve_data))
+                lines.append('{}'.format(get_mel_data(curve_data)))
 
-        write_file.write(lines)
+        if binary:
+            curvelibrary.write_library(file_path, library_curves)
+        else:
+            write_file = fileio.FileWriter(file_path)
+            write_file.write(lines)
+        clear_curve_library_cache(file_path)
 
         return file_path
 
@@ -307,7 +478,7 @@ class CurveDataInfo(object):
         self._match_shapes_to_data(curve, mel_data_list)
 
         if mel_data_list:
-            set_nurbs_data_mel(curve, mel_data_list)
+            set_nurbs_data_api(curve, [_get_nurbs_data(mel_data) for mel_data in mel_data_list])
 
         shape_utils.rename_shapes(curve)
 
@@ -325,14 +496,43 @@ class CurveDataInfo(object):
                 LOGGER.warning('Must set active library before running this function')
                 return
 
-        mel_data_list = self._get_mel_data_list(curve)
+        curve_data_list = CurveToData(curve).create_curve_data()
         curve_type = curve
         if dcc.attribute_exists(curve, 'curveType'):
             curve_type = dcc.get_attribute_value(curve, 'curveType')
 
         transform = self._get_curve_parent(curve)
         if library_name:
-            self._library_curves[library_name][transform] = [mel_data_list, curve_type]
+            self._library_curves[library_name][transform] = [curve_data_list, curve_type]
+
+    def add_curves(self, curves, library_name=None):
+        """
+        Adds given curves to the library. NURBS data of all curves is extracted at once
+        :param curves: list(str)
+        :param library_name: str or None
+        """
+
+        if not curves:
+            return
+        if numpy is None:
+            for curve in curves:
+                self.add_curve(curve, library_name=library_name)
+            return
+        if library_name:
+            self.set_active_library(library_name)
+        else:
+            library_name = self._active_library
+            if not self._active_library:
+                LOGGER.warning('Must set active library before running this function')
+                return
+
+        curve_arrays = get_curve_arrays(curves)
+        for i, curve in enumerate(curve_arrays.curves):
+            curve_type = curve
+            if dcc.attribute_exists(curve, 'curveType'):
+                curve_type = dcc.get_attribute_value(curve, 'curveType')
+            transform = self._get_curve_parent(curve)
+            self._library_curves[library_name][transform] = [curve_arrays.get_curve_data(i), curve_type]
 
     def remove_curve(self, curve, library_name=None):
         if not curve:
@@ -381,25 +581,15 @@ class CurveDataInfo(object):
     # ==============================================================================================
 
     def _get_curves_data_path(self):
-        current_path = curves.__path__[0]
-        custom_curve_path = utils.get_custom('custom_curve_path')
-        if custom_curve_path and os.path.isdir(custom_curve_path):
-            curve_data = os.path.join(custom_curve_path)
-            folder.create_folder(curve_data)
-            LOGGER.info('Using custom curve directory: {}'.format(custom_curve_path))
-            current_path = custom_curve_path
-
-        self._curves_data_path = current_path
+        self._curves_data_path = get_curves_data_path()
 
         return self._curves_data_path
 
     def _load_libraries(self):
         curves_data_path = self._curves_data_path or self._get_curves_data_path()
-        files = os.listdir(curves_data_path)
-        for filename in files:
-            if filename.endswith(self._extension):
-                split_file = filename.split('.')
-                self._library_curves[split_file[0]] = filename
+        for filename in get_library_files(curves_data_path, self._extension):
+            split_file = filename.split('.')
+            self._library_curves[split_file[0]] = filename
 
     def _initialize_library_curve(self):
         names = self.get_library_names()
@@ -412,6 +602,12 @@ class CurveDataInfo(object):
             LOGGER.warning('{} is not in the curve library {}'.format(curve_name, curve_library))
             return None, None
 
+        # Curves of binary libraries are read from the library file the first time they are used
+        curve_data_list, curve_type = curve_dict[curve_name]
+        if curve_data_list is None:
+            curve_data_list = get_library_curve(self._library_files[curve_library], curve_name) or list()
+            curve_dict[curve_name] = [curve_data_list, curve_type]
+
         return curve_dict[curve_name]
 
     def _get_curve_parent(self, curve):
@@ -453,34 +649,254 @@ class CurveDataInfo(object):
         return True
 
     def _match_shapes_to_data(self, curve, data_list):
+        match_shapes_to_data(curve, data_list)
 
-        found = list()
 
-        shapes = get_shapes(curve)
-        if not shapes:
-            return
+def get_curves_data_path():
+    """
+    Returns directory where default curve libraries are stored
+    Custom curve directory is used if it is defined in the toolkit settings
+    :return: str
+    """
+
+    current_path = curves.__path__[0]
+    custom_curve_path = utils.get_custom('custom_curve_path')
+    if custom_curve_path and os.path.isdir(custom_curve_path):
+        curve_data = os.path.join(custom_curve_path)
+        folder.create_folder(curve_data)
+        LOGGER.debug('Using custom curve directory: {}'.format(custom_curve_path))
+        current_path = custom_curve_path
+
+    return current_path
+
+
+def parse_curve_library(file_path):
+    """
+    Parses given curves library file
+    :param file_path: str
+    :return: dict(str, list(list(str), str)), dictionary mapping curve names with their list of MEL curve data
+        lines and their curve type
+    """
+
+    library_curves = dict()
+    last_line_curve = False
+    curve_name = ''
+    curve_type = ''
+    curve_data_lines = list()
+
+    read_file = fileio.FileReader(file_path)
+    data_lines = read_file.read() or list()
+    for line in data_lines:
+        if line.startswith('->'):
+            if curve_data_lines:
+                library_curves[curve_name] = [curve_data_lines, curve_type]
+                curve_type = ''
+                curve_name = ''
+            line_split = line.split()
+            curve_name = line_split[1]
+            if len(line_split) > 2:
+                curve_type = line_split[2]
+                if not curve_type:
+                    curve_type = ''
+            curve_name = curve_name.strip()
+            last_line_curve = True
+            curve_data_lines = list()
+        if not line.startswith('->') and last_line_curve:
+            line = line.strip()
+            if line:
+                curve_data_lines.append(line)
 
-        shape_color = None
-        if len(shapes):
-            shape_color = dcc.get_attribute_value(shapes[0], 'overrideColor')
-            shape_color_enabled = dcc.get_attribute_value(shapes[0], 'overrideEnabled')
-
-        for shape in shapes:
-            if dcc.node_type(shape) == 'nurbsCurve':
-                found.append(shape)
-
-        if len(found) > len(data_list):
-            dcc.delete_node(found[len(data_list):])
-        if len(found) < len(data_list):
-            current_index = len(found)
-            for i in range(current_index, len(data_list)):
-                curve_shape = maya.cmds.createNode('nurbsCurve')
-                if shape_color is not None and shape_color_enabled:
-                    dcc.set_attribute_value(curve_shape, 'overrideEnabled', True)
-                    dcc.set_attribute_value(curve_shape, 'overrideColor', shape_color)
-                parent = dcc.node_parent(curve_shape)
-                maya.cmds.parent(curve_shape, curve, r=True, s=True)
-                dcc.delete_node(parent)
+    if curve_data_lines:
+        library_curves[curve_name] = [curve_data_lines, curve_type]
+
+    return library_curves
+
+
+def get_curve_library(file_path):
+    """
+    Returns parsed curves of the given curves library file. Libraries are only parsed again if their file changed
+    since the last time they were parsed
+    :param file_path: str
+    :return: dict(str, list(list(str), str)), dictionary mapping curve names with their list of MEL curve data
+        lines and their curve type. Returned dictionary is a copy, so it can be modified by the caller
+    """
+
+    file_path = os.path.normpath(os.path.abspath(file_path))
+    file_stamp = _get_file_stamp(file_path)
+    if file_stamp is None:
+        return dict()
+
+    cached = _get_cached_library(file_path, file_stamp)
+    if cached[2]:
+        return dict((curve_name, [None, curve_type]) for curve_name, curve_type in cached[1].items())
+
+    # Entries are copied too, so in place changes done by the caller never modify the shared cache
+    return dict(
+        (curve_name, [list(curve_data_lines), curve_type]) for curve_name, (curve_data_lines, curve_type) in
+        cached[1].items())
+
+
+def get_library_curve(file_path, curve_name):
+    """
+    Returns the shapes of the given curve stored in the given curves library file
+    Only the curve record is read from binary curve libraries
+    :param file_path: str
+    :param curve_name: str
+    :return: list(NurbsCurveData) or None if the curve is not stored in the library
+    """
+
+    file_path = os.path.normpath(os.path.abspath(file_path))
+    file_stamp = _get_file_stamp(file_path)
+    if file_stamp is None:
+        return None
+
+    cached = _get_cached_library(file_path, file_stamp)
+    if cached[2]:
+        return cached[2].get_curve(curve_name)
+    if curve_name not in cached[1]:
+        return None
+
+    return [_get_nurbs_data(curve_data) for curve_data in cached[1][curve_name][0]]
+
+
+def convert_curve_library(file_path, output_path=None):
+    """
+    Converts given text curves library file into a binary curves library file
+    :param file_path: str, text curves library file
+    :param output_path: str or None, path of the binary library. If not given, given file is overwritten
+    :return: str, path of the binary library
+    """
+
+    output_path = output_path or file_path
+    if curvelibrary.is_binary_library(file_path):
+        LOGGER.info('Curve library "{}" is already a binary library'.format(file_path))
+        return file_path
+
+    library_curves = dict()
+    for curve_name, (curve_data_lines, curve_type) in parse_curve_library(file_path).items():
+        library_curves[curve_name] = ([get_nurbs_data(curve_data) for curve_data in curve_data_lines], curve_type)
+    curvelibrary.write_library(output_path, library_curves)
+    clear_curve_library_cache(output_path)
+
+    return output_path
+
+
+def get_library_files(directory, extension='.curves'):
+    """
+    Returns the curve library files stored in the given directory. Directory is only listed again if its contents
+    changed since the last time it was listed
+    :param directory: str
+    :param extension: str
+    :return: list(str)
+    """
+
+    directory = os.path.normpath(os.path.abspath(directory))
+    directory_stamp = _get_file_stamp(directory)
+    if directory_stamp is None:
+        return list()
+
+    cached = _DIRECTORY_CACHE.get((directory, extension))
+    if not cached or cached[0] != directory_stamp:
+        cached = (directory_stamp, [file_name for file_name in os.listdir(directory) if file_name.endswith(extension)])
+        _DIRECTORY_CACHE.set((directory, extension), cached)
+
+    return list(cached[1])
+
+
+def _get_cached_library(file_path, file_stamp):
+    """
+    Internal function that returns cached data of the given library file, parsing it if it changed
+    :param file_path: str, normalized library file path
+    :param file_stamp: tuple(float, int)
+    :return: tuple(tuple(float, int), dict, curvelibrary.CurveLibraryFile or None), file stamp, parsed curves and
+        binary library reader. For binary libraries, parsed curves dictionary maps curve names with curve types
+    """
+
+    cached = _LIBRARY_CACHE.get(file_path)
+    if cached and cached[0] == file_stamp:
+        return cached
+
+    if curvelibrary.is_binary_library(file_path):
+        library_file = curvelibrary.CurveLibraryFile(file_path)
+        curve_types = dict(
+            (curve_name, library_file.get_curve_type(curve_name)) for curve_name in library_file.get_curve_names())
+        cached = (file_stamp, curve_types, library_file)
+    else:
+        cached = (file_stamp, parse_curve_library(file_path), None)
+    _LIBRARY_CACHE.set(file_path, cached)
+
+    return cached
+
+
+def clear_curve_library_cache(file_path=None):
+    """
+    Clears cached curve libraries
+    :param file_path: str or None, library file to clear cache of. Listed contents of its directory are cleared too.
+        If not given, all cached libraries and directories are cleared
+    """
+
+    if file_path:
+        file_path = os.path.normpath(os.path.abspath(file_path))
+        _LIBRARY_CACHE.pop(file_path)
+        directory = os.path.dirname(file_path)
+        for directory_key in _DIRECTORY_CACHE.keys():
+            if directory_key[0] == directory:
+                _DIRECTORY_CACHE.pop(directory_key)
+        return
+
+    _LIBRARY_CACHE.clear()
+    _DIRECTORY_CACHE.clear()
+
+
+def _get_file_stamp(file_path):
+    """
+    Internal function that returns the modification time and size of the given file
+    :param file_path: str
+    :return: tuple(float, int) or None if the file does not exist
+    """
+
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+
+    return file_stat.st_mtime, file_stat.st_size
+
+
+def match_shapes_to_data(curve, data_list):
+    """
+    Creates or deletes NURBS curve shapes of the given curve so it has as many shapes as given curve data items
+    :param curve: str
+    :param data_list: list
+    """
+
+    found = list()
+
+    shapes = get_shapes(curve)
+    if not shapes:
+        return
+
+    shape_color = None
+    if len(shapes):
+        shape_color = dcc.get_attribute_value(shapes[0], 'overrideColor')
+        shape_color_enabled = dcc.get_attribute_value(shapes[0], 'overrideEnabled')
+
+    for shape in shapes:
+        if dcc.node_type(shape) == 'nurbsCurve':
+            found.append(shape)
+
+    if len(found) > len(data_list):
+        dcc.delete_node(found[len(data_list):])
+    if len(found) < len(data_list):
+        current_index = len(found)
+        for i in range(current_index, len(data_list)):
+            curve_shape = maya.cmds.createNode('nurbsCurve')
+            if shape_color is not None and shape_color_enabled:
+                dcc.set_attribute_value(curve_shape, 'overrideEnabled', True)
+                dcc.set_attribute_value(curve_shape, 'overrideColor', shape_color)
+            parent = dcc.node_parent(curve_shape)
+            maya.cmds.parent(curve_shape, curve, r=True, s=True)
+            dcc.delete_node(parent)
 
 
 def get_shapes(transform):
@@ -537,6 +953,104 @@ def set_nurbs_data_mel(curve, mel_curve_data):
         maya.cmds.currentUnit(linear=current_unit)
 
 
+def get_nurbs_data(mel_curve_data):
+    """
+    Converts given MEL nurbsCurve data string into a binary NURBS curve payload
+    :param mel_curve_data: str, MEL nurbsCurve data (degree spans form rational dimension knot_count knots... cv_count
+        cvs...)
+    :return: NurbsCurveData
+    """
+
+    values = mel_curve_data.split()
+    degree = int(values[0])
+    form = int(values[2])
+    rational = values[3] in ('1', 'yes', 'true')
+    dimension = int(values[4])
+    knot_count = int(values[5])
+    knots = array.array('d', map(float, values[6:6 + knot_count]))
+    cv_count = int(values[6 + knot_count])
+    cv_size = dimension + (1 if rational else 0)
+    cv_values = values[7 + knot_count:7 + knot_count + cv_count * cv_size]
+    cvs = array.array('d')
+    for i in range(cv_count):
+        cv = [float(value) for value in cv_values[i * cv_size:i * cv_size + dimension]]
+        cvs.extend(cv + [0.0] * (3 - len(cv)))
+
+    return NurbsCurveData(degree, form, knots, cvs)
+
+
+def get_mel_data(curve_data):
+    """
+    Converts given binary NURBS curve payload into a MEL nurbsCurve data string
+    :param curve_data: NurbsCurveData or str, if a MEL data string is given it is returned as it is
+    :return: str
+    """
+
+    if not isinstance(curve_data, NurbsCurveData):
+        return curve_data
+
+    return ''.join(' {}'.format(value) for value in get_nurbs_data_array(curve_data))
+
+
+def _get_nurbs_data(curve_data):
+    """
+    Internal function that returns given curve data as a binary NURBS curve payload
+    :param curve_data: NurbsCurveData or str, binary payload or MEL nurbsCurve data string
+    :return: NurbsCurveData
+    """
+
+    if isinstance(curve_data, NurbsCurveData):
+        return curve_data
+
+    return get_nurbs_data(curve_data)
+
+
+@maya_decorators.undo_chunk
+def set_nurbs_data_api(curve, curve_data_list):
+    """
+    Applies given binary NURBS curve payloads to the shapes of the given curve
+    Curve geometry is set with nurbsCurve setAttr calls built directly from the payloads (no MEL strings are parsed),
+    so the change is registered in Maya undo queue as a single undo chunk. Create inputs of the shapes are
+    disconnected so the new geometry is not overridden by their history. If the geometry of any shape cannot be set,
+    disconnected inputs are connected back and the error is raised
+    :param curve: str
+    :param curve_data_list: list(NurbsCurveData)
+    """
+
+    shapes = get_shapes(curve)
+    disconnected = list()
+    try:
+        for shape, curve_data in zip(shapes, curve_data_list):
+            create_input = dcc.get_attribute_input('{}.create'.format(shape))
+            if create_input:
+                LOGGER.warning(
+                    '{} has history. Disconnecting create attribute on curve. '
+                    'This will allow CV position change'.format(shape))
+                maya.cmds.disconnectAttr(create_input, '{}.create'.format(shape))
+                disconnected.append((create_input, '{}.create'.format(shape)))
+            set_nurbs_data(shape, get_nurbs_data_array(_get_nurbs_data(curve_data)))
+    except Exception:
+        for create_input, create_attribute in disconnected:
+            maya.cmds.connectAttr(create_input, create_attribute, force=True)
+        raise
+
+
+def get_nurbs_data_array(curve_data):
+    """
+    Returns given binary NURBS curve payload as the list of values expected by nurbsCurve setAttr
+    :param curve_data: NurbsCurveData
+    :return: list, degree, spans, form, rational, dimension, knot count, knots, CV count and CVs values
+    """
+
+    cv_count = len(curve_data.cvs) // 3
+    values = [curve_data.degree, cv_count - curve_data.degree, curve_data.form, 0, 3, len(curve_data.knots)]
+    values.extend(curve_data.knots)
+    values.append(cv_count)
+    values.extend(curve_data.cvs)
+
+    return values
+
+
 def get_library_shape_names():
     curve_info = CurveDataInfo()
     curve_info.set_active_library('default_curves')
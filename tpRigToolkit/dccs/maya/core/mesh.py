@@ -0,0 +1,230 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains mesh functions for tpRigToolkit-dccs-maya that work directly with OpenMaya API
+"""
+
+import array
+import hashlib
+
+import maya.cmds
+import maya.api.OpenMaya as OpenMaya
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Number of decimals taken into account when comparing mesh points
+POINTS_PRECISION = 4
+
+
+def get_mesh_shape(mesh):
+    """
+    Returns the non intermediate mesh shape of the given node
+    :param mesh: str, mesh transform or shape node
+    :return: str or None
+    """
+
+    if maya.cmds.nodeType(mesh) == 'mesh':
+        return mesh
+
+    shapes = maya.cmds.listRelatives(mesh, shapes=True, noIntermediate=True, fullPath=True, type='mesh')
+
+    return shapes[0] if shapes else None
+
+
+def get_original_shape(mesh):
+    """
+    Returns the original (intermediate) mesh shape of the given node: the shape before any deformer is applied
+    :param mesh: str, mesh transform or shape node
+    :return: str or None
+    """
+
+    if maya.cmds.nodeType(mesh) == 'mesh':
+        mesh = (maya.cmds.listRelatives(mesh, parent=True, fullPath=True) or [mesh])[0]
+
+    shapes = maya.cmds.listRelatives(mesh, shapes=True, fullPath=True, type='mesh') or list()
+    for shape in shapes:
+        if not maya.cmds.getAttr('{}.intermediateObject'.format(shape)):
+            continue
+        if maya.cmds.listConnections('{}.inMesh'.format(shape), source=True, destination=False):
+            continue
+        return shape
+
+    return None
+
+
+def get_mesh_function(mesh):
+    """
+    Returns OpenMaya mesh function set of the given mesh node
+    :param mesh: str, mesh transform or shape node
+    :return: OpenMaya.MFnMesh or None
+    """
+
+    shape = get_mesh_shape(mesh)
+    if not shape:
+        return None
+
+    selection = OpenMaya.MSelectionList()
+    selection.add(shape)
+
+    return OpenMaya.MFnMesh(selection.getDagPath(0))
+
+
+def get_topology_hash(mesh):
+    """
+    Returns a hash of the topology (vertex count and face connectivity) of the given mesh
+    :param mesh: str, mesh transform or shape node
+    :return: str or None
+    """
+
+    mesh_fn = get_mesh_function(mesh)
+    if not mesh_fn:
+        return None
+
+    polygon_counts, polygon_connects = mesh_fn.getVertices()
+    topology_hash = hashlib.sha1()
+    topology_hash.update(str(mesh_fn.numVertices).encode('utf-8'))
+    topology_hash.update(_to_bytes(array.array('i', polygon_counts)))
+    topology_hash.update(_to_bytes(array.array('i', polygon_connects)))
+
+    return topology_hash.hexdigest()
+
+
+def get_points_hash(mesh, precision=POINTS_PRECISION):
+    """
+    Returns a hash of the object space points of the given mesh
+    :param mesh: str, mesh transform or shape node
+    :param precision: int, number of decimals taken into account
+    :return: str or None
+    """
+
+    mesh_fn = get_mesh_function(mesh)
+    if not mesh_fn:
+        return None
+
+    points = array.array('d')
+    for point in mesh_fn.getPoints(OpenMaya.MSpace.kObject):
+        points.extend((round(point.x, precision), round(point.y, precision), round(point.z, precision)))
+
+    return hashlib.sha1(_to_bytes(points)).hexdigest()
+
+
+def get_mesh_points(mesh, world=True):
+    """
+    Returns the points of the given mesh as a NumPy array
+    :param mesh: str, mesh transform or shape node
+    :param world: bool, Whether to return world space or object space points
+    :return: numpy.array or None, (N, 3) array of points
+    """
+
+    mesh_fn = get_mesh_function(mesh)
+    if not mesh_fn or numpy is None:
+        return None
+
+    space = OpenMaya.MSpace.kWorld if world else OpenMaya.MSpace.kObject
+    points = mesh_fn.getPoints(space)
+
+    return numpy.array([(point.x, point.y, point.z) for point in points], dtype='float64').reshape(-1, 3)
+
+
+def get_mesh_triangles(mesh):
+    """
+    Returns the vertex indices of the triangles of the given mesh as a NumPy array
+    :param mesh: str, mesh transform or shape node
+    :return: numpy.array or None, (M, 3) array of vertex indices
+    """
+
+    mesh_fn = get_mesh_function(mesh)
+    if not mesh_fn or numpy is None:
+        return None
+
+    _, triangle_vertices = mesh_fn.getTriangles()
+
+    return numpy.array(triangle_vertices, dtype='int64').reshape(-1, 3)
+
+
+def get_closest_triangles(points, triangles, target_points):
+    """
+    Returns, for each one of the target points, the index of the closest triangle of the given triangle mesh
+    Triangle mesh is created in memory (no scene nodes are created) and queried using OpenMaya mesh intersector
+    :param points: numpy.array, (N, 3) array of mesh points
+    :param triangles: numpy.array, (M, 3) array of triangle vertex indices
+    :param target_points: numpy.array, (P, 3) array of points to find closest triangle of
+    :return: numpy.array, (P, ) array of triangle indices
+    """
+
+    mesh_data = OpenMaya.MFnMeshData().create()
+    vertices = OpenMaya.MPointArray([OpenMaya.MPoint(*point) for point in numpy.asarray(points).tolist()])
+    triangles = numpy.asarray(triangles)
+    OpenMaya.MFnMesh().create(
+        vertices, [3] * len(triangles), triangles.ravel().tolist(), parent=mesh_data)
+    intersector = OpenMaya.MMeshIntersector()
+    intersector.create(mesh_data, OpenMaya.MMatrix())
+
+    triangle_ids = numpy.empty(len(target_points), dtype='int64')
+    for i, point in enumerate(numpy.asarray(target_points).tolist()):
+        triangle_ids[i] = intersector.getClosestPoint(OpenMaya.MPoint(*point)).face
+
+    return triangle_ids
+
+
+def get_mesh_fingerprint(mesh, rest_mesh=None, precision=POINTS_PRECISION):
+    """
+    Returns a fingerprint of the given mesh that can be used to check if a mesh changed or not
+    :param mesh: str, mesh transform or shape node
+    :param rest_mesh: str or None, mesh used to retrieve rest points. If not given, mesh points are used
+    :param precision: int, number of decimals taken into account when comparing points
+    :return: dict or None
+    """
+
+    mesh_fn = get_mesh_function(mesh)
+    if not mesh_fn:
+        return None
+
+    return {
+        'vertex_count': mesh_fn.numVertices,
+        'face_count': mesh_fn.numPolygons,
+        'topology': get_topology_hash(mesh),
+        'points': get_points_hash(rest_mesh or mesh, precision=precision)
+    }
+
+
+def is_same_topology(fingerprint, other_fingerprint):
+    """
+    Returns whether or not given mesh fingerprints have the same topology
+    :param fingerprint: dict
+    :param other_fingerprint: dict
+    :return: bool
+    """
+
+    if not fingerprint or not other_fingerprint:
+        return False
+
+    return fingerprint.get('topology') == other_fingerprint.get('topology')
+
+
+def is_same_mesh(fingerprint, other_fingerprint):
+    """
+    Returns whether or not given mesh fingerprints have the same topology and rest points
+    :param fingerprint: dict
+    :param other_fingerprint: dict
+    :return: bool
+    """
+
+    if not is_same_topology(fingerprint, other_fingerprint):
+        return False
+
+    return fingerprint.get('points') == other_fingerprint.get('points')
+
+
+def _to_bytes(values):
+    """
+    Internal function that returns the bytes of the given array
+    :param values: array.array
+    :return: bytes
+    """
+
+    return values.tobytes() if hasattr(values, 'tobytes') else values.tostring()
@@ -0,0 +1,240 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains control shapes mirroring functions for tpRigToolkit-dccs-maya
+CVs of all source controls are extracted as a single world space array, reflected at once and applied to their
+mirror controls through OpenMaya API
+NOTE: CV positions set through OpenMaya API are not registered in Maya undo queue, so mirroring cannot be undone
+"""
+
+import re
+import logging
+from collections import OrderedDict
+
+import maya.api.OpenMaya as OpenMaya
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from tpDcc import dcc
+
+from tpRigToolkit.managers import names
+from tpRigToolkit.libs.controlrig.core import controllib
+from tpRigToolkit.dccs.maya.core import curve as curve_utils
+
+LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
+
+# Pairs of side names used to find mirror side of a name. Case of the side name is kept
+SIDE_PAIRS = [('left', 'right'), ('lf', 'rt'), ('l', 'r')]
+SIDE_TOKEN_REGEX = re.compile(r'(?<![^_])([^_]+)(?![^_])')
+# Normal of the default mirror plane (YZ plane)
+MIRROR_NORMAL = (1.0, 0.0, 0.0)
+
+
+def get_mirror_side(side):
+    """
+    Returns the opposite side of the given side name
+    :param side: str
+    :return: str or None if given side is not a left or right side
+    """
+
+    if not side:
+        return None
+
+    for left_side, right_side in SIDE_PAIRS:
+        for source_side, target_side in ((left_side, right_side), (right_side, left_side)):
+            if side.lower() != source_side:
+                continue
+            if side.isupper():
+                return target_side.upper()
+            elif side[0].isupper():
+                return target_side.capitalize()
+            return target_side
+
+    return None
+
+
+def get_name_side(name, naming_file=None, rule_name=None):
+    """
+    Returns the side of the given node name
+    Name is parsed using the naming rules of the names manager. If the name cannot be parsed with those rules, first
+    left or right side token of the name is returned
+    :param name: str
+    :param naming_file: str or None
+    :param rule_name: str or None
+    :return: str or None
+    """
+
+    parsed_name = names.parse_name(name, naming_file=naming_file, rule_name=rule_name)
+    if parsed_name and parsed_name.get('side'):
+        return parsed_name['side']
+
+    for token in SIDE_TOKEN_REGEX.findall(name):
+        if get_mirror_side(token):
+            return token
+
+    return None
+
+
+def get_mirror_name(name, naming_file=None, rule_name=None):
+    """
+    Returns the name of the mirror node of the given node
+    Name is parsed and solved using the naming rules of the names manager. If the name cannot be parsed with those
+    rules, side tokens of the name are replaced
+    :param name: str
+    :param naming_file: str or None
+    :param rule_name: str or None
+    :return: str or None if the mirror name cannot be found
+    """
+
+    parsed_name = names.parse_name(name, naming_file=naming_file, rule_name=rule_name)
+    if parsed_name and parsed_name.get('side'):
+        mirror_side = get_mirror_side(parsed_name['side'])
+        if not mirror_side:
+            return None
+        parsed_name['side'] = mirror_side
+        return names.solve_name(naming_file=naming_file, rule_name=rule_name, **parsed_name)
+
+    mirror_name = SIDE_TOKEN_REGEX.sub(lambda match: get_mirror_side(match.group(1)) or match.group(1), name)
+
+    return mirror_name if mirror_name != name else None
+
+
+def get_mirror_pairs(controls=None, naming_file=None, rule_name=None, left_to_right=True):
+    """
+    Returns the controls of one side and their mirror controls
+    :param controls: list(str) or None, controls to mirror. If not given, all scene controls are used
+    :param naming_file: str or None
+    :param rule_name: str or None
+    :param left_to_right: bool, whether left side controls are mirrored into right side ones or vice versa
+    :return: OrderedDict(str, str), dictionary mapping source controls with their mirror controls
+    """
+
+    controls = controls or controllib.get_controls() or list()
+    is_source_side = dcc.name_is_left if left_to_right else dcc.name_is_right
+
+    mirror_pairs = OrderedDict()
+    for control in controls:
+        side = get_name_side(control, naming_file=naming_file, rule_name=rule_name)
+        if not side or not is_source_side(side):
+            continue
+        mirror_control = get_mirror_name(control, naming_file=naming_file, rule_name=rule_name)
+        if not mirror_control or not dcc.node_exists(mirror_control):
+            continue
+        mirror_pairs[control] = mirror_control
+
+    return mirror_pairs
+
+
+def reflect_points(points, normal=MIRROR_NORMAL, origin=(0.0, 0.0, 0.0)):
+    """
+    Reflects given points across the plane defined by the given normal and origin
+    :param points: numpy.array, (N, 3) array of points
+    :param normal: tuple(float, float, float), normal of the mirror plane
+    :param origin: tuple(float, float, float), point of the mirror plane
+    :return: numpy.array, (N, 3) array of reflected points
+    """
+
+    points = numpy.asarray(points, dtype='float64')
+    normal = numpy.asarray(normal, dtype='float64')
+    normal = normal / numpy.linalg.norm(normal)
+    origin = numpy.asarray(origin, dtype='float64')
+    distances = (points - origin).dot(normal)
+
+    return points - 2.0 * distances[:, None] * normal
+
+
+def mirror_control_shapes(
+        controls=None, normal=MIRROR_NORMAL, origin=(0.0, 0.0, 0.0), naming_file=None, rule_name=None,
+        left_to_right=True):
+    """
+    Mirrors the shapes of the controls of one side into their mirror controls
+    CVs of all source controls are reflected at once in world space. Mirror control shapes are rebuilt only if their
+    topology does not match the one of their source control shapes
+    NOTE: CV positions are set through OpenMaya API, so this operation cannot be undone. Save the scene (or
+    duplicate the mirror controls) before calling it if the current shapes may need to be restored
+    :param controls: list(str) or None, controls to mirror. If not given, all scene controls are used
+    :param normal: tuple(float, float, float), normal of the mirror plane
+    :param origin: tuple(float, float, float), point of the mirror plane
+    :param naming_file: str or None
+    :param rule_name: str or None
+    :param left_to_right: bool, whether left side controls are mirrored into right side ones or vice versa
+    :return: OrderedDict(str, str), dictionary mapping source controls with the mirror controls they were mirrored to
+    """
+
+    if numpy is None:
+        LOGGER.warning('NumPy is not available. Impossible to mirror control shapes')
+        return OrderedDict()
+
+    mirror_pairs = get_mirror_pairs(
+        controls, naming_file=naming_file, rule_name=rule_name, left_to_right=left_to_right)
+    if not mirror_pairs:
+        LOGGER.warning('No mirror controls found')
+        return mirror_pairs
+
+    LOGGER.warning('Mirroring shapes of {} controls. This operation cannot be undone'.format(len(mirror_pairs)))
+
+    source_arrays = curve_utils.get_curve_arrays(list(mirror_pairs.keys()), space=OpenMaya.MSpace.kWorld)
+    # Reflected CVs are converted to Python values once, so each shape point array is built from a slice of them
+    mirror_cvs = reflect_points(source_arrays.cvs, normal=normal, origin=origin).tolist()
+    target_arrays = curve_utils.get_curve_arrays(list(mirror_pairs.values()))
+
+    for i, (source_control, target_control) in enumerate(mirror_pairs.items()):
+        source_shapes = list(source_arrays.get_shape_indices(i))
+        target_shapes = list(target_arrays.get_shape_indices(i))
+        if not _has_same_topology(source_arrays, source_shapes, target_arrays, target_shapes):
+            source_data = source_arrays.get_curve_data(i)
+            curve_utils.match_shapes_to_data(target_control, source_data)
+            curve_utils.set_nurbs_data_api(target_control, source_data)
+
+        target_paths = _get_shape_paths(target_control)
+        for shape_index, target_path in zip(source_shapes, target_paths):
+            cvs = mirror_cvs[source_arrays.cv_offsets[shape_index]:source_arrays.cv_offsets[shape_index + 1]]
+            curve_fn = OpenMaya.MFnNurbsCurve(target_path)
+            curve_fn.setCVPositions(OpenMaya.MPointArray(cvs), OpenMaya.MSpace.kWorld)
+            curve_fn.updateCurve()
+
+    LOGGER.info('Mirrored shapes of {} controls'.format(len(mirror_pairs)))
+
+    return mirror_pairs
+
+
+def _has_same_topology(source_arrays, source_shapes, target_arrays, target_shapes):
+    """
+    Internal function that returns whether or not given shapes have the same number of CVs, degree and form
+    :param source_arrays: curve.CurveArrays
+    :param source_shapes: list(int)
+    :param target_arrays: curve.CurveArrays
+    :param target_shapes: list(int)
+    :return: bool
+    """
+
+    if len(source_shapes) != len(target_shapes):
+        return False
+
+    for source_shape, target_shape in zip(source_shapes, target_shapes):
+        if source_arrays.degrees[source_shape] != target_arrays.degrees[target_shape]:
+            return False
+        if source_arrays.forms[source_shape] != target_arrays.forms[target_shape]:
+            return False
+        if len(source_arrays.get_shape_cvs(source_shape)) != len(target_arrays.get_shape_cvs(target_shape)):
+            return False
+
+    return True
+
+
+def _get_shape_paths(curve):
+    """
+    Internal function that returns the DAG paths of the NURBS curve shapes of the given curve
+    :param curve: str
+    :return: list(OpenMaya.MDagPath)
+    """
+
+    selection = OpenMaya.MSelectionList()
+    for shape in curve_utils.get_shapes(curve):
+        selection.add(shape)
+
+    return [selection.getDagPath(i) for i in range(selection.length())]
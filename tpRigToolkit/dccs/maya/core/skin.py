@@ -0,0 +1,341 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains skin cluster functions for tpRigToolkit-dccs-maya that work directly with OpenMaya API
+"""
+
+import logging
+from collections import OrderedDict
+
+import maya.cmds
+import maya.api.OpenMaya as OpenMaya
+import maya.api.OpenMayaAnim as OpenMayaAnim
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
+
+# Weights lower than this value are ignored when applying skin weights
+WEIGHT_THRESHOLD = 0.0001
+
+
+def get_skin_cluster_function(skin_cluster):
+    """
+    Returns OpenMaya skin cluster function set of the given skin cluster node
+    :param skin_cluster: str
+    :return: OpenMayaAnim.MFnSkinCluster
+    """
+
+    selection = OpenMaya.MSelectionList()
+    selection.add(skin_cluster)
+
+    return OpenMayaAnim.MFnSkinCluster(selection.getDependNode(0))
+
+
+def get_skin_input_shape(skin_cluster):
+    """
+    Returns the input shape of the given skin cluster (the geometry before being deformed by the skin cluster)
+    :param skin_cluster: str
+    :return: str or None
+    """
+
+    try:
+        input_shape = get_skin_cluster_function(skin_cluster).inputShapeAtIndex(0)
+        return OpenMaya.MFnDagNode(input_shape).fullPathName()
+    except Exception:
+        return None
+
+
+def get_complete_components(dag_path):
+    """
+    Returns a component object that contains all the deformable points of the given shape
+    Supports meshes, NURBS curves, NURBS surfaces and lattices
+    :param dag_path: OpenMaya.MDagPath
+    :return: OpenMaya.MObject
+    """
+
+    if dag_path.hasFn(OpenMaya.MFn.kMesh):
+        component_fn = OpenMaya.MFnSingleIndexedComponent()
+        components = component_fn.create(OpenMaya.MFn.kMeshVertComponent)
+        component_fn.setCompleteData(OpenMaya.MFnMesh(dag_path).numVertices)
+    elif dag_path.hasFn(OpenMaya.MFn.kNurbsCurve):
+        component_fn = OpenMaya.MFnSingleIndexedComponent()
+        components = component_fn.create(OpenMaya.MFn.kCurveCVComponent)
+        component_fn.setCompleteData(OpenMaya.MFnNurbsCurve(dag_path).numCVs)
+    elif dag_path.hasFn(OpenMaya.MFn.kNurbsSurface):
+        surface_fn = OpenMaya.MFnNurbsSurface(dag_path)
+        component_fn = OpenMaya.MFnDoubleIndexedComponent()
+        components = component_fn.create(OpenMaya.MFn.kSurfaceCVComponent)
+        component_fn.setCompleteData(surface_fn.numCVsInU, surface_fn.numCVsInV)
+    else:
+        divisions = [maya.cmds.getAttr('{}.{}Divisions'.format(dag_path.fullPathName(), axis)) for axis in 'stu']
+        component_fn = OpenMaya.MFnTripleIndexedComponent()
+        components = component_fn.create(OpenMaya.MFn.kLatticeComponent)
+        component_fn.setCompleteData(*divisions)
+
+    return components
+
+
+def get_physical_influence_indices(skin_fn):
+    """
+    Returns a dictionary that maps the logical indices of the influences of the given skin cluster with its physical
+    indices (the position of the influence in the influence objects array)
+    :param skin_fn: OpenMayaAnim.MFnSkinCluster
+    :return: dict(int, int)
+    """
+
+    return dict(
+        (skin_fn.indexForInfluenceObject(influence_path), physical_index)
+        for physical_index, influence_path in enumerate(skin_fn.influenceObjects()))
+
+
+def get_double_array(values):
+    """
+    Returns given NumPy array as an OpenMaya double array
+    Array is flattened and passed as a memory view of its buffer, so no intermediate Python list is built
+    :param values: numpy.array
+    :return: OpenMaya.MDoubleArray
+    """
+
+    values = numpy.ascontiguousarray(values, dtype='float64').reshape(-1)
+
+    return OpenMaya.MDoubleArray(memoryview(values))
+
+
+def set_skin_weights(skin_cluster, influence_weights, vertex_count=None, threshold=WEIGHT_THRESHOLD, normalize=False):
+    """
+    Sets the weights of all the given influences in a single skin cluster API call
+    :param skin_cluster: str, name of the skin cluster node
+    :param influence_weights: dict(int, list(float)), dictionary mapping influence indices with per vertex weights
+    :param vertex_count: int or None, number of vertices of the skinned geometry. If not given, it is retrieved
+        from the skinned geometry
+    :param threshold: float, weights lower than this value are set to zero
+    :param normalize: bool, Whether or not weights should be normalized by Maya after setting them
+    :return: bool
+    """
+
+    if not influence_weights:
+        return False
+
+    skin_fn = get_skin_cluster_function(skin_cluster)
+    dag_path = skin_fn.getPathAtIndex(0)
+    components = get_complete_components(dag_path)
+    if vertex_count is None:
+        vertex_count = OpenMaya.MItGeometry(dag_path).count()
+
+    # MFnSkinCluster.setWeights expects physical influence indices (position of the influence in the influences
+    # array) while given weights use logical indices (matrix plug indices), which can contain gaps
+    physical_indices = get_physical_influence_indices(skin_fn)
+    missing_indices = [index for index in influence_weights if index not in physical_indices]
+    if missing_indices:
+        LOGGER.warning('Influence indices {} not found in skin cluster "{}". Skipping them ...'.format(
+            sorted(missing_indices), skin_cluster))
+    influence_indices = sorted(index for index in influence_weights if index in physical_indices)
+    if not influence_indices:
+        return False
+    influence_count = len(influence_indices)
+
+    # Weights are stored vertex major: [v0i0, v0i1, ... v0iN, v1i0, ...]
+    if numpy is not None:
+        weight_matrix = numpy.zeros((vertex_count, influence_count), dtype='float64')
+        for i, influence_index in enumerate(influence_indices):
+            weights = numpy.asarray(influence_weights[influence_index], dtype='float64')[:vertex_count]
+            weight_matrix[:len(weights), i] = weights
+        weight_matrix[weight_matrix < threshold] = 0.0
+        weight_values = get_double_array(weight_matrix)
+    else:
+        weight_values = OpenMaya.MDoubleArray(vertex_count * influence_count, 0.0)
+        for i, influence_index in enumerate(influence_indices):
+            weights = influence_weights[influence_index]
+            for vertex_index in range(min(len(weights), vertex_count)):
+                weight = float(weights[vertex_index])
+                if weight < threshold:
+                    continue
+                weight_values[vertex_index * influence_count + i] = weight
+
+    skin_fn.setWeights(
+        dag_path, components, OpenMaya.MIntArray([physical_indices[index] for index in influence_indices]),
+        weight_values, normalize, False)
+
+    return True
+
+
+def set_sparse_skin_weights(
+        skin_cluster, vertices, influences, weights, vertex_count=None, threshold=WEIGHT_THRESHOLD, normalize=False):
+    """
+    Sets given sparse (vertex index, influence index, weight) triplets in a single skin cluster API call
+    Triplets are scattered directly into the weights buffer, so no dense per influence weight lists are built
+    :param skin_cluster: str, name of the skin cluster node
+    :param vertices: numpy.array, vertex index of each weight
+    :param influences: numpy.array, influence logical index of each weight
+    :param weights: numpy.array, weight values
+    :param vertex_count: int or None, number of vertices of the skinned geometry. If not given, it is retrieved
+        from the skinned geometry
+    :param threshold: float, weights lower than this value are set to zero
+    :param normalize: bool, Whether or not weights should be normalized by Maya after setting them
+    :return: bool
+    """
+
+    vertices = numpy.asarray(vertices, dtype='int64')
+    influences = numpy.asarray(influences, dtype='int64')
+    weights = numpy.asarray(weights, dtype='float64')
+    if not len(weights):
+        return False
+
+    skin_fn = get_skin_cluster_function(skin_cluster)
+    dag_path = skin_fn.getPathAtIndex(0)
+    components = get_complete_components(dag_path)
+    if vertex_count is None:
+        vertex_count = OpenMaya.MItGeometry(dag_path).count()
+
+    physical_indices = get_physical_influence_indices(skin_fn)
+    stored_indices = numpy.unique(influences).tolist()
+    missing_indices = [index for index in stored_indices if index not in physical_indices]
+    if missing_indices:
+        LOGGER.warning('Influence indices {} not found in skin cluster "{}". Skipping them ...'.format(
+            missing_indices, skin_cluster))
+    influence_indices = [index for index in stored_indices if index in physical_indices]
+    if not influence_indices:
+        return False
+    influence_count = len(influence_indices)
+
+    # Maps influence logical indices with its column in the vertex major weights buffer
+    columns = numpy.full(stored_indices[-1] + 1, -1, dtype='int64')
+    columns[influence_indices] = numpy.arange(influence_count)
+    weight_columns = columns[influences]
+    mask = (weight_columns >= 0) & (vertices < vertex_count) & (weights >= threshold)
+
+    weight_matrix = numpy.zeros((vertex_count, influence_count), dtype='float64')
+    weight_matrix[vertices[mask], weight_columns[mask]] = weights[mask]
+
+    skin_fn.setWeights(
+        dag_path, components, OpenMaya.MIntArray([physical_indices[index] for index in influence_indices]),
+        get_double_array(weight_matrix), normalize, False)
+
+    return True
+
+
+class SkinClusterQuery(object):
+    """
+    Gathers skin clusters, influences, influence world positions and skin weights of multiple nodes using OpenMaya API
+    Results are cached by node, so skin clusters and influences shared between nodes are only queried once
+    """
+
+    def __init__(self):
+        self._skin_clusters = dict()
+        self._skin_functions = dict()
+        self._influences = dict()
+        self._positions = dict()
+        self._weights = dict()
+
+    def get_skin_cluster(self, node):
+        """
+        Returns the skin cluster that deforms given node
+        :param node: str, transform or shape node
+        :return: str or None
+        """
+
+        if node in self._skin_clusters:
+            return self._skin_clusters[node]
+
+        skin_cluster = None
+        if maya.cmds.objectType(node, isAType='shape'):
+            shapes = [node]
+        else:
+            shapes = maya.cmds.listRelatives(node, shapes=True, noIntermediate=True, fullPath=True) or list()
+        for shape in shapes:
+            selection = OpenMaya.MSelectionList()
+            selection.add(shape)
+            graph_it = OpenMaya.MItDependencyGraph(
+                selection.getDependNode(0), OpenMaya.MFn.kSkinClusterFilter,
+                OpenMaya.MItDependencyGraph.kUpstream, OpenMaya.MItDependencyGraph.kDepthFirst,
+                OpenMaya.MItDependencyGraph.kNodeLevel)
+            if not graph_it.isDone():
+                skin_fn = OpenMayaAnim.MFnSkinCluster(graph_it.currentNode())
+                skin_cluster = skin_fn.name()
+                self._skin_functions[skin_cluster] = skin_fn
+                break
+
+        self._skin_clusters[node] = skin_cluster
+
+        return skin_cluster
+
+    def get_influences(self, skin_cluster):
+        """
+        Returns the influences of the given skin cluster
+        :param skin_cluster: str
+        :return: OrderedDict(int, str), dictionary mapping influence logical indices with influence names
+        """
+
+        if skin_cluster in self._influences:
+            return self._influences[skin_cluster]
+
+        skin_fn = self._get_skin_function(skin_cluster)
+        influences = OrderedDict()
+        for influence_path in skin_fn.influenceObjects():
+            influence_name = influence_path.partialPathName()
+            influences[skin_fn.indexForInfluenceObject(influence_path)] = influence_name
+            if influence_name not in self._positions:
+                translation = OpenMaya.MTransformationMatrix(influence_path.inclusiveMatrix()).translation(
+                    OpenMaya.MSpace.kWorld)
+                self._positions[influence_name] = [translation.x, translation.y, translation.z]
+        self._influences[skin_cluster] = influences
+
+        return influences
+
+    def get_influence_position(self, influence):
+        """
+        Returns world space position of the given influence
+        Influence must belong to a skin cluster already queried by this object
+        :param influence: str
+        :return: list(float, float, float) or None
+        """
+
+        return self._positions.get(influence, None)
+
+    def get_weights(self, skin_cluster):
+        """
+        Returns the weights of all the influences of the given skin cluster, retrieved in a single API call
+        :param skin_cluster: str
+        :return: dict(int, numpy.array or list(float)), dictionary mapping influence logical indices with per vertex
+            weights. NumPy arrays are returned if NumPy is available
+        """
+
+        if skin_cluster in self._weights:
+            return self._weights[skin_cluster]
+
+        skin_fn = self._get_skin_function(skin_cluster)
+        influences = self.get_influences(skin_cluster)
+        dag_path = skin_fn.getPathAtIndex(0)
+        weight_values, influence_count = skin_fn.getWeights(dag_path, get_complete_components(dag_path))
+
+        weights = dict()
+        if numpy is not None:
+            # Influence major copy so each influence weights are stored as a contiguous NumPy array
+            influence_matrix = numpy.fromiter(
+                weight_values, dtype='float64', count=len(weight_values)).reshape(-1, influence_count).T.copy()
+            for i, influence_index in enumerate(influences.keys()):
+                weights[influence_index] = influence_matrix[i]
+        else:
+            weight_values = list(weight_values)
+            for i, influence_index in enumerate(influences.keys()):
+                weights[influence_index] = weight_values[i::influence_count]
+        self._weights[skin_cluster] = weights
+
+        return weights
+
+    def _get_skin_function(self, skin_cluster):
+        """
+        Internal function that returns cached skin cluster function set of the given skin cluster
+        :param skin_cluster: str
+        :return: OpenMayaAnim.MFnSkinCluster
+        """
+
+        if skin_cluster not in self._skin_functions:
+            self._skin_functions[skin_cluster] = get_skin_cluster_function(skin_cluster)
+
+        return self._skin_functions[skin_cluster]
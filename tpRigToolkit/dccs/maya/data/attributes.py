@@ -9,14 +9,18 @@ from __future__ import print_function, division, absolute_import
 
 import os
 import logging
+from collections import OrderedDict
 
 import maya.cmds
 
 from tpDcc import dcc
 from tpDcc.libs.python import folder, fileio
 from tpDcc.dccs.maya.data import base
+from tpDcc.dccs.maya.core import decorators as maya_decorators
 
 from tpRigToolkit.core import data as rig_data
+from tpRigToolkit.dccs.maya.core import attribute as attribute_utils
+from tpRigToolkit.dccs.maya.data import codec, progress, attributesnapshot
 
 LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
 
@@ -58,33 +62,34 @@ class AttributesFileData(base.MayaCustomData, object):
         if not scope:
             return False
 
-        data_extension = self.get_data_extension()
-        if not data_extension.startswith('.'):
-            data_extension = '.{}'.format(data_extension)
-
-        for obj in scope:
-            LOGGER.info('Exporting attributes of {}'.format(obj))
-            file_name = fileio.create_file('{}{}'.format(obj, data_extension), file_path)
-            lines = list()
-            attributes_to_export = self._get_attributes(obj)
-            shapes = self._get_shapes(obj)
-            if shapes:
-                shape = shapes[0]
-                shape_attributes = self._get_shape_attributes(shape)
-                if shape_attributes:
-                    attributes_to_export = list(set(attributes_to_export).union(shape_attributes))
-            if not attributes_to_export:
-                continue
-
-            for attribute_to_export in attributes_to_export:
-                try:
-                    value = dcc.get_attribute_value(obj, attribute_to_export)
-                except Exception:
+        # Attributes of all nodes are captured through OpenMaya API and stored in a single indexed snapshot file
+        snapshot = OrderedDict()
+        with progress.DataProgress('Export Attributes', len(scope)) as export_progress:
+            for obj in scope:
+                if not export_progress.step(status='Exporting attributes: {}', status_args=(obj,)):
+                    break
+                LOGGER.debug('Exporting attributes of {}'.format(obj))
+                attributes_to_export = self._get_attributes(obj) or list()
+                attribute_values = attribute_utils.get_attribute_values(obj, attributes_to_export)
+                shapes = self._get_shapes(obj)
+                if shapes:
+                    shape = shapes[0]
+                    shape_attributes = [
+                        shape_attribute for shape_attribute in self._get_shape_attributes(shape) or list()
+                        if shape_attribute not in attributes_to_export]
+                    attribute_values.update(attribute_utils.get_attribute_values(shape, shape_attributes))
+                if not attribute_values:
                     continue
-                lines.append("[ '{}', {} ]".format(attribute_to_export, value))
+                snapshot[obj] = attribute_values
 
-            write_file = fileio.FileWriter(file_name)
-            write_file.write(lines)
+        if export_progress.cancelled:
+            LOGGER.warning('Attributes export cancelled by user')
+            return False
+
+        attributesnapshot.write_snapshot(file_path, snapshot)
+        removed_files = attributesnapshot.remove_legacy_files(file_path)
+        if removed_files:
+            LOGGER.info('Removed {} legacy attribute files replaced by snapshot file'.format(len(removed_files)))
 
         version = fileio.FileVersion(os.path.dirname(file_path))
         if version.has_versions():
@@ -106,12 +111,87 @@ class AttributesFileData(base.MayaCustomData, object):
 
         valid_import = True
         selection = dcc.selected_nodes(full_path=False)
+
+        # If the data was exported as a snapshot only the attributes of the selected nodes are loaded from it
+        # Snapshot file always wins over legacy per node attribute files
+        if attributesnapshot.has_snapshot_file(file_path):
+            snapshot = attributesnapshot.read_snapshot(file_path, nodes=selection or None)
+        else:
+            snapshot = self._read_legacy_files(file_path, selection)
+
+        # Current values are read in bulk and only the attributes whose value is different are set
+        node_changes = OrderedDict()
+        value_count = 0
+        with progress.DataProgress('Import Attributes', len(snapshot)) as import_progress:
+            for node_name, attribute_values in snapshot.items():
+                if not import_progress.step(status='Importing attributes: {}', status_args=(node_name,)):
+                    break
+                if not dcc.node_exists(node_name):
+                    LOGGER.warning(
+                        'Skipping attribute import for "{}". It does not exist in current scene'.format(node_name))
+                    valid_import = False
+                    continue
+                value_count += len(attribute_values)
+                changes, missing_attributes = attribute_utils.get_attribute_changes(node_name, attribute_values)
+                for missing_attribute in missing_attributes:
+                    LOGGER.warning('"{}.{}" does not exist. Impossible to set attribute value.'.format(
+                        node_name, missing_attribute))
+                    valid_import = False
+                if changes:
+                    node_changes[node_name] = changes
+
+        if import_progress.cancelled:
+            LOGGER.warning('Attributes import cancelled by user')
+            return False
+
+        change_count = self._set_attribute_values(node_changes)
+
+        dcc.select_node(selection)
+
+        LOGGER.info('Changed {} of {} attribute values'.format(change_count, value_count))
+        if valid_import:
+            LOGGER.info('Imported attributes successfully!')
+        else:
+            LOGGER.warning('Import attributes with warnings!')
+
+        return valid_import
+
+    @maya_decorators.undo_chunk
+    def _set_attribute_values(self, node_changes):
+        """
+        Internal function that sets given attribute values within a single undo chunk
+        :param node_changes: OrderedDict(str, OrderedDict(str, object)), dictionary mapping node names with a
+            dictionary that maps attribute names with their new values
+        :return: int, number of attribute values that were set
+        """
+
+        change_count = 0
+        for node_name, changes in node_changes.items():
+            for attribute_name, attribute_value in changes.items():
+                try:
+                    dcc.set_attribute_value(node_name, attribute_name, attribute_value)
+                    change_count += 1
+                except Exception as exc:
+                    LOGGER.warning('Impossible to set {}.{} to {}: "{}" '.format(
+                        node_name, attribute_name, attribute_value, exc))
+
+        return change_count
+
+    def _read_legacy_files(self, file_path, nodes=None):
+        """
+        Internal function that reads attributes stored in legacy per node attribute files
+        :param file_path: str
+        :param nodes: list(str) or None, nodes to read attributes of. If not given, all files are read
+        :return: OrderedDict(str, list(tuple(str, object)))
+        """
+
         current_extension = self.get_data_extension()
         full_extension = current_extension
         if not full_extension.startswith('.'):
             full_extension = '.{}'.format(full_extension)
 
-        files_to_search = selection if selection else folder.get_files_with_extension(current_extension, file_path)
+        attribute_values = OrderedDict()
+        files_to_search = nodes if nodes else folder.get_files_with_extension(current_extension, file_path)
         for file_name in files_to_search:
             if not file_name.endswith(full_extension):
                 file_name = '{}{}'.format(file_name, full_extension)
@@ -119,42 +199,10 @@ class AttributesFileData(base.MayaCustomData, object):
             if not os.path.isfile(full_path):
                 continue
             node_name = file_name.split('.')[0]
-            if not dcc.node_exists(node_name):
-                LOGGER.warning(
-                    'Skipping attribute import for "{}". It does not exist in current scene'.format(node_name))
-                valid_import = False
-                continue
-            lines = fileio.get_file_lines(full_path)
-            for line in lines:
-                if not line:
-                    continue
-                line_list = eval(line)
-                attribute_name = line_list[0]
-                attribute_value = line_list[1]
-                attribute = '{}.{}'.format(node_name, attribute_name)
-                if not dcc.attribute_exists(node_name, attribute_name):
-                    LOGGER.warning('"{}" does not exist. Impossible to set attribute value.'.format(attribute))
-                    valid_import = False
-                    continue
-                if dcc.is_attribute_locked(node_name, attribute_name):
-                    continue
-                if dcc.is_attribute_connected(node_name, attribute_name):
-                    continue
-                if attribute_value is None:
-                    continue
-                try:
-                    dcc.set_attribute_value(node_name, attribute_name, attribute_value)
-                except Exception as exc:
-                    LOGGER.warning('Impossible to set {} to {}: "{}" '.format(attribute, attribute_value, exc))
-
-        dcc.select_node(selection)
+            attribute_values[node_name] = [
+                (line_list[0], line_list[1]) for line_list in codec.iterate_values(full_path)]
 
-        if valid_import:
-            LOGGER.info('Imported attributes successfully!')
-        else:
-            LOGGER.warning('Import attributes with warnings!')
-
-        return valid_import
+        return attribute_values
 
     def _get_scope(self, objects):
         """
@@ -172,10 +220,8 @@ class AttributesFileData(base.MayaCustomData, object):
     def _get_attributes(self, node):
         found_attributes = list()
 
-        attributes = maya.cmds.listAttr(node, scalar=True, m=True, array=True)
-        for attribute in attributes:
-            if not dcc.is_attribute_connected(node, attribute):
-                found_attributes.append(attribute)
+        # Connected attributes are skipped when attribute values are captured
+        found_attributes.extend(maya.cmds.listAttr(node, scalar=True, m=True, array=True) or list())
 
         for removable_attribute in self.REMOVABLE_ATTRIBUTES:
             if removable_attribute in found_attributes:
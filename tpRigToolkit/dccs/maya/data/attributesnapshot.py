@@ -0,0 +1,150 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains attributes snapshot file format implementation
+The attributes of all the nodes of an export are stored in a single file. First line of the file is an index that
+maps each node with the offset and size of its attributes line, so the attributes of a node can be loaded without
+decoding the attributes of the rest of nodes
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import io
+import os
+import logging
+from collections import OrderedDict
+
+from tpRigToolkit.dccs.maya.data import codec
+
+LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
+
+SNAPSHOT_FILE_NAME = 'attributes.snapshot'
+SNAPSHOT_VERSION = 1
+# Extension of the legacy per node attribute files replaced by the snapshot file
+LEGACY_FILE_EXTENSION = '.attr'
+
+
+def get_snapshot_file(folder_path):
+    """
+    Returns path where attributes snapshot file is stored within given folder
+    :param folder_path: str
+    :return: str
+    """
+
+    return os.path.join(folder_path, SNAPSHOT_FILE_NAME).replace('\\', '/')
+
+
+def has_snapshot_file(folder_path):
+    """
+    Returns whether or not given folder contains an attributes snapshot file
+    :param folder_path: str
+    :return: bool
+    """
+
+    return os.path.isfile(get_snapshot_file(folder_path))
+
+
+def write_snapshot(folder_path, snapshot):
+    """
+    Writes given attributes snapshot into the snapshot file of the given folder
+    :param folder_path: str
+    :param snapshot: OrderedDict(str, OrderedDict(str, object)), dictionary mapping node names with a dictionary
+        that maps attribute names with their values
+    :return: str, path of the written file
+    """
+
+    index = list()
+    lines = list()
+    offset = 0
+    for node, attribute_values in snapshot.items():
+        line = u'{}\n'.format(codec.encode([[name, value] for name, value in attribute_values.items()]))
+        line = line.encode('utf-8')
+        index.append([node, offset, len(line)])
+        lines.append(line)
+        offset += len(line)
+
+    header = u'{}\n'.format(codec.encode({'version': SNAPSHOT_VERSION, 'nodes': index})).encode('utf-8')
+    file_path = get_snapshot_file(folder_path)
+    with io.open(file_path, 'wb') as fh:
+        fh.write(header)
+        fh.writelines(lines)
+
+    return file_path
+
+
+def remove_legacy_files(folder_path):
+    """
+    Removes the legacy per node attribute files stored in the given folder
+    Must be called after writing a snapshot so stale legacy files are not left next to it
+    :param folder_path: str
+    :return: list(str), names of the removed files
+    """
+
+    removed_files = list()
+    if not os.path.isdir(folder_path):
+        return removed_files
+
+    for file_name in os.listdir(folder_path):
+        legacy_path = os.path.join(folder_path, file_name)
+        if not file_name.endswith(LEGACY_FILE_EXTENSION) or not os.path.isfile(legacy_path):
+            continue
+        try:
+            os.remove(legacy_path)
+        except OSError as exc:
+            LOGGER.warning('Impossible to remove legacy attributes file: "{}" | {}'.format(legacy_path, exc))
+            continue
+        removed_files.append(file_name)
+
+    return removed_files
+
+
+def read_index(folder_path):
+    """
+    Returns the index of the attributes snapshot file stored in given folder
+    :param folder_path: str
+    :return: OrderedDict(str, tuple(int, int)) or None, dictionary mapping node names with the offset (relative to
+        the end of the index) and size of their attributes line
+    """
+
+    file_path = get_snapshot_file(folder_path)
+    if not os.path.isfile(file_path):
+        return None
+
+    with io.open(file_path, 'rb') as fh:
+        header = codec.decode(fh.readline().decode('utf-8'))
+
+    return OrderedDict((node, (offset, size)) for node, offset, size in header.get('nodes', list()))
+
+
+def read_snapshot(folder_path, nodes=None):
+    """
+    Reads attributes snapshot file stored in given folder
+    :param folder_path: str
+    :param nodes: list(str) or None, nodes to read attributes of. If not given, all nodes are read
+    :return: OrderedDict(str, list(tuple(str, object))) or None, dictionary mapping node names with their list of
+        (attribute name, value) tuples. Given nodes that are not stored in the snapshot are not included
+    """
+
+    file_path = get_snapshot_file(folder_path)
+    if not os.path.isfile(file_path):
+        return None
+
+    snapshot = OrderedDict()
+    with io.open(file_path, 'rb') as fh:
+        header = codec.decode(fh.readline().decode('utf-8'))
+        index = OrderedDict((node, (offset, size)) for node, offset, size in header.get('nodes', list()))
+        if nodes is None:
+            for node in index:
+                snapshot[node] = [tuple(item) for item in codec.decode(fh.readline().decode('utf-8'))]
+            return snapshot
+
+        start = fh.tell()
+        for node in nodes:
+            if node not in index:
+                continue
+            offset, size = index[node]
+            fh.seek(start + offset)
+            snapshot[node] = [tuple(item) for item in codec.decode(fh.read(size).decode('utf-8'))]
+
+    return snapshot
@@ -20,9 +20,20 @@ from tpDcc.libs.python import folder, fileio, name as name_utils, path as path_u
 from tpDcc.dccs.maya.core import decorators, geometry, curve, deformer, blendshape as bs_utils
 
 from tpRigToolkit.core import data
+from tpRigToolkit.dccs.maya.core import blendshape as blendshape_utils
+from tpRigToolkit.dccs.maya.data import codec, progress, workers, blendshapearray
 
 LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
 
+SHAPES_SCRIPTS = [
+    'SHAPES_vars', 'SHAPES_actions', 'SHAPES_array', 'SHAPES_animation', 'SHAPES_combo', 'SHAPES_common',
+    'SHAPES_data', 'SHAPES_driver', 'SHAPES_global', 'SHAPES_jobs', 'SHAPES_list', 'SHAPES_main',
+    'SHAPES_mirror', 'SHAPES_regions', 'SHAPES_sculpt', 'SHAPES_set', 'SHAPES_ui', 'SHAPES_utilities',
+    'SHAPES_weights', 'SHAPES_poseInterpolator', 'SHAPES_uiWorkspaceControl']
+
+# SHAPES scripts are only sourced once per session
+_SHAPES_SCRIPTS_LOADED = False
+
 
 class BlendShapeWeightsData(base.MayaCustomData, object):
     def __init__(self, name=None, path=None):
@@ -64,24 +75,50 @@ class BlendShapeWeightsData(base.MayaCustomData, object):
             LOGGER.warning('No blendshapes to export')
             return
 
-        for blendshape_name in blendshapes_found:
-            blendshape = bs_utils.BlendShape(blendshape_name)
-            mesh_count = blendshape.get_mesh_count()
-            targets = blendshape.get_target_names()
+        # Binary format stores all the weights of a blendShape node in a single file instead of one file per target
+        # and mesh. If NumPy is not available we fallback to legacy per target weight files
+        use_binary = kwargs.get('binary', True)
+        if use_binary and not blendshapearray.is_available():
+            LOGGER.warning('NumPy is not available. Exporting blendShape weights using legacy weights format ...')
+            use_binary = False
+        compress = kwargs.get('compress', True)
+
+        # Target geometries are stored as sparse deltas so they can be restored without any plugin
+        export_targets = kwargs.get('targets', True) and use_binary
+
+        # Weights are queried in the main thread while files encoding and writing is done in the worker pool
+        with progress.DataProgress('Export BlendShape Weights', len(blendshapes_found)) as export_progress, \
+                workers.WorkerPool(max_workers=kwargs.get('max_workers', None)) as pool:
+            for blendshape_name in blendshapes_found:
+                if not export_progress.step(status='Exporting blendShape weights: {}', status_args=(blendshape_name,)):
+                    break
+
+                blendshape_path = folder.create_folder(blendshape_name, file_path)
+
+                if use_binary:
+                    write_blendshape_data(
+                        pool, blendshape_name, blendshape_path, compress=compress, targets=export_targets)
+                    continue
 
-            blendshape_path = folder.create_folder(blendshape_name, file_path)
+                blendshape = bs_utils.BlendShape(blendshape_name)
+                mesh_count = blendshape.get_mesh_count()
+                targets = blendshape.get_target_names()
+
+                for target in targets:
+                    target_path = folder.create_folder(str(target), blendshape_path)
+                    for i in range(mesh_count):
+                        weights = blendshape.get_weights(target, mesh_index=i)
+                        target_mesh_weights_file_name = fileio.create_file('mesh_{}.weights'.format(i), target_path)
+                        pool.submit(codec.write_values, target_mesh_weights_file_name, [weights])
 
-            for target in targets:
-                target_path = folder.create_folder(str(target), blendshape_path)
                 for i in range(mesh_count):
-                    weights = blendshape.get_weights()
-                    target_mesh_weights_file_name = fileio.create_file('mesh_{}.weights'.format(i), target_path)
-                    fileio.write_lines(target_mesh_weights_file_name, [weights])
+                    weights = blendshape.get_weights(mesh_index=i)
+                    base_mesh_weights_file_name = fileio.create_file('base_{}.weights'.format(i), blendshape_path)
+                    pool.submit(codec.write_values, base_mesh_weights_file_name, [weights])
 
-            for i in range(mesh_count):
-                weights = blendshape.get_weights(mesh_index=i)
-                base_mesh_weights_file_name = fileio.create_file('base_{}.weights'.format(i), blendshape_path)
-                fileio.write_lines(base_mesh_weights_file_name, [weights])
+        if export_progress.cancelled:
+            LOGGER.warning('BlendShape weights export cancelled by user')
+            return False
 
         LOGGER.info('BlendShape export operation completed successfully!')
 
@@ -101,35 +138,38 @@ class BlendShapeWeightsData(base.MayaCustomData, object):
             LOGGER.warning('Impossible to import blendShape weights from: "{}"'.format(file_path))
             return False
 
-        folders = folder.get_folders(file_path)
-
-        for folder_found in folders:
-            if dcc.node_exists(folder_found) and dcc.node_type(folder_found) == 'blendShape':
-                blendshape_folder = folder_found
-                blendshape_path = path_utils.join_path(file_path, folder_found)
-                base_files = folder.get_files_with_extension('weights', blendshape_path)
-                for file_name in base_files:
-                    if file_name.startswith('base'):
-                        file_path = path_utils.join_path(blendshape_path, file_name)
-                        lines = fileio.get_file_lines(file_path)
-                        weights = eval(lines[0])
-                        index = name_utils.get_last_number(file_name)
-                        blendshape = bs_utils.BlendShape(blendshape_folder)
-                        blendshape.set_weights(weights, mesh_index=index)
-
-                targets = folder.get_folders(blendshape_path)
-                for target in targets:
-                    if maya.cmds.objExists('{}.{}'.format(blendshape_folder, target)):
-                        target_path = path_utils.join_path(blendshape_path, target)
-                        files = folder.get_files_with_extension('weights', target_path)
-                        for file_name in files:
-                            if file_name.startswith('mesh'):
-                                file_path = path_utils.join_path(target_path, file_name)
-                                lines = fileio.get_file_lines(file_path)
-                                weights = eval(lines[0])
-                                index = name_utils.get_last_number(file_name)
-                                blendshape = bs_utils.BlendShape(blendshape_folder)
-                                blendshape.set_weights(weights, target, mesh_index=index)
+        # BlendShape nodes that do not exist are created if their target geometries were exported
+        blendshape_names = list()
+        for folder_found in folder.get_folders(file_path):
+            if dcc.node_exists(folder_found):
+                if dcc.node_type(folder_found) == 'blendShape':
+                    blendshape_names.append(folder_found)
+            elif blendshapearray.has_targets_file(path_utils.join_path(file_path, folder_found)):
+                blendshape_names.append(folder_found)
+
+        # The payload of each blendShape is read once in the background while it is applied in the main thread
+        # Target deltas are only applied to create missing blendShape nodes, so existing targets are never overridden
+        with progress.DataProgress('Import BlendShape Weights', len(blendshape_names)) as import_progress, \
+                workers.WorkerPool(max_workers=2) as pool:
+            results = OrderedDict()
+            for blendshape_name in blendshape_names:
+                blendshape_path = path_utils.join_path(file_path, blendshape_name)
+                results[blendshape_name] = (
+                    pool.submit(blendshapearray.read_targets, blendshape_path) if
+                    not dcc.node_exists(blendshape_name) else None,
+                    pool.submit(read_blendshape_weights, blendshape_path))
+            for blendshape_name, (targets_result, weights_result) in results.items():
+                if not import_progress.step(status='Importing blendShape weights: {}', status_args=(blendshape_name,)):
+                    LOGGER.warning('BlendShape weights import cancelled by user')
+                    pool.terminate()
+                    break
+                with import_progress.phase('read'):
+                    targets_data = targets_result.get() if targets_result else None
+                    geometry_weights = weights_result.get()
+                with import_progress.phase('apply'):
+                    if targets_data and not set_blendshape_targets(blendshape_name, targets_data):
+                        continue
+                    set_blendshape_weights(blendshape_name, geometry_weights)
 
         self._center_view()
 
@@ -186,24 +226,12 @@ class SHAPESBlendShapeData(base.MayaCustomData, object):
             LOGGER.warning('Data must be exported from within Maya!')
             return False
 
-        if not dcc.is_plugin_loaded('SHAPESTools'):
-            valid_load = dcc.load_plugin('SHAPESTools')
-            if not valid_load:
-                LOGGER.warning('Shapes is not installed. Impossible to export SHAPES data.')
-                return False
-        if not dcc.is_plugin_loaded('weightDriver'):
-            dcc.load_plugin('weightDriver')
-
-        # We force the load of SHAPES scripts
-        for shape_script in [
-            'SHAPES_vars', 'SHAPES_actions', 'SHAPES_array', 'SHAPES_animation', 'SHAPES_combo', 'SHAPES_common',
-            'SHAPES_data', 'SHAPES_driver', 'SHAPES_global', 'SHAPES_jobs', 'SHAPES_list', 'SHAPES_main',
-            'SHAPES_mirror', 'SHAPES_regions', 'SHAPES_sculpt', 'SHAPES_set', 'SHAPES_ui', 'SHAPES_utilities',
-            'SHAPES_weights', 'SHAPES_poseInterpolator', 'SHAPES_uiWorkspaceControl']:
-            try:
-                maya.mel.eval('{};'.format(shape_script))
-            except Exception as exc:
-                pass
+        # In batch mode (mayapy) SHAPES UI is not available, so blendShapes are exported using plugin-free
+        # blendShape weights and target deltas format
+        batch = kwargs.get('batch', maya.cmds.about(batch=True))
+        if not batch and not load_shapes():
+            LOGGER.warning('Shapes is not installed. Impossible to export SHAPES data.')
+            return False
 
         file_path = file_path or self.get_file()
 
@@ -240,28 +268,47 @@ class SHAPESBlendShapeData(base.MayaCustomData, object):
             LOGGER.warning('No blendshapes to export')
             return
 
-        for mesh_name, blendshapes in blendshapes_map.items():
-            mesh_folder = folder.create_folder(mesh_name, file_path)
-            for blendshape_name in blendshapes:
-                blendshape = bs_utils.BlendShape(blendshape_name)
-                targets = blendshape.get_target_names()
-                if not targets:
-                    LOGGER.warning(
-                        'Skipping export of blendShape "{}" in mesh "{}" because no targets found!'.format(
-                            blendshape_name, mesh_name))
-                    continue
-                blendshape_path = folder.create_folder(blendshape_name, mesh_folder)
-
-                maya.mel.eval('SHAPES;')
-                maya.cmds.select(mesh_name)
-                maya.mel.eval('shapesMain_getMeshSelection 1;')
-                maya.cmds.optionVar(iv=('SHAPESUseCustomDataPath', 1), sv=('SHAPESCustomDataPath', blendshape_path))
-                maya.cmds.optionVar(iv=('SHAPESUseCustomNodeDataExportPath', 0))
-                maya.mel.eval('optionMenu -e -v "{}" shpUI_bsOption'.format(blendshape_name))
-                maya.mel.eval('shapesUtil_exportShapeSetup 1 "{}" ""'.format(blendshape_path))
-
-                # This does not exports the blendShape data
-                # maya.mel.eval('shapesUtil_exportShapeSetup 1 "{}" "{}"'.format(blendshape_path, blendshape_name))
+        # SHAPES window is opened only once and reused for all the meshes
+        shapes_opened = False
+        with progress.DataProgress('Export SHAPES Data', len(blendshapes_found)) as export_progress, \
+                workers.WorkerPool(max_workers=kwargs.get('max_workers', None)) as pool:
+            for mesh_name, blendshapes in blendshapes_map.items():
+                if export_progress.cancelled:
+                    break
+                mesh_folder = folder.create_folder(mesh_name, file_path)
+                for blendshape_name in blendshapes:
+                    if not export_progress.step(status='Exporting SHAPES data: {}', status_args=(blendshape_name,)):
+                        break
+                    targets = blendshape_utils.get_target_names(blendshape_name)
+                    if not targets:
+                        LOGGER.warning(
+                            'Skipping export of blendShape "{}" in mesh "{}" because no targets found!'.format(
+                                blendshape_name, mesh_name))
+                        continue
+                    blendshape_path = folder.create_folder(blendshape_name, mesh_folder)
+
+                    if batch:
+                        write_blendshape_data(
+                            pool, blendshape_name, blendshape_path, compress=kwargs.get('compress', True))
+                        continue
+
+                    if not shapes_opened:
+                        maya.mel.eval('SHAPES;')
+                        shapes_opened = True
+                    maya.cmds.select(mesh_name)
+                    maya.mel.eval('shapesMain_getMeshSelection 1;')
+                    maya.cmds.optionVar(
+                        iv=('SHAPESUseCustomDataPath', 1), sv=('SHAPESCustomDataPath', blendshape_path))
+                    maya.cmds.optionVar(iv=('SHAPESUseCustomNodeDataExportPath', 0))
+                    maya.mel.eval('optionMenu -e -v "{}" shpUI_bsOption'.format(blendshape_name))
+                    maya.mel.eval('shapesUtil_exportShapeSetup 1 "{}" ""'.format(blendshape_path))
+
+                    # This does not exports the blendShape data
+                    # maya.mel.eval('shapesUtil_exportShapeSetup 1 "{}" "{}"'.format(blendshape_path, blendshape_name))
+
+        if export_progress.cancelled:
+            LOGGER.warning('SHAPES data export cancelled by user')
+            return False
 
         LOGGER.info('SHAPES BlendShape data export operation completed successfully!')
 
@@ -283,6 +330,11 @@ class SHAPESBlendShapeData(base.MayaCustomData, object):
 
         folders = folder.get_folders(file_path)
 
+        # In batch mode (mayapy) SHAPES UI is not available, so only blendShapes exported using plugin-free format
+        # can be imported. SHAPES window is opened only once and reused for all the meshes
+        batch = maya.cmds.about(batch=True)
+        shapes_opened = False
+
         for mesh_name in folders:
             if not dcc.node_exists(mesh_name):
                 LOGGER.warning(
@@ -293,9 +345,11 @@ class SHAPESBlendShapeData(base.MayaCustomData, object):
             mesh_folder = os.path.join(file_path, mesh_name)
             blendshape_folders = folder.get_folders(mesh_folder)
             for blendshape_folder in blendshape_folders:
-                mel_shape_file = os.path.join(
-                    mesh_folder, blendshape_folder, '{}.mel'.format(blendshape_folder))
-                if not os.path.isfile(mel_shape_file):
+                blendshape_path = os.path.join(mesh_folder, blendshape_folder)
+                mel_shape_file = os.path.join(blendshape_path, '{}.mel'.format(blendshape_folder))
+                has_shapes_file = os.path.isfile(mel_shape_file)
+                has_targets_file = blendshapearray.has_targets_file(blendshape_path)
+                if not has_shapes_file and not has_targets_file:
                     LOGGER.warning(
                         'Skipping blendShape "{}" data import . No SHAPES blendShape MEL file found: "{}"'.format(
                             blendshape_folder, mel_shape_file))
@@ -309,10 +363,24 @@ class SHAPESBlendShapeData(base.MayaCustomData, object):
                         'name already in scene'.format(blendshape_folder))
                     continue
 
+                if has_targets_file and (batch or not has_shapes_file):
+                    if set_blendshape_targets(blendshape_folder, blendshapearray.read_targets(blendshape_path)):
+                        set_blendshape_weights(blendshape_folder, read_blendshape_weights(blendshape_path))
+                    continue
+                if batch:
+                    LOGGER.warning(
+                        'Skipping blendShape "{}" data import. SHAPES data cannot be imported in batch mode'.format(
+                            blendshape_folder))
+                    continue
+                if not shapes_opened:
+                    if not load_shapes():
+                        LOGGER.warning('Shapes is not installed. Impossible to import SHAPES data.')
+                        return False
+                    maya.mel.eval('SHAPES;')
+                    shapes_opened = True
+
                 maya.cmds.select(mesh_name)
-                maya.mel.eval('SHAPES;')
                 maya.mel.eval('shapesMain_getMeshSelection 1;')
-                maya.cmds.refresh()
                 maya.mel.eval('shapesUtil_performImportShapeSetup "{}"'.format(mel_shape_file))
                 maya.cmds.select(mesh_name)
                 maya.mel.eval('shapesMain_getMeshSelection 1;')
@@ -348,3 +416,211 @@ class MayaSHAPESBlendShapeWeights(data.DataItem, object):
         super(MayaSHAPESBlendShapeWeights, self).__init__(*args, **kwargs)
 
         self.set_data_class(SHAPESBlendShapeData)
+
+
+def read_blendshape_weights(folder_path):
+    """
+    Reads all the weights stored in the given blendShape folder
+    Supports both binary weights files and legacy per target weight files
+    :param folder_path: str
+    :return: dict(int, dict), dictionary mapping geometry indices with a dictionary containing base weights (base key),
+        a dictionary that maps target names with its weights (targets key) and the name of the geometry (geometry key)
+        or None if the geometry name was not stored
+    """
+
+    geometry_weights = dict()
+
+    if blendshapearray.has_weights_file(folder_path):
+        weights_data = blendshapearray.read_weights(folder_path)
+        target_names = weights_data['target_names']
+        for geometry_index, geometry_data in weights_data['geometries'].items():
+            geometry_weights[geometry_index] = {
+                'geometry': weights_data['geometry_names'].get(geometry_index, None),
+                'base': geometry_data['base'],
+                'targets': OrderedDict(
+                    (target_names[target_index], weights) for target_index, weights in zip(
+                        geometry_data['targets'].tolist(), geometry_data['weights']))
+            }
+        return geometry_weights
+
+    for entry in sorted(os.listdir(folder_path)):
+        entry_path = path_utils.join_path(folder_path, entry)
+        if os.path.isdir(entry_path):
+            for file_name in sorted(os.listdir(entry_path)):
+                if not file_name.startswith('mesh') or not file_name.endswith('.weights'):
+                    continue
+                geometry_index = name_utils.get_last_number(file_name)
+                geometry_data = geometry_weights.setdefault(
+                    geometry_index, {'geometry': None, 'base': None, 'targets': OrderedDict()})
+                geometry_data['targets'][entry] = codec.read_value(path_utils.join_path(entry_path, file_name))
+        elif entry.startswith('base') and entry.endswith('.weights'):
+            geometry_index = name_utils.get_last_number(entry)
+            geometry_data = geometry_weights.setdefault(
+                geometry_index, {'geometry': None, 'base': None, 'targets': OrderedDict()})
+            geometry_data['base'] = codec.read_value(entry_path)
+
+    return geometry_weights
+
+
+def write_blendshape_data(pool, blendshape_name, blendshape_path, compress=True, targets=True):
+    """
+    Queries the weights (and target deltas) of the given blendShape node and submits its writing into the given pool
+    :param pool: workers.WorkerPool
+    :param blendshape_name: str
+    :param blendshape_path: str, folder where blendShape files are written
+    :param compress: bool
+    :param targets: bool, Whether to write target deltas or only weights
+    """
+
+    target_names = blendshape_utils.get_target_names(blendshape_name)
+    geometry_indices = blendshape_utils.get_geometry_indices(blendshape_name)
+    geometry_weights = dict()
+    for geometry_index in geometry_indices:
+        geometry_weights[geometry_index] = blendshape_utils.get_weights(
+            blendshape_name, geometry_index, target_indices=list(target_names.keys()))
+    pool.submit(
+        blendshapearray.write_weights, blendshape_path, target_names, geometry_weights, compress, geometry_indices)
+
+    if targets:
+        geometry_names, geometry_targets = get_blendshape_targets(blendshape_name, target_names)
+        pool.submit(
+            blendshapearray.write_targets, blendshape_path, target_names, geometry_names, geometry_targets, compress)
+
+
+def get_blendshape_targets(blendshape_name, target_names):
+    """
+    Returns the sparse deltas of all the target items of the given blendShape node
+    Only mesh geometries are supported
+    :param blendshape_name: str
+    :param target_names: OrderedDict(int, str)
+    :return: tuple(OrderedDict, dict), geometry names and target deltas of each geometry
+    """
+
+    geometry_names = OrderedDict()
+    geometry_targets = dict()
+    for geometry_index, geometry_name in blendshape_utils.get_geometry_indices(blendshape_name).items():
+        if maya.cmds.nodeType(geometry_name) != 'mesh':
+            continue
+        geometry_names[geometry_index] = geometry_name
+
+        # Input points are only needed to compute the deltas of targets with a connected target geometry
+        input_points = None
+        if maya.cmds.listConnections(
+                '{}.inputTarget[{}]'.format(blendshape_name, geometry_index), source=True, destination=False):
+            input_points = blendshape_utils.get_input_points(blendshape_name, geometry_index)
+
+        target_items = list()
+        for target_index in target_names:
+            for item_index in blendshape_utils.get_target_items(blendshape_name, target_index, geometry_index):
+                indices, deltas = blendshape_utils.get_target_deltas(
+                    blendshape_name, target_index, item_index, geometry_index, input_points=input_points)
+                target_items.append((target_index, item_index, indices, deltas))
+        geometry_targets[geometry_index] = target_items
+
+    return geometry_names, geometry_targets
+
+
+def set_blendshape_targets(blendshape_name, targets_data):
+    """
+    Applies given target deltas into the given blendShape node
+    If the blendShape node does not exist, it is created
+    :param blendshape_name: str
+    :param targets_data: dict, target deltas as returned by blendshapearray.read_targets function
+    :return: bool
+    """
+
+    if not dcc.node_exists(blendshape_name):
+        geometries = [
+            geometry_name for geometry_name in targets_data['geometry_names'].values()
+            if dcc.node_exists(geometry_name)]
+        if not geometries:
+            LOGGER.warning(
+                'Impossible to create blendShape "{}". Its geometries do not exist in current scene'.format(
+                    blendshape_name))
+            return False
+        maya.cmds.blendShape(geometries, name=blendshape_name)
+
+    # Stored geometry and target indices are mapped to the indices of the current blendShape node
+    current_geometries = dict(
+        (geometry_name, geometry_index) for geometry_index, geometry_name in
+        blendshape_utils.get_geometry_indices(blendshape_name).items())
+    current_targets = dict(
+        (target_name, target_index) for target_index, target_name in
+        blendshape_utils.get_target_names(blendshape_name).items())
+    used_indices = set(current_targets.values())
+    target_indices = dict()
+    for target_index, target_name in sorted(targets_data['target_names'].items()):
+        if target_name in current_targets:
+            target_indices[target_index] = current_targets[target_name]
+            continue
+        if target_index in used_indices:
+            target_index_to_use = max(used_indices) + 1
+        else:
+            target_index_to_use = target_index
+        used_indices.add(target_index_to_use)
+        target_indices[target_index] = target_index_to_use
+
+    for geometry_index, target_items in targets_data['geometries'].items():
+        geometry_name = targets_data['geometry_names'][geometry_index]
+        geometry_index = current_geometries.get(geometry_name, geometry_index)
+        for target_index, item_index, indices, deltas in target_items:
+            blendshape_utils.set_target_deltas(
+                blendshape_name, target_indices[target_index], indices, deltas, item_index=item_index,
+                geometry_index=geometry_index, target_name=targets_data['target_names'][target_index])
+
+    return True
+
+
+def set_blendshape_weights(blendshape_name, geometry_weights):
+    """
+    Applies given weights into the given blendShape node
+    :param blendshape_name: str
+    :param geometry_weights: dict, geometry weights as returned by read_blendshape_weights function
+    """
+
+    # Stored geometry indices are mapped, by geometry name, to the indices of the current blendShape node
+    current_geometries = dict(
+        (geometry_name, geometry_index) for geometry_index, geometry_name in
+        blendshape_utils.get_geometry_indices(blendshape_name).items())
+    target_indices = dict(
+        (target_name, target_index) for target_index, target_name in
+        blendshape_utils.get_target_names(blendshape_name).items())
+    for geometry_index, weights_data in geometry_weights.items():
+        geometry_index = current_geometries.get(weights_data.get('geometry', None), geometry_index)
+        target_weights = dict()
+        for target_name, weights in weights_data['targets'].items():
+            if target_name not in target_indices:
+                LOGGER.warning(
+                    'Target "{}" not found in blendShape "{}". Skipping it ...'.format(target_name, blendshape_name))
+                continue
+            target_weights[target_indices[target_name]] = weights
+        blendshape_utils.set_weights(
+            blendshape_name, target_weights, geometry_index=geometry_index, base_weights=weights_data['base'])
+
+
+def load_shapes():
+    """
+    Loads SHAPES plugins and sources SHAPES scripts. Scripts are only sourced once per session
+    :return: bool
+    """
+
+    global _SHAPES_SCRIPTS_LOADED
+
+    if not dcc.is_plugin_loaded('SHAPESTools'):
+        valid_load = dcc.load_plugin('SHAPESTools')
+        if not valid_load:
+            return False
+    if not dcc.is_plugin_loaded('weightDriver'):
+        dcc.load_plugin('weightDriver')
+
+    if _SHAPES_SCRIPTS_LOADED:
+        return True
+
+    for shape_script in SHAPES_SCRIPTS:
+        try:
+            maya.mel.eval('{};'.format(shape_script))
+        except Exception as exc:
+            LOGGER.debug('Impossible to load SHAPES script "{}": {}'.format(shape_script, exc))
+    _SHAPES_SCRIPTS_LOADED = True
+
+    return True
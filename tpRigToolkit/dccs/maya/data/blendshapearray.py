@@ -0,0 +1,237 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains NumPy based blendShape weights file format implementation
+All the weights of a blendShape node are stored in a single file. Target weight maps whose values are all the same
+(all ones or all zeros) are stored as a single constant value instead of a per point array
+Target geometries are stored as sparse deltas: only the indices and offsets of the displaced points are stored
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import logging
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
+
+WEIGHTS_FILE_NAME = 'weights.npz'
+TARGETS_FILE_NAME = 'targets.npz'
+WEIGHT_DTYPE = 'float32'
+DELTA_DTYPE = 'float32'
+INDEX_DTYPE = 'int32'
+
+
+def is_available():
+    """
+    Returns whether or not NumPy based blendShape weights format can be used in current environment
+    :return: bool
+    """
+
+    return numpy is not None
+
+
+def get_weights_file(folder_path):
+    """
+    Returns path where blendShape weights file is stored within given blendShape folder
+    :param folder_path: str
+    :return: str
+    """
+
+    return os.path.join(folder_path, WEIGHTS_FILE_NAME).replace('\\', '/')
+
+
+def has_weights_file(folder_path):
+    """
+    Returns whether or not given blendShape folder contains a blendShape weights file
+    :param folder_path: str
+    :return: bool
+    """
+
+    return os.path.isfile(get_weights_file(folder_path))
+
+
+def write_weights(folder_path, target_names, geometry_weights, compress=True, geometry_names=None):
+    """
+    Writes given blendShape weights into the blendShape weights file of the given folder
+    :param folder_path: str
+    :param target_names: OrderedDict(int, str), dictionary mapping target indices with target names
+    :param geometry_weights: dict(int, tuple(numpy.array, numpy.array)), dictionary mapping geometry indices with its
+        (P, ) base weights and (T, P) target weights. Target weights rows follow target names order
+    :param compress: bool
+    :param geometry_names: dict(int, str) or None, dictionary mapping geometry indices with geometry names. Used to
+        remap weights when the geometries of the blendShape are stored in a different order
+    :return: str, path of the written file
+    """
+
+    target_indices = numpy.array(list(target_names.keys()), dtype=INDEX_DTYPE)
+    geometry_indices = sorted(geometry_weights.keys())
+    arrays = {
+        'target_indices': target_indices,
+        'target_names': numpy.array(list(target_names.values()), dtype='U'),
+        'geometry_indices': numpy.array(geometry_indices, dtype=INDEX_DTYPE)
+    }
+    if geometry_names:
+        arrays['geometry_names'] = numpy.array(
+            [geometry_names.get(geometry_index, '') for geometry_index in geometry_indices], dtype='U')
+    for geometry_index, (base_weights, target_weights) in geometry_weights.items():
+        # Point count cannot be inferred from target weights of blendShapes without targets
+        base_weights = numpy.asarray(base_weights, dtype=WEIGHT_DTYPE)
+        target_weights = numpy.asarray(target_weights, dtype=WEIGHT_DTYPE)
+        point_count = target_weights.size // len(target_indices) if len(target_indices) else len(base_weights)
+        target_weights = target_weights.reshape(len(target_indices), point_count)
+        minimum = target_weights.min(axis=1) if target_weights.size else numpy.zeros(len(target_indices))
+        maximum = target_weights.max(axis=1) if target_weights.size else numpy.zeros(len(target_indices))
+        constant = (minimum == maximum) & ((maximum == 0.0) | (maximum == 1.0))
+        prefix = 'geometry_{}_'.format(geometry_index)
+        arrays[prefix + 'point_count'] = numpy.array([point_count], dtype=INDEX_DTYPE)
+        arrays[prefix + 'base'] = base_weights
+        arrays[prefix + 'targets'] = target_indices[~constant]
+        arrays[prefix + 'weights'] = target_weights[~constant]
+        arrays[prefix + 'constant_targets'] = target_indices[constant]
+        arrays[prefix + 'constant_values'] = maximum[constant].astype(WEIGHT_DTYPE)
+
+    file_path = get_weights_file(folder_path)
+    if compress:
+        numpy.savez_compressed(file_path, **arrays)
+    else:
+        numpy.savez(file_path, **arrays)
+
+    return file_path
+
+
+def read_weights(folder_path):
+    """
+    Reads blendShape weights file stored in given folder
+    :param folder_path: str
+    :return: dict or None, dictionary with target_names, geometry_names and geometries keys. Geometries value is a
+        dictionary mapping geometry indices with a dictionary with base, targets and weights keys, where weights is a
+        (T, P) array with the weights of each one of the targets (constant weight maps are expanded). Geometry names
+        is empty for files that were written without geometry names
+    """
+
+    file_path = get_weights_file(folder_path)
+    if not os.path.isfile(file_path):
+        return None
+
+    with numpy.load(file_path) as npz_file:
+        target_names = dict(zip(npz_file['target_indices'].tolist(), npz_file['target_names'].tolist()))
+        geometry_names = dict()
+        if 'geometry_names' in npz_file.files:
+            geometry_names = dict(
+                (geometry_index, geometry_name) for geometry_index, geometry_name in zip(
+                    npz_file['geometry_indices'].tolist(), npz_file['geometry_names'].tolist()) if geometry_name)
+        geometries = dict()
+        for geometry_index in npz_file['geometry_indices'].tolist():
+            prefix = 'geometry_{}_'.format(geometry_index)
+            point_count = int(npz_file[prefix + 'point_count'][0])
+            constant_targets = npz_file[prefix + 'constant_targets']
+            constant_weights = numpy.repeat(
+                npz_file[prefix + 'constant_values'][:, None], point_count, axis=1).astype(WEIGHT_DTYPE)
+            targets = numpy.concatenate([npz_file[prefix + 'targets'], constant_targets])
+            weights = numpy.concatenate([
+                npz_file[prefix + 'weights'].reshape(len(npz_file[prefix + 'targets']), point_count), constant_weights])
+            order = numpy.argsort(targets, kind='mergesort')
+            geometries[geometry_index] = {
+                'base': npz_file[prefix + 'base'],
+                'targets': targets[order],
+                'weights': weights[order],
+                'constant': numpy.isin(targets[order], constant_targets)
+            }
+
+    return {'target_names': target_names, 'geometry_names': geometry_names, 'geometries': geometries}
+
+
+def get_targets_file(folder_path):
+    """
+    Returns path where blendShape target deltas file is stored within given blendShape folder
+    :param folder_path: str
+    :return: str
+    """
+
+    return os.path.join(folder_path, TARGETS_FILE_NAME).replace('\\', '/')
+
+
+def has_targets_file(folder_path):
+    """
+    Returns whether or not given blendShape folder contains a blendShape target deltas file
+    :param folder_path: str
+    :return: bool
+    """
+
+    return os.path.isfile(get_targets_file(folder_path))
+
+
+def write_targets(folder_path, target_names, geometry_names, geometry_targets, compress=True):
+    """
+    Writes given blendShape target deltas into the target deltas file of the given folder
+    :param folder_path: str
+    :param target_names: OrderedDict(int, str), dictionary mapping target indices with target names
+    :param geometry_names: OrderedDict(int, str), dictionary mapping geometry indices with geometry names
+    :param geometry_targets: dict(int, list(tuple(int, int, numpy.array, numpy.array))), dictionary mapping geometry
+        indices with a list of (target index, target item index, point indices, point deltas) tuples
+    :param compress: bool
+    :return: str, path of the written file
+    """
+
+    arrays = {
+        'target_indices': numpy.array(list(target_names.keys()), dtype=INDEX_DTYPE),
+        'target_names': numpy.array(list(target_names.values()), dtype='U'),
+        'geometry_indices': numpy.array(list(geometry_names.keys()), dtype=INDEX_DTYPE),
+        'geometry_names': numpy.array(list(geometry_names.values()), dtype='U')
+    }
+    for geometry_index in geometry_names:
+        target_items = geometry_targets.get(geometry_index, list())
+        prefix = 'geometry_{}_'.format(geometry_index)
+        arrays[prefix + 'items'] = numpy.array(
+            [(target_index, item_index, len(indices)) for target_index, item_index, indices, _ in target_items],
+            dtype=INDEX_DTYPE).reshape(-1, 3)
+        arrays[prefix + 'indices'] = numpy.concatenate(
+            [numpy.zeros(0, dtype=INDEX_DTYPE)] + [
+                numpy.asarray(indices, dtype=INDEX_DTYPE) for _, _, indices, _ in target_items])
+        arrays[prefix + 'deltas'] = numpy.concatenate(
+            [numpy.zeros((0, 3), dtype=DELTA_DTYPE)] + [
+                numpy.asarray(deltas, dtype=DELTA_DTYPE).reshape(-1, 3) for _, _, _, deltas in target_items])
+
+    file_path = get_targets_file(folder_path)
+    if compress:
+        numpy.savez_compressed(file_path, **arrays)
+    else:
+        numpy.savez(file_path, **arrays)
+
+    return file_path
+
+
+def read_targets(folder_path):
+    """
+    Reads blendShape target deltas file stored in given folder
+    :param folder_path: str
+    :return: dict or None, dictionary with target_names, geometry_names and geometries keys. Geometries value is a
+        dictionary mapping geometry indices with a list of (target index, target item index, point indices,
+        point deltas) tuples
+    """
+
+    file_path = get_targets_file(folder_path)
+    if not os.path.isfile(file_path):
+        return None
+
+    with numpy.load(file_path) as npz_file:
+        target_names = dict(zip(npz_file['target_indices'].tolist(), npz_file['target_names'].tolist()))
+        geometry_names = dict(zip(npz_file['geometry_indices'].tolist(), npz_file['geometry_names'].tolist()))
+        geometries = dict()
+        for geometry_index in geometry_names:
+            prefix = 'geometry_{}_'.format(geometry_index)
+            items = npz_file[prefix + 'items']
+            indices = npz_file[prefix + 'indices']
+            deltas = npz_file[prefix + 'deltas']
+            offsets = numpy.concatenate([[0], numpy.cumsum(items[:, 2])]).astype('int64')
+            geometries[geometry_index] = [
+                (target_index, item_index, indices[offsets[i]:offsets[i + 1]], deltas[offsets[i]:offsets[i + 1]])
+                for i, (target_index, item_index, _) in enumerate(items.tolist())]
+
+    return {'target_names': target_names, 'geometry_names': geometry_names, 'geometries': geometries}
@@ -0,0 +1,90 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains bounded LRU (least recently used) cache used to store process-wide parsed data
+When the cache is full, the least recently used entry is discarded before storing a new one
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    Thread safe dictionary-like cache that stores up to a maximum number of entries
+    """
+
+    def __init__(self, max_size=64):
+        self._max_size = max(1, int(max_size))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    def get(self, key, default=None):
+        """
+        Returns the value stored with the given key and marks it as the most recently used entry
+        :param key: object
+        :param default: object, value returned if the key is not cached
+        :return: object
+        """
+
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value = self._entries.pop(key)
+            self._entries[key] = value
+
+        return value
+
+    def set(self, key, value):
+        """
+        Stores given value with the given key, discarding the least recently used entries if the cache is full
+        :param key: object
+        :param value: object
+        """
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """
+        Removes the entry stored with the given key
+        :param key: object
+        :param default: object, value returned if the key is not cached
+        :return: object, removed value
+        """
+
+        with self._lock:
+            return self._entries.pop(key, default)
+
+    def keys(self):
+        """
+        Returns the keys of the cached entries, from least to most recently used
+        :return: list
+        """
+
+        with self._lock:
+            return list(self._entries.keys())
+
+    def clear(self):
+        """
+        Removes all the cached entries
+        """
+
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,140 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains the codec used by data classes to read and write their payloads
+Values are stored as JSON. Legacy files, that were stored as Python literals, are still supported
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import io
+import ast
+import json
+import logging
+
+LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
+
+
+def _encode_default(value):
+    """
+    Internal function used by JSON encoder to convert values that JSON cannot handle
+    NumPy scalars and arrays are converted into Python builtin values
+    :param value: object
+    :return: object
+    """
+
+    if hasattr(value, 'tolist') and hasattr(value, 'dtype'):
+        return value.tolist()
+
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(value).__name__))
+
+
+def encode(value):
+    """
+    Encodes given value into a single line string
+    :param value: object
+    :return: str
+    """
+
+    try:
+        return json.dumps(value, separators=(',', ':'), default=_encode_default)
+    except (TypeError, ValueError):
+        # Values that cannot be stored as JSON are stored as Python literals
+        return repr(value)
+
+
+def decode(text):
+    """
+    Decodes given string into a Python value. JSON strings are decoded using fast C JSON decoder. Python literal
+    strings (legacy format) are safely decoded using literal evaluation
+    :param text: str
+    :return: object
+    """
+
+    text = text.strip()
+    if not text:
+        return None
+
+    try:
+        return json.loads(text)
+    except ValueError:
+        return ast.literal_eval(text)
+
+
+def iterate_values(file_path):
+    """
+    Generator that decodes and yields, one by one, the values stored in the lines of the given file
+    Empty lines are skipped
+    :param file_path: str
+    :return: generator(object)
+    """
+
+    with io.open(file_path, 'r', encoding='utf-8') as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            yield decode(line)
+
+
+def read_values(file_path):
+    """
+    Returns all values stored in the given file
+    :param file_path: str
+    :return: list(object)
+    """
+
+    return list(iterate_values(file_path))
+
+
+def read_value(file_path):
+    """
+    Returns the value stored in the first line of the given file
+    :param file_path: str
+    :return: object or None
+    """
+
+    for value in iterate_values(file_path):
+        return value
+
+    return None
+
+
+def write_values(file_path, values):
+    """
+    Writes given values into given file. Each value is stored in its own line
+    :param file_path: str
+    :param values: list(object)
+    :return: str
+    """
+
+    with io.open(file_path, 'w', encoding='utf-8') as fh:
+        for value in values:
+            fh.write(u'{}\n'.format(encode(value)))
+
+    return file_path
+
+
+def decode_assignment(line):
+    """
+    Decodes a "name = value" line
+    :param line: str
+    :return: tuple(str, object) or None if given line is not a valid assignment
+    """
+
+    split_line = line.split('=', 1)
+    if len(split_line) != 2:
+        return None
+
+    return split_line[0].strip(), decode(split_line[1])
+
+
+def encode_assignment(name, value):
+    """
+    Encodes given name and value into a "name = value" line
+    :param name: str
+    :param value: object
+    :return: str
+    """
+
+    return '{} = {}'.format(name, encode(value))
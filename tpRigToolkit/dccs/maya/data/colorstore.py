@@ -0,0 +1,216 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains indexed key-value store used by control color data
+Each control is stored in its own "name = value" line. An offset index of the lines is built when the store is
+opened, so single values can be read, updated or removed in place without rewriting the whole file:
+    - Updated values that fit in their current line are written over it (padded with spaces).
+    - Updated values that do not fit are appended at the end of the file and their old line is blanked.
+    - Removed values are blanked.
+Blank lines are skipped when reading, so files are still compatible with the legacy control color file format
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import io
+import os
+import logging
+from collections import OrderedDict
+
+from tpRigToolkit.dccs.maya.data import codec
+
+LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
+
+# Store is compacted when the ratio of blank bytes in the file is bigger than this value
+COMPACT_RATIO = 0.5
+# Files smaller than this size (in bytes) are never compacted
+COMPACT_MIN_SIZE = 65536
+
+
+class ColorStore(object):
+    """
+    Indexed key-value store where values are stored as "name = value" lines
+    """
+
+    def __init__(self, file_path):
+        self._file_path = file_path
+        self._index = OrderedDict()
+        self._size = 0
+        self._blank_size = 0
+        self._load_index()
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def file_path(self):
+        return self._file_path
+
+    def get_names(self):
+        """
+        Returns the sorted names of all values stored in the store
+        :return: list(str)
+        """
+
+        return sorted(self._index.keys())
+
+    def get(self, name, default=None):
+        """
+        Returns the value stored with the given name
+        :param name: str
+        :param default: object, value returned if no value is stored with given name
+        :return: object
+        """
+
+        if name not in self._index:
+            return default
+
+        offset, size, _ = self._index[name]
+        with io.open(self._file_path, 'rb') as fh:
+            fh.seek(offset)
+            assignment = codec.decode_assignment(fh.read(size).decode('utf-8'))
+
+        return assignment[1] if assignment else default
+
+    def get_all(self):
+        """
+        Returns all the values stored in the store
+        :return: OrderedDict(str, object), dictionary mapping names with values, sorted by name
+        """
+
+        values = dict()
+        if not self._index:
+            return OrderedDict()
+
+        with io.open(self._file_path, 'rb') as fh:
+            for line in fh:
+                assignment = codec.decode_assignment(line.decode('utf-8'))
+                if assignment:
+                    values[assignment[0]] = assignment[1]
+
+        return OrderedDict((name, values[name]) for name in sorted(values))
+
+    def update(self, values):
+        """
+        Stores given values. Only the lines of the given values are written
+        :param values: dict(str, object), dictionary mapping names with values
+        """
+
+        if not values:
+            return
+
+        with io.open(self._file_path, 'r+b') as fh:
+            for name, value in values.items():
+                line = codec.encode_assignment(name, value).encode('utf-8')
+                if name in self._index:
+                    offset, size, length = self._index[name]
+                    if len(line) <= size:
+                        fh.seek(offset)
+                        fh.write(line + b' ' * (size - len(line)))
+                        self._index[name] = (offset, size, len(line))
+                        self._blank_size += length - len(line)
+                        continue
+                    self._blank_line(fh, name)
+                self._append_line(fh, name, line)
+
+        self._compact_if_needed()
+
+    def remove(self, names):
+        """
+        Removes the values stored with the given names
+        :param names: list(str)
+        :return: list(str), names that were removed
+        """
+
+        removed = [name for name in names if name in self._index]
+        if not removed:
+            return removed
+
+        with io.open(self._file_path, 'r+b') as fh:
+            for name in removed:
+                self._blank_line(fh, name)
+
+        self._compact_if_needed()
+
+        return removed
+
+    def compact(self):
+        """
+        Rewrites the store file without blank lines and with the values sorted by name
+        """
+
+        lines = [codec.encode_assignment(name, value) for name, value in self.get_all().items()]
+        with io.open(self._file_path, 'w', encoding='utf-8', newline='\n') as fh:
+            for line in lines:
+                fh.write(u'{}\n'.format(line))
+
+        self._load_index()
+
+    def _load_index(self):
+        """
+        Internal function that builds the offset index of the store file lines. Values are not decoded
+        """
+
+        self._index = OrderedDict()
+        self._size = 0
+        self._blank_size = 0
+        if not os.path.isfile(self._file_path):
+            return
+
+        offset = 0
+        with io.open(self._file_path, 'rb') as fh:
+            for line in fh:
+                content = line.rstrip(b'\r\n')
+                name = content.split(b'=', 1)[0].strip() if b'=' in content else None
+                if name:
+                    length = len(content.rstrip())
+                    self._index[name.decode('utf-8')] = (offset, len(content), length)
+                    self._blank_size += len(content) - length
+                else:
+                    self._blank_size += len(line)
+                offset += len(line)
+        self._size = offset
+
+    def _append_line(self, fh, name, line):
+        """
+        Internal function that appends given line at the end of the store file
+        :param fh: file
+        :param name: str
+        :param line: bytes
+        """
+
+        fh.seek(0, os.SEEK_END)
+        offset = fh.tell()
+        if offset:
+            fh.seek(offset - 1)
+            if fh.read(1) != b'\n':
+                fh.write(b'\n')
+                offset += 1
+        fh.write(line + b'\n')
+        self._index[name] = (offset, len(line), len(line))
+        self._size = offset + len(line) + 1
+
+    def _blank_line(self, fh, name):
+        """
+        Internal function that overwrites the line of the given value with spaces
+        :param fh: file
+        :param name: str
+        """
+
+        offset, size, length = self._index.pop(name)
+        fh.seek(offset)
+        fh.write(b' ' * size)
+        self._blank_size += length
+
+    def _compact_if_needed(self):
+        """
+        Internal function that compacts the store if too much space of the file is blank
+        """
+
+        if self._size >= COMPACT_MIN_SIZE and self._blank_size > self._size * COMPACT_RATIO:
+            LOGGER.debug('Compacting control color store: "{}"'.format(self._file_path))
+            self.compact()
@@ -9,20 +9,28 @@ from __future__ import print_function, division, absolute_import
 
 import logging
 import traceback
+from collections import OrderedDict
+
+import maya.cmds
 
 from tpDcc import dcc
 from tpDcc.libs.python import fileio, python, path as path_utils
-from tpDcc.dccs.maya.core import shape as shape_utils
+from tpDcc.dccs.maya.core import shape as shape_utils, decorators as maya_decorators
 from tpDcc.dccs.maya.data import base
 
 from tpRigToolkit.core import data as rig_data
 from tpRigToolkit.libs.controlrig.core import controllib
-from tpRigToolkit.dccs.maya.data import controlcv
+from tpRigToolkit.dccs.maya.core import attribute as attribute_utils
+from tpRigToolkit.dccs.maya.data import progress, controlcv, colorstore
 
 LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
 
 
 class ControlColorFileData(base.MayaCustomData, object):
+
+    COLOR_ATTRIBUTES = ['overrideEnabled', 'overrideColor', 'overrideRGBColors']
+    RGB_ATTRIBUTES = ['overrideColorR', 'overrideColorG', 'overrideColorB']
+
     def __init__(self, name=None, path=None):
         super(ControlColorFileData, self).__init__(name=name, path=path)
 
@@ -56,8 +64,6 @@ class ControlColorFileData(base.MayaCustomData, object):
         if not file_path:
             return
 
-        orig_controls = self._get_data(file_path)
-
         objects = kwargs.get('objects', list())
         # We make sure that we store the short name of the controls
         objects = [dcc.node_short_name(obj) for obj in objects]
@@ -74,12 +80,22 @@ class ControlColorFileData(base.MayaCustomData, object):
             LOGGER.warning('No valid controls found to export.')
             return False
 
-        for control in valid_controls:
-            color_dict = self._get_color_dict(control)
-            if color_dict:
-                orig_controls[control] = color_dict
+        # Only the lines of the exported controls are written, colors of the rest of controls are kept untouched
+        control_colors = dict()
+        with progress.DataProgress('Export Control Colors', len(valid_controls)) as export_progress:
+            for control in valid_controls:
+                if not export_progress.step(status='Exporting control color: {}', status_args=(control,)):
+                    break
+                color_dict = self._get_color_dict(control)
+                if color_dict:
+                    control_colors[control] = color_dict
+
+        if export_progress.cancelled:
+            LOGGER.warning('Control colors export cancelled by user')
+            return False
 
-        self._store_all_dict(orig_controls, file_path, comment)
+        colorstore.ColorStore(file_path).update(control_colors)
+        self._save_version(file_path, comment)
 
         LOGGER.info('Exported {} data'.format(self.name))
 
@@ -92,51 +108,41 @@ class ControlColorFileData(base.MayaCustomData, object):
 
         file_path = file_path or self.get_file()
         all_control_dict = self._get_data(file_path)
-        for control in all_control_dict:
-            self._set_color_dict(control, all_control_dict[control])
+        with progress.DataProgress('Import Control Colors', len(all_control_dict)) as import_progress:
+            self._set_colors(all_control_dict, data_progress=import_progress)
+
+        if import_progress.cancelled:
+            LOGGER.warning('Control colors import cancelled by user')
+            return False
 
         return True
 
     def get_curves(self, file_name=None):
         if not file_name:
             file_name = self.get_file()
-        curve_dict = self._get_data(file_name)
-        keys = curve_dict.keys()
-        keys.sort()
 
-        return keys
+        return colorstore.ColorStore(file_name).get_names()
 
     def remove_curve(self, curve_name, file_name=None):
+        """
+        Removes color data of the given curves. A single version is created no matter the number of given curves
+        :param curve_name: str or list(str)
+        :param file_name: str or None
+        :return: bool
+        """
+
         file_name = file_name or self.get_file()
         curve_list = python.force_list(curve_name)
-        curve_dict = self._get_data(file_name)
-        for curve in curve_list:
-            if curve in curve_dict:
-                curve_dict.pop(curve)
-        self._store_all_dict(curve_dict, file_name, comment='remove curves')
+        removed = colorstore.ColorStore(file_name).remove(curve_list)
+        if removed:
+            self._save_version(file_name, comment='remove curves')
 
         return True
 
     def _get_data(self, file_name):
-        lines = fileio.get_file_lines(file_name)
-        all_controls_dict = dict()
-        for line in lines:
-            spilt_line = line.split('=')
-            if len(spilt_line) == 2:
-                color_dict = eval(spilt_line[1])
-                control = spilt_line[0].strip()
-                all_controls_dict[control] = color_dict
-
-        return all_controls_dict
-
-    def _store_all_dict(self, all_dict, file_name, comment):
-        keys = list(all_dict.keys())
-        keys.sort()
-        lines = list()
-        for key in keys:
-            lines.append('{} = {}'.format(key, all_dict[key]))
-        fileio.write_lines(file_name, lines)
+        return colorstore.ColorStore(file_name).get_all()
 
+    def _save_version(self, file_name, comment):
         version = fileio.FileVersion(file_name)
         version.save(comment)
 
@@ -174,93 +180,133 @@ class ControlColorFileData(base.MayaCustomData, object):
         return {'main': main_color, 'sub': sub_colors}
 
     def _set_color_dict(self, curve, color_dict):
-        if not dcc.node_exists(curve):
-            return
+        return self._set_colors({curve: color_dict})
+
+    def _set_colors(self, control_colors, data_progress=None):
+        """
+        Internal function that applies given colors to their controls
+        Current override state of all controls and shapes is read first and only the attribute values that are
+        different are set, within a single undo chunk
+        :param control_colors: dict(str, dict), dictionary mapping control names with their color dictionaries
+        :param data_progress: progress.DataProgress or None, if given, progress is reported while reading current
+            colors. If the operation is cancelled no color is applied
+        :return: int, number of controls whose color changed
+        """
+
+        changes = OrderedDict()
+        for curve, color_dict in control_colors.items():
+            if data_progress and not data_progress.step(status='Importing control color: {}', status_args=(curve,)):
+                return 0
+            if not dcc.node_exists(curve):
+                continue
+            try:
+                curve_changes = self._get_color_changes(curve, color_dict)
+            except Exception:
+                LOGGER.error('Error while applying color to: "{}" | {}'.format(curve, traceback.format_exc()))
+                continue
+            if curve_changes:
+                changes[curve] = curve_changes
+
+        value_count = self._apply_color_changes(changes)
+        LOGGER.info('Applied colors to {} of {} controls ({} attribute values changed)'.format(
+            len(changes), len(control_colors), value_count))
+
+        return len(changes)
+
+    def _get_color_changes(self, curve, color_dict):
+        """
+        Internal function that returns the attribute values that need to be set to apply given color to a control
+        :param curve: str
+        :param color_dict: dict
+        :return: list(tuple(str, str, object)), list of (node, attribute name, value) tuples
+        """
 
+        changes = list()
         main_color = color_dict['main']
         sub_color = color_dict['sub']
 
-        try:
-            if main_color > 0:
-                current_color = dcc.get_attribute_value(curve, 'overrideColor')
-                if not current_color == main_color:
-                    dcc.set_attribute_value(curve, 'overrideEnabled', True)
-                    if main_color:
-                        if type(main_color) != list:
-                            dcc.set_attribute_value(curve, 'overrideColor', main_color)
-                        else:
-                            dcc.set_attribute_value(curve, 'overrideColor', main_color[0])
-                            dcc.set_attribute_value(curve, 'overrideRGBColors', main_color[2])
-                            if len(main_color[1]) == 1:
-                                dcc.set_attribute_value(curve, 'overrideColorRGB', *main_color[1][0])
-                            elif len(main_color[1]) > 1:
-                                dcc.set_attribute_value(curve, 'overrideColorRGB', *main_color[1])
-                        if main_color[2]:
-                            LOGGER.info('{} color of RGB {}'.format(dcc.node_short_name(curve), main_color[1][0]))
-                        else:
-                            LOGGER.info('{} color of index {}'.format(dcc.node_short_name(curve), main_color[1]))
-
-            if sub_color:
-                shapes = shape_utils.get_shapes(curve)
-                index = 0
-                for shape in shapes:
-                    sub_current_color = dcc.get_attribute_value(shape, 'overrideColor')
-                    if sub_current_color == sub_color[index]:
-                        index += 1
-                        continue
-                    if sub_color[index] == 0:
-                        index += 1
-                        continue
-                    dcc.set_attribute_value(shape, 'overrideEnabled', True)
-                    if index < len(sub_color):
-                        if type(sub_color[index]) != list:
-                            dcc.set_attribute_value(shape, 'overrideColor', sub_color[index])
-                        else:
-                            dcc.set_attribute_value(shape, 'overrideColor', sub_color[index][0])
-                            dcc.set_attribute_value(shape, 'overrideRGBColors', sub_color[index][2])
-                            if len(sub_color[index][1]) == 1:
-                                is_connected = False
-                                for channel in 'RGB':
-                                    if dcc.is_attribute_connected(shape, 'overrideColor{}'.format(channel)):
-                                        is_connected = True
-                                        break
-                                if is_connected:
-                                    parent = dcc.node_parent(shape)
-                                    if parent and dcc.attribute_exists(parent, 'color'):
-                                        dcc.set_attribute_value(parent, 'color', sub_color[index][1][0])
-                                        override_enabled = dcc.get_attribute_value(shape, 'overrideEnabled')
-                                        if override_enabled:
-                                            dcc.set_attribute_value(shape, 'overrideEnabled', False)
-                                            dcc.set_attribute_value(shape, 'overrideEnabled', True)
-                                    else:
-                                        LOGGER.warning(
-                                            'Impossible to set control color because override color '
-                                            'attributes are connected!')
-                                else:
-                                    dcc.set_attribute_value(shape, 'overrideColorRGB', sub_color[index][1][0])
-                            elif len(sub_color[index][1]) > 1:
-                                is_connected = False
-                                for channel in 'RGB':
-                                    if dcc.is_attribute_connected(shape, 'overrideColor{}'.format(channel)):
-                                        is_connected = True
-                                        break
-                                if is_connected:
-                                    parent = dcc.node_parent(shape)
-                                    if parent and dcc.attribute_exists(parent, 'color'):
-                                        dcc.set_attribute_value(parent, 'color', sub_color[index][1][0])
-                                    else:
-                                        LOGGER.warning(
-                                            'Impossible to set control color because override color '
-                                            'attributes are connected!')
-                                else:
-                                    dcc.set_attribute_value(shape, 'overrideColorRGB', sub_color[index][1])
-                        if sub_color[index][2]:
-                            LOGGER.info('{} color of RGB {}'.format(dcc.node_short_name(curve), sub_color[index][1][0]))
-                        else:
-                            LOGGER.info('{} color of index {}'.format(dcc.node_short_name(curve), sub_color[index][1]))
-                    index += 1
-        except Exception:
-            LOGGER.error('Error while applying color to: "{}" | {}'.format(curve, traceback.format_exc()))
+        if isinstance(main_color, list) or (main_color is not None and main_color > 0):
+            changes.extend(self._get_node_color_changes(curve, main_color))
+
+        if sub_color:
+            shapes = shape_utils.get_shapes(curve) or list()
+            for shape, shape_color in zip(shapes, sub_color):
+                if shape_color == 0:
+                    continue
+                changes.extend(self._get_node_color_changes(shape, shape_color, fix_connected=True))
+
+        return changes
+
+    def _get_node_color_changes(self, node, color, fix_connected=False):
+        """
+        Internal function that compares the current override color of the given node with given color
+        :param node: str
+        :param color: int or list, color index or [color index, RGB color, RGB state] list
+        :param fix_connected: bool, whether or not the color attribute of the parent node should be set if override
+            RGB attributes are connected
+        :return: list(tuple(str, str, object)), list of (node, attribute name, value) tuples
+        """
+
+        current_values = attribute_utils.get_attribute_values(
+            node, self.COLOR_ATTRIBUTES + self.RGB_ATTRIBUTES, skip_connected=False)
+        if not isinstance(color, list):
+            if current_values.get('overrideColor') == color:
+                return list()
+            target_values = OrderedDict([('overrideEnabled', True), ('overrideColor', color)])
+        else:
+            target_values = OrderedDict([('overrideEnabled', True), ('overrideColor', color[0])])
+            if 'overrideRGBColors' in current_values:
+                target_values['overrideRGBColors'] = color[2]
+            rgb_color = (color[1][0] if len(color[1]) == 1 else color[1]) if color[1] else None
+            if rgb_color and 'overrideColorR' in current_values:
+                rgb_values = attribute_utils.get_attribute_values(node, self.RGB_ATTRIBUTES)
+                if len(rgb_values) == len(self.RGB_ATTRIBUTES):
+                    target_values.update(zip(self.RGB_ATTRIBUTES, rgb_color))
+                elif fix_connected:
+                    parent = dcc.node_parent(node)
+                    if parent and dcc.attribute_exists(parent, 'color'):
+                        return [(parent, 'color', color[1][0])] + self._get_changed_values(
+                            node, current_values, target_values)
+                    LOGGER.warning(
+                        'Impossible to set "{}" color because override color attributes are connected!'.format(node))
+
+        return self._get_changed_values(node, current_values, target_values)
+
+    def _get_changed_values(self, node, current_values, target_values):
+        """
+        Internal function that returns the target values that are different from the current ones
+        :param node: str
+        :param current_values: dict(str, object)
+        :param target_values: dict(str, object)
+        :return: list(tuple(str, str, object)), list of (node, attribute name, value) tuples
+        """
+
+        return [
+            (node, attribute_name, value) for attribute_name, value in target_values.items()
+            if not attribute_utils.is_equal(current_values.get(attribute_name), value)]
+
+    @maya_decorators.undo_chunk
+    def _apply_color_changes(self, changes):
+        """
+        Internal function that sets given attribute values
+        :param changes: dict(str, list(tuple(str, str, object))), dictionary mapping control names with the list of
+            (node, attribute name, value) tuples to set
+        :return: int, number of attribute values that were set
+        """
+
+        value_count = 0
+        for curve, curve_changes in changes.items():
+            for node, attribute_name, value in curve_changes:
+                try:
+                    if isinstance(value, (list, tuple)):
+                        dcc.set_attribute_value(node, attribute_name, value)
+                    else:
+                        maya.cmds.setAttr('{}.{}'.format(node, attribute_name), value)
+                    value_count += 1
+                except Exception:
+                    LOGGER.error('Error while applying color to: "{}" | {}'.format(curve, traceback.format_exc()))
+
+        return value_count
 
 
 class ControlColorOptionsWidget(controlcv.ControlCVOptionsWidget, object):
@@ -8,6 +8,7 @@ Module that contains Control CV position data implementation
 from __future__ import print_function, division, absolute_import
 
 import logging
+import traceback
 
 from Qt.QtWidgets import QSizePolicy, QListWidget, QListWidgetItem
 
@@ -16,10 +17,11 @@ from tpDcc.libs.python import fileio, python, path as path_utils
 from tpDcc.libs.qt.widgets import buttons, dividers, search
 from tpDcc.libs.qt.widgets.library import loadwidget
 from tpDcc.dccs.maya.data import base
-from tpDcc.dccs.maya.core import shape as shape_utils
+from tpDcc.dccs.maya.core import shape as shape_utils, decorators as maya_decorators
 
 from tpRigToolkit.core import data as rig_data
 from tpRigToolkit.dccs.maya.core import curve
+from tpRigToolkit.dccs.maya.data import progress
 from tpRigToolkit.libs.controlrig.core import controllib
 
 LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
@@ -64,10 +66,16 @@ class ControlCVsFileData(base.MayaCustomData, object):
             LOGGER.warning('No valid controls found to export.')
             return False
 
-        for control in controls:
-            library.add_curve(control)
-
-        file_path = library.write_data_to_file()
+        # CVs of all controls are extracted in a single batch, so cancellation is only checked before writing
+        with progress.DataProgress('Export Control CVs', len(valid_controls)) as export_progress:
+            with export_progress.phase('read'):
+                library.add_curves(valid_controls)
+            export_progress.step(len(valid_controls), status='Exporting control CVs')
+            if not export_progress.update():
+                LOGGER.warning('Control CVs export cancelled by user')
+                return False
+            with export_progress.phase('write'):
+                file_path = library.write_data_to_file()
 
         version = fileio.FileVersion(file_path)
         version.save(comment)
@@ -76,6 +84,7 @@ class ControlCVsFileData(base.MayaCustomData, object):
 
         return True
 
+    @maya_decorators.undo_chunk
     def import_data(self, file_path='', objects=None):
         if not dcc.is_maya():
             LOGGER.warning('Data must be exported from within Maya!')
@@ -86,15 +95,29 @@ class ControlCVsFileData(base.MayaCustomData, object):
         if objects:
             # We make sure that we store the short name of the controls
             objects = [dcc.node_short_name(obj) for obj in objects]
+        # Shapes created or deleted and shapes geometry set by the import are grouped in a single undo chunk
         controls = objects or controllib.get_controls()
-        for control in controls:
-            shapes = shape_utils.get_shapes(control)
-            if not shapes:
-                continue
-            library.set_shape_to_curve(control, control, check_curve=True)
+        valid_import = True
+        with progress.DataProgress('Import Control CVs', len(controls)) as import_progress:
+            for control in controls:
+                if not import_progress.step(status='Importing control CVs: {}', status_args=(control,)):
+                    LOGGER.warning('Control CVs import cancelled by user')
+                    return False
+                shapes = shape_utils.get_shapes(control)
+                if not shapes:
+                    continue
+                try:
+                    library.set_shape_to_curve(control, control, check_curve=True)
+                except Exception:
+                    LOGGER.error('Error while applying CVs to: "{}" | {}'.format(control, traceback.format_exc()))
+                    valid_import = False
 
         self._center_view()
 
+        if not valid_import:
+            LOGGER.warning('Imported {} data with errors'.format(self.name))
+            return False
+
         LOGGER.info('Imported {} data'.format(self.name))
 
         return True
@@ -188,13 +211,16 @@ class ControlCVOptionsWidget(loadwidget.OptionsFileWidget, object):
         if not items:
             return
 
+        # All curves are removed at once, so a single version of the data is created
+        curve_names = [str(item.text()) for item in items]
+        removed = self._data_object.remove_curve(curve_names)
+        if not removed:
+            return
+
         for item in items:
-            curve_name = str(item.text())
-            removed = self._data_object.remove_curve(curve_name)
-            if removed:
-                index = self._curves_list.indexFromItem(item)
-                remove_item = self._curves_list.takeItem(index.row())
-                del remove_item
+            index = self._curves_list.indexFromItem(item)
+            remove_item = self._curves_list.takeItem(index.row())
+            del remove_item
 
     def _unhide_names(self):
         for i in range(self._curves_list.count()):
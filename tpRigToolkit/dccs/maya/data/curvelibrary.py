@@ -0,0 +1,237 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains binary curve library file format implementation
+File starts with a fixed size header followed by a JSON index that maps each curve with its type and the offset and
+size of its record. Curve records store, for each one of the curve shapes, its degree and form followed by its knots
+and CVs as packed little endian double arrays. A single curve can be read by seeking to its record, so curve names
+are available without reading any curve data
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import io
+import os
+import sys
+import json
+import array
+import struct
+import logging
+from collections import OrderedDict, namedtuple
+
+LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
+
+MAGIC = b'TPCURVES'
+VERSION = 1
+# Magic, version and index size
+HEADER_STRUCT = struct.Struct('<8sHI')
+# Shape count
+RECORD_STRUCT = struct.Struct('<I')
+# Degree, form, knot count and CV count
+SHAPE_STRUCT = struct.Struct('<iiII')
+
+# Binary NURBS curve payload. Form follows MEL nurbsCurve data convention (0: open, 1: closed, 2: periodic), knots
+# are stored as a double array and CVs as a flat (x, y, z, x, y, z, ...) double array in object space centimeters
+NurbsCurveData = namedtuple('NurbsCurveData', ['degree', 'form', 'knots', 'cvs'])
+
+
+def is_binary_library(file_path):
+    """
+    Returns whether or not given file is a binary curve library
+    :param file_path: str
+    :return: bool
+    """
+
+    if not os.path.isfile(file_path):
+        return False
+
+    with io.open(file_path, 'rb') as fh:
+        return fh.read(len(MAGIC)) == MAGIC
+
+
+def pack_curve(curve_data_list):
+    """
+    Packs given curve shapes into a binary curve record
+    :param curve_data_list: list(NurbsCurveData)
+    :return: bytes
+    """
+
+    chunks = [RECORD_STRUCT.pack(len(curve_data_list))]
+    for curve_data in curve_data_list:
+        knots = _get_array(curve_data.knots)
+        cvs = _get_array(curve_data.cvs)
+        chunks.append(SHAPE_STRUCT.pack(curve_data.degree, curve_data.form, len(knots), len(cvs) // 3))
+        chunks.append(knots.tobytes() if hasattr(knots, 'tobytes') else knots.tostring())
+        chunks.append(cvs.tobytes() if hasattr(cvs, 'tobytes') else cvs.tostring())
+
+    return b''.join(chunks)
+
+
+def unpack_curve(data):
+    """
+    Unpacks given binary curve record
+    :param data: bytes
+    :return: list(NurbsCurveData)
+    """
+
+    curve_data_list = list()
+    offset = RECORD_STRUCT.size
+    shape_count = RECORD_STRUCT.unpack_from(data, 0)[0]
+    for _ in range(shape_count):
+        degree, form, knot_count, cv_count = SHAPE_STRUCT.unpack_from(data, offset)
+        offset += SHAPE_STRUCT.size
+        knots = _read_array(data, offset, knot_count)
+        offset += knot_count * knots.itemsize
+        cvs = _read_array(data, offset, cv_count * 3)
+        offset += cv_count * 3 * cvs.itemsize
+        curve_data_list.append(NurbsCurveData(degree, form, knots, cvs))
+
+    return curve_data_list
+
+
+def write_library(file_path, library_curves):
+    """
+    Writes given curves into a binary curve library file
+    :param file_path: str
+    :param library_curves: dict(str, tuple(list(NurbsCurveData), str)), dictionary mapping curve names with their
+        shapes and their curve type. Curves are stored sorted by name
+    :return: str, path of the written file
+    """
+
+    index = list()
+    records = list()
+    offset = 0
+    for curve_name in sorted(library_curves):
+        curve_data_list, curve_type = library_curves[curve_name]
+        record = pack_curve(curve_data_list)
+        index.append([curve_name, curve_type or '', offset, len(record)])
+        records.append(record)
+        offset += len(record)
+
+    index_data = json.dumps(index, separators=(',', ':')).encode('utf-8')
+    with io.open(file_path, 'wb') as fh:
+        fh.write(HEADER_STRUCT.pack(MAGIC, VERSION, len(index_data)))
+        fh.write(index_data)
+        for record in records:
+            fh.write(record)
+
+    return file_path
+
+
+class CurveLibraryFile(object):
+    """
+    Reader of binary curve library files. Only the index is read when the reader is created
+    """
+
+    def __init__(self, file_path):
+        self._file_path = file_path
+        self._index = OrderedDict()
+        self._data_offset = 0
+        self._read_index()
+
+    @property
+    def file_path(self):
+        return self._file_path
+
+    def get_curve_names(self):
+        """
+        Returns the names of all the curves stored in the library
+        :return: list(str)
+        """
+
+        return list(self._index.keys())
+
+    def get_curve_type(self, curve_name):
+        """
+        Returns the curve type of the given curve
+        :param curve_name: str
+        :return: str or None
+        """
+
+        if curve_name not in self._index:
+            return None
+
+        return self._index[curve_name][0]
+
+    def get_curve(self, curve_name):
+        """
+        Reads the shapes of the given curve
+        :param curve_name: str
+        :return: list(NurbsCurveData) or None if the curve is not stored in the library
+        """
+
+        if curve_name not in self._index:
+            return None
+
+        _, offset, size = self._index[curve_name]
+        with io.open(self._file_path, 'rb') as fh:
+            fh.seek(self._data_offset + offset)
+            return unpack_curve(fh.read(size))
+
+    def read_all(self):
+        """
+        Reads the shapes of all the curves stored in the library
+        :return: OrderedDict(str, tuple(list(NurbsCurveData), str))
+        """
+
+        with io.open(self._file_path, 'rb') as fh:
+            fh.seek(self._data_offset)
+            data = fh.read()
+
+        return OrderedDict(
+            (curve_name, (unpack_curve(data[offset:offset + size]), curve_type))
+            for curve_name, (curve_type, offset, size) in self._index.items())
+
+    def _read_index(self):
+        """
+        Internal function that reads the index of the library file
+        """
+
+        with io.open(self._file_path, 'rb') as fh:
+            magic, version, index_size = HEADER_STRUCT.unpack(fh.read(HEADER_STRUCT.size))
+            if magic != MAGIC:
+                raise ValueError('"{}" is not a binary curve library'.format(self._file_path))
+            if version > VERSION:
+                LOGGER.warning('Curve library "{}" was written with a newer version: {}'.format(
+                    self._file_path, version))
+            index = json.loads(fh.read(index_size).decode('utf-8'))
+
+        self._data_offset = HEADER_STRUCT.size + index_size
+        self._index = OrderedDict(
+            (curve_name, (curve_type, offset, size)) for curve_name, curve_type, offset, size in index)
+
+
+def _get_array(values):
+    """
+    Internal function that returns given values as a little endian double array
+    :param values: list(float) or array.array
+    :return: array.array
+    """
+
+    values = array.array('d', values)
+    if sys.byteorder != 'little':
+        values.byteswap()
+
+    return values
+
+
+def _read_array(data, offset, count):
+    """
+    Internal function that reads a little endian double array from given data
+    :param data: bytes
+    :param offset: int
+    :param count: int
+    :return: array.array
+    """
+
+    values = array.array('d')
+    chunk = data[offset:offset + count * values.itemsize]
+    if hasattr(values, 'frombytes'):
+        values.frombytes(chunk)
+    else:
+        values.fromstring(chunk)
+    if sys.byteorder != 'little':
+        values.byteswap()
+
+    return values
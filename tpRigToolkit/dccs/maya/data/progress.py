@@ -0,0 +1,154 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains throttled progress and cancellation reporter used by data import and export operations
+Progress is only refreshed after a minimum amount of time is elapsed, so it can be reported from hot loops
+When running in batch mode (mayapy) no progress bar is created and progress is reported through the logger
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import time
+import logging
+import contextlib
+from collections import OrderedDict
+
+import maya.cmds
+
+from tpDcc.dcc import progressbar
+
+LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
+
+# Minimum number of seconds between progress bar refreshes
+UPDATE_INTERVAL = 0.25
+# Minimum number of seconds between progress log messages when running in batch mode
+LOG_INTERVAL = 5.0
+
+
+class DataProgress(object):
+    """
+    Throttled progress reporter. Progress bar is only updated, and cancellation only checked, once per interval
+    Time spent in each phase of the operation is accumulated and logged in a final summary
+    """
+
+    def __init__(self, title, count=0, interval=None):
+        self._title = title
+        self._count = count
+        self._value = 0
+        self._reported_value = 0
+        self._status = None
+        self._cancelled = False
+        self._ended = False
+        self._phase_times = OrderedDict()
+        self._batch = maya.cmds.about(batch=True)
+        self._interval = interval if interval is not None else (LOG_INTERVAL if self._batch else UPDATE_INTERVAL)
+        self._start_time = time.time()
+        self._last_update = self._start_time
+        self._progress_bar = None if self._batch else progressbar.ProgressBar(title, count)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.end()
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    @property
+    def elapsed(self):
+        return time.time() - self._start_time
+
+    def step(self, amount=1, status=None, status_args=None):
+        """
+        Increases progress value. Progress is only reported if update interval is elapsed since last report
+        Status message is only formatted when it is reported
+        :param amount: int
+        :param status: str or None, status message. Can contain format fields filled with status arguments
+        :param status_args: tuple or None, status message format arguments
+        :return: bool, False if the operation was cancelled by the user; True otherwise
+        """
+
+        self._value += amount
+        self._status = (status, status_args)
+        if time.time() - self._last_update >= self._interval:
+            self.update()
+
+        return not self._cancelled
+
+    def update(self):
+        """
+        Forces progress report and cancellation check
+        :return: bool, False if the operation was cancelled by the user; True otherwise
+        """
+
+        self._last_update = time.time()
+        status = self._get_status()
+        if self._progress_bar:
+            if status:
+                self._progress_bar.status(status)
+            if self._value > self._reported_value:
+                self._progress_bar.inc(self._value - self._reported_value)
+            self._cancelled = self._cancelled or bool(self._progress_bar.break_signaled())
+        else:
+            LOGGER.info('{}: {}/{} {}'.format(self._title, self._value, self._count, status or '').strip())
+        self._reported_value = self._value
+
+        return not self._cancelled
+
+    def is_cancelled(self):
+        """
+        Checks whether the operation was cancelled by the user. Should be called between batches of work
+        :return: bool
+        """
+
+        if not self._cancelled and self._progress_bar:
+            self._cancelled = bool(self._progress_bar.break_signaled())
+
+        return self._cancelled
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Context manager that accumulates the time spent within it into the given phase timing
+        :param name: str
+        """
+
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self._phase_times[name] = self._phase_times.get(name, 0.0) + time.time() - start_time
+
+    def end(self):
+        """
+        Closes progress bar (if any) and logs the timing summary of the operation
+        """
+
+        if self._ended:
+            return
+        self._ended = True
+
+        if self._progress_bar:
+            self._progress_bar.end()
+
+        phases = ', '.join('{}: {:.2f}s'.format(name, phase_time) for name, phase_time in self._phase_times.items())
+        LOGGER.info('{}: {}/{} done in {:.2f} seconds{}{}'.format(
+            self._title, self._value, self._count, self.elapsed, ' ({})'.format(phases) if phases else '',
+            ' [cancelled]' if self._cancelled else ''))
+
+    def _get_status(self):
+        """
+        Internal function that returns current formatted status message
+        :return: str or None
+        """
+
+        if not self._status:
+            return None
+        status, status_args = self._status
+        if status and status_args:
+            return status.format(*status_args)
+
+        return status
@@ -0,0 +1,650 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains NumPy based sparse skin weights file format implementation
+Skin weights are stored as (vertex index, influence index, weight) triplets, one file per skinned mesh
+In memory, skin weights are handled using a CSR (compressed sparse row) structure with one row per vertex
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import time
+import struct
+import logging
+import zipfile
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from tpRigToolkit.dccs.maya.data import codec
+
+LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
+
+WEIGHTS_FILE_NAME = 'weights.npz'
+DELTA_LOG_FILE_NAME = 'weights.delta'
+DELTA_FILE_NAME = 'weights.delta.{:04d}.npz'
+MESH_FILE_NAME = 'mesh.npz'
+# Weights differences lower than this value are not considered as changes by incremental exports
+WEIGHT_TOLERANCE = 0.00001
+# Weights lower or equal than this value are pruned by default when packing weights
+PRUNE_THRESHOLD = 0.0001
+VERTEX_DTYPE = 'uint32'
+INFLUENCE_DTYPE = 'uint16'
+WEIGHT_DTYPE = 'float32'
+
+
+def is_available():
+    """
+    Returns whether or not NumPy based skin weights format can be used in current environment
+    :return: bool
+    """
+
+    return numpy is not None
+
+
+def get_weights_file(folder_path):
+    """
+    Returns path where sparse skin weights file is stored within given mesh skin folder
+    :param folder_path: str
+    :return: str
+    """
+
+    return os.path.join(folder_path, WEIGHTS_FILE_NAME).replace('\\', '/')
+
+
+def has_weights_file(folder_path):
+    """
+    Returns whether or not given mesh skin folder contains a sparse skin weights file
+    :param folder_path: str
+    :return: bool
+    """
+
+    return os.path.isfile(get_weights_file(folder_path))
+
+
+def pack_weights(influence_weights, threshold=PRUNE_THRESHOLD, max_influences=None):
+    """
+    Converts given per influence weight lists into sparse weight arrays
+    :param influence_weights: list(tuple(int, list(float))), list of influence index and its per vertex weights
+    :param threshold: float, weights lower or equal than this value are not stored
+    :param max_influences: int or None, maximum number of influences stored per vertex
+    :return: tuple(numpy.array, numpy.array, numpy.array, int), vertex indices, influence indices, weights and
+        vertex count
+    """
+
+    skin_weights = SkinWeights.from_influence_weights(influence_weights).prune(threshold)
+    if max_influences:
+        skin_weights = skin_weights.limit_influences(max_influences)
+
+    return skin_weights.get_vertices(), skin_weights.influences, skin_weights.weights, skin_weights.vertex_count
+
+
+def write_weights(folder_path, vertices, influences, weights, vertex_count, influence_count, compress=True):
+    """
+    Writes given sparse weight arrays into the sparse skin weights file of the given folder
+    :param folder_path: str
+    :param vertices: numpy.array, vertex index of each stored weight
+    :param influences: numpy.array, influence index of each stored weight
+    :param weights: numpy.array, weight values
+    :param vertex_count: int, total number of vertices of the skinned geometry
+    :param influence_count: int, total number of influences of the skin cluster
+    :param compress: bool, Whether to compress file or not. Uncompressed files can be memory-mapped when loaded
+    :return: str, path of the written file
+    """
+
+    file_path = get_weights_file(folder_path)
+    _save_arrays(
+        file_path, compress, vertices=numpy.asarray(vertices, dtype=VERTEX_DTYPE),
+        influences=numpy.asarray(influences, dtype=INFLUENCE_DTYPE),
+        weights=numpy.asarray(weights, dtype=WEIGHT_DTYPE),
+        shape=numpy.array([vertex_count, influence_count], dtype='int64'))
+
+    # Full weights file replaces any previously stored delta
+    remove_deltas(folder_path)
+
+    return file_path
+
+
+def read_weights(folder_path, mmap=False, apply_deltas=True):
+    """
+    Reads sparse skin weights file stored in given folder
+    :param folder_path: str
+    :param mmap: bool, Whether to memory-map weight arrays. Only possible if the file was stored uncompressed,
+        otherwise arrays are loaded into memory
+    :param apply_deltas: bool, Whether to apply the weight deltas stored by incremental exports
+    :return: dict, dictionary with vertices, influences, weights, vertex_count and influence_count keys
+    """
+
+    file_path = get_weights_file(folder_path)
+    if not os.path.isfile(file_path):
+        return None
+
+    arrays = None
+    if mmap:
+        try:
+            arrays = _memmap_npz(file_path)
+        except Exception as exc:
+            LOGGER.debug('Impossible to memory-map skin weights file "{}": {}'.format(file_path, exc))
+    if arrays is None:
+        with numpy.load(file_path) as npz_file:
+            arrays = dict((key, npz_file[key]) for key in npz_file.files)
+
+    vertex_count, influence_count = [int(value) for value in arrays['shape']]
+
+    weights_data = {
+        'vertices': arrays['vertices'],
+        'influences': arrays['influences'],
+        'weights': arrays['weights'],
+        'vertex_count': vertex_count,
+        'influence_count': influence_count
+    }
+
+    if apply_deltas:
+        for delta_file in get_delta_files(folder_path):
+            with numpy.load(delta_file) as delta:
+                _apply_delta(weights_data, delta['changed'], delta['vertices'], delta['influences'], delta['weights'])
+
+    return weights_data
+
+
+def get_delta_files(folder_path):
+    """
+    Returns, in the order they need to be applied, the weight delta files stored in given folder
+    :param folder_path: str
+    :return: list(str)
+    """
+
+    delta_log_file = os.path.join(folder_path, DELTA_LOG_FILE_NAME)
+    if not os.path.isfile(delta_log_file):
+        return list()
+
+    delta_files = list()
+    for delta_entry in codec.iterate_values(delta_log_file):
+        delta_file = os.path.join(folder_path, delta_entry['file']).replace('\\', '/')
+        if not os.path.isfile(delta_file):
+            LOGGER.warning('Skin weights delta file not found: "{}". Skipping it ...'.format(delta_file))
+            continue
+        delta_files.append(delta_file)
+
+    return delta_files
+
+
+def get_next_delta_index(folder_path):
+    """
+    Returns the index of the next weight delta file of the given folder
+    Index is computed from the highest index found in both delta log and disk, so a missing delta file never makes
+    a new delta overwrite an existing one
+    :param folder_path: str
+    :return: int
+    """
+
+    delta_file_names = list()
+    delta_log_file = os.path.join(folder_path, DELTA_LOG_FILE_NAME)
+    if os.path.isfile(delta_log_file):
+        delta_file_names.extend(delta_entry['file'] for delta_entry in codec.iterate_values(delta_log_file))
+    if os.path.isdir(folder_path):
+        delta_file_names.extend(os.listdir(folder_path))
+
+    delta_prefix, delta_suffix = DELTA_FILE_NAME.split('{:04d}')
+    delta_indices = [0]
+    for delta_file_name in delta_file_names:
+        if not delta_file_name.startswith(delta_prefix) or not delta_file_name.endswith(delta_suffix):
+            continue
+        delta_index = delta_file_name[len(delta_prefix):-len(delta_suffix)]
+        if delta_index.isdigit():
+            delta_indices.append(int(delta_index))
+
+    return max(delta_indices) + 1
+
+
+def get_changed_vertices(weights_data, vertices, influences, weights, tolerance=WEIGHT_TOLERANCE):
+    """
+    Returns the indices of the vertices whose weights are different between given weights data and sparse arrays
+    Both weights must be defined using the same influence indices
+    :param weights_data: dict, sparse weights data as returned by read_weights function
+    :param vertices: numpy.array
+    :param influences: numpy.array
+    :param weights: numpy.array
+    :param tolerance: float, weight differences lower than this value are ignored
+    :return: numpy.array
+    """
+
+    influence_count = max(weights_data['influence_count'], 1)
+    old_keys = weights_data['vertices'].astype('int64') * influence_count + weights_data['influences']
+    new_keys = numpy.asarray(vertices, dtype='int64') * influence_count + numpy.asarray(influences)
+    common_keys, old_ids, new_ids = numpy.intersect1d(old_keys, new_keys, assume_unique=True, return_indices=True)
+    weight_diff = numpy.abs(weights_data['weights'][old_ids] - numpy.asarray(weights, dtype=WEIGHT_DTYPE)[new_ids])
+    changed_keys = numpy.concatenate([
+        common_keys[weight_diff > tolerance],
+        numpy.setdiff1d(old_keys, new_keys, assume_unique=True),
+        numpy.setdiff1d(new_keys, old_keys, assume_unique=True)])
+
+    return numpy.unique(changed_keys // influence_count).astype(VERTEX_DTYPE)
+
+
+def write_delta_weights(
+        folder_path, vertices, influences, weights, vertex_count, influence_count, compress=True,
+        tolerance=WEIGHT_TOLERANCE):
+    """
+    Writes only the weights of the vertices that changed since the last export as a new delta file
+    If no weights file is stored yet, or stored weights are not compatible with the given ones (different vertex or
+    influence count) a full weights file is written instead
+    :param folder_path: str
+    :param vertices: numpy.array
+    :param influences: numpy.array
+    :param weights: numpy.array
+    :param vertex_count: int
+    :param influence_count: int
+    :param compress: bool
+    :param tolerance: float, weight differences lower than this value are ignored
+    :return: str or None, path of the written file or None if weights did not change
+    """
+
+    weights_data = read_weights(folder_path) if has_weights_file(folder_path) else None
+    if not weights_data or weights_data['vertex_count'] != vertex_count or \
+            weights_data['influence_count'] != influence_count:
+        return write_weights(
+            folder_path, vertices, influences, weights, vertex_count, influence_count, compress=compress)
+
+    vertices = numpy.asarray(vertices, dtype=VERTEX_DTYPE)
+    changed = get_changed_vertices(weights_data, vertices, influences, weights, tolerance=tolerance)
+    if not len(changed):
+        return None
+
+    mask = numpy.isin(vertices, changed)
+    delta_file_name = DELTA_FILE_NAME.format(get_next_delta_index(folder_path))
+    delta_file = os.path.join(folder_path, delta_file_name).replace('\\', '/')
+    _save_arrays(
+        delta_file, compress, changed=changed, vertices=vertices[mask],
+        influences=numpy.asarray(influences, dtype=INFLUENCE_DTYPE)[mask],
+        weights=numpy.asarray(weights, dtype=WEIGHT_DTYPE)[mask])
+
+    delta_log_file = os.path.join(folder_path, DELTA_LOG_FILE_NAME)
+    with open(delta_log_file, 'a') as fh:
+        fh.write('{}\n'.format(codec.encode({
+            'file': delta_file_name, 'vertices': int(len(changed)),
+            'time': time.strftime('%Y-%m-%d %H:%M:%S')})))
+
+    return delta_file
+
+
+def compact_weights(folder_path, compress=True):
+    """
+    Folds all the weight deltas stored in the given folder into its weights file
+    :param folder_path: str
+    :param compress: bool
+    :return: bool, True if any delta was folded; False otherwise
+    """
+
+    if not has_weights_file(folder_path) or not get_delta_files(folder_path):
+        return False
+
+    weights_data = read_weights(folder_path)
+    order = numpy.lexsort((weights_data['influences'], weights_data['vertices']))
+    write_weights(
+        folder_path, weights_data['vertices'][order], weights_data['influences'][order],
+        weights_data['weights'][order], weights_data['vertex_count'], weights_data['influence_count'],
+        compress=compress)
+
+    return True
+
+
+def remove_deltas(folder_path):
+    """
+    Removes all the weight delta files (and delta log) stored in the given folder
+    :param folder_path: str
+    """
+
+    for delta_file in get_delta_files(folder_path):
+        os.remove(delta_file)
+    delta_log_file = os.path.join(folder_path, DELTA_LOG_FILE_NAME)
+    if os.path.isfile(delta_log_file):
+        os.remove(delta_log_file)
+
+
+class SkinWeights(object):
+    """
+    Sparse skin weights stored in CSR (compressed sparse row) format: one row per vertex
+    Influences and weights of vertex i are stored in influences[offsets[i]:offsets[i + 1]] and
+    weights[offsets[i]:offsets[i + 1]], sorted by influence index
+    """
+
+    def __init__(self, offsets, influences, weights, influence_count):
+        self._offsets = numpy.asarray(offsets, dtype='int64')
+        self._influences = numpy.asarray(influences, dtype=INFLUENCE_DTYPE)
+        self._weights = numpy.asarray(weights, dtype=WEIGHT_DTYPE)
+        self._influence_count = int(influence_count)
+        self._vertices = None
+
+    @classmethod
+    def from_triplets(cls, vertices, influences, weights, vertex_count, influence_count):
+        """
+        Creates sparse skin weights from (vertex index, influence index, weight) triplets
+        :param vertices: numpy.array
+        :param influences: numpy.array
+        :param weights: numpy.array
+        :param vertex_count: int
+        :param influence_count: int
+        :return: SkinWeights
+        """
+
+        vertices = numpy.asarray(vertices, dtype='int64')
+        influences = numpy.asarray(influences)
+        order = numpy.lexsort((influences, vertices))
+        vertex_count = max(int(vertex_count), int(vertices.max()) + 1 if len(vertices) else 0)
+        offsets = numpy.zeros(vertex_count + 1, dtype='int64')
+        numpy.cumsum(numpy.bincount(vertices, minlength=vertex_count), out=offsets[1:])
+
+        return cls(offsets, influences[order], numpy.asarray(weights)[order], influence_count)
+
+    @classmethod
+    def from_data(cls, weights_data):
+        """
+        Creates sparse skin weights from given weights data
+        :param weights_data: dict, sparse weights data as returned by read_weights function
+        :return: SkinWeights
+        """
+
+        return cls.from_triplets(
+            weights_data['vertices'], weights_data['influences'], weights_data['weights'],
+            weights_data['vertex_count'], weights_data['influence_count'])
+
+    @classmethod
+    def from_influence_weights(cls, influence_weights):
+        """
+        Creates sparse skin weights from per influence weight lists. Zero weights are not stored
+        :param influence_weights: list(tuple(int, list(float))), list of influence index and its per vertex weights
+        :return: SkinWeights
+        """
+
+        vertex_arrays = [numpy.zeros(0, dtype='int64')]
+        influence_arrays = [numpy.zeros(0, dtype=INFLUENCE_DTYPE)]
+        weight_arrays = [numpy.zeros(0, dtype=WEIGHT_DTYPE)]
+        vertex_count = 0
+        influence_count = 0
+        for influence_index, weights in influence_weights:
+            weights = numpy.asarray(weights, dtype=WEIGHT_DTYPE)
+            vertex_count = max(vertex_count, len(weights))
+            influence_count = max(influence_count, int(influence_index) + 1)
+            vertex_ids = numpy.flatnonzero(weights > 0.0)
+            vertex_arrays.append(vertex_ids)
+            influence_arrays.append(numpy.full(len(vertex_ids), influence_index, dtype=INFLUENCE_DTYPE))
+            weight_arrays.append(weights[vertex_ids])
+
+        return cls.from_triplets(
+            numpy.concatenate(vertex_arrays), numpy.concatenate(influence_arrays), numpy.concatenate(weight_arrays),
+            vertex_count, influence_count)
+
+    @property
+    def offsets(self):
+        return self._offsets
+
+    @property
+    def influences(self):
+        return self._influences
+
+    @property
+    def weights(self):
+        return self._weights
+
+    @property
+    def vertex_count(self):
+        return len(self._offsets) - 1
+
+    @property
+    def influence_count(self):
+        return self._influence_count
+
+    def get_counts(self):
+        """
+        Returns the number of influences stored for each vertex
+        :return: numpy.array
+        """
+
+        return numpy.diff(self._offsets)
+
+    def get_vertices(self):
+        """
+        Returns the vertex index of each stored weight
+        :return: numpy.array
+        """
+
+        if self._vertices is None:
+            self._vertices = numpy.repeat(numpy.arange(self.vertex_count, dtype=VERTEX_DTYPE), self.get_counts())
+
+        return self._vertices
+
+    def get_influence_weights(self, influence_index):
+        """
+        Returns dense per vertex weights of the given influence
+        :param influence_index: int
+        :return: numpy.array
+        """
+
+        dense_weights = numpy.zeros(self.vertex_count, dtype='float64')
+        mask = self._influences == influence_index
+        dense_weights[self.get_vertices()[mask]] = self._weights[mask]
+
+        return dense_weights
+
+    def to_data(self):
+        """
+        Returns sparse weights data dictionary, as returned by read_weights function
+        :return: dict
+        """
+
+        return {
+            'vertices': self.get_vertices(),
+            'influences': self._influences,
+            'weights': self._weights,
+            'vertex_count': self.vertex_count,
+            'influence_count': self._influence_count
+        }
+
+    def prune(self, threshold, normalize=True):
+        """
+        Returns new sparse skin weights without the weights lower or equal than given threshold
+        :param threshold: float
+        :param normalize: bool, Whether to scale remaining weights of pruned vertices to keep their weights total
+        :return: SkinWeights
+        """
+
+        return self._select(self._weights > threshold, normalize)
+
+    def limit_influences(self, max_influences, normalize=True):
+        """
+        Returns new sparse skin weights keeping only the highest weighted influences of each vertex
+        :param max_influences: int, maximum number of influences per vertex
+        :param normalize: bool, Whether to scale remaining weights of limited vertices to keep their weights total
+        :return: SkinWeights
+        """
+
+        counts = self.get_counts()
+        if not len(counts) or counts.max() <= max_influences:
+            return self
+
+        vertices = self.get_vertices()
+        order = numpy.lexsort((-self._weights, vertices))
+        ranks = numpy.arange(len(order)) - numpy.repeat(self._offsets[:-1], counts)
+        keep = numpy.zeros(len(order), dtype=bool)
+        keep[order[ranks < max_influences]] = True
+
+        return self._select(keep, normalize)
+
+    def normalize(self):
+        """
+        Returns new sparse skin weights where the weights of each vertex sum 1
+        :return: SkinWeights
+        """
+
+        vertices = self.get_vertices()
+        totals = numpy.bincount(vertices, weights=self._weights, minlength=self.vertex_count)
+        scale = numpy.zeros(self.vertex_count, dtype='float64')
+        numpy.divide(1.0, totals, out=scale, where=totals > 0)
+
+        return SkinWeights(self._offsets, self._influences, self._weights * scale[vertices], self._influence_count)
+
+    def remap_influences(self, influence_map):
+        """
+        Returns new sparse skin weights with its influence indices replaced by the ones of the given mapping
+        Weights of the influences not included in the mapping are removed
+        :param influence_map: dict(int, int), dictionary mapping current influence indices with new ones
+        :return: SkinWeights
+        """
+
+        # Files written by previous versions can store influence indices greater than the influence count
+        stored_count = int(self._influences.max()) + 1 if len(self._influences) else 0
+        index_map = numpy.full(
+            max([self._influence_count, stored_count] + [index + 1 for index in influence_map]), -1, dtype='int64')
+        for influence_index, new_index in influence_map.items():
+            index_map[influence_index] = new_index
+        influences = index_map[self._influences]
+        mask = influences >= 0
+        influence_count = max(list(influence_map.values()) or [-1]) + 1
+
+        return SkinWeights.from_triplets(
+            self.get_vertices()[mask], influences[mask], self._weights[mask], self.vertex_count, influence_count)
+
+    def _select(self, mask, normalize):
+        """
+        Internal function that returns new sparse skin weights with the stored weights of the given mask
+        :param mask: numpy.array(bool)
+        :param normalize: bool
+        :return: SkinWeights
+        """
+
+        if mask.all():
+            return self
+
+        vertices = self.get_vertices()
+        weights = self._weights[mask]
+        if normalize:
+            old_totals = numpy.bincount(vertices, weights=self._weights, minlength=self.vertex_count)
+            new_totals = numpy.bincount(vertices[mask], weights=weights, minlength=self.vertex_count)
+            scale = numpy.zeros(self.vertex_count, dtype='float64')
+            numpy.divide(old_totals, new_totals, out=scale, where=new_totals > 0)
+            weights = weights * scale[vertices[mask]]
+        offsets = numpy.zeros_like(self._offsets)
+        numpy.cumsum(numpy.bincount(vertices[mask], minlength=self.vertex_count), out=offsets[1:])
+
+        return SkinWeights(offsets, self._influences[mask], weights, self._influence_count)
+
+
+def get_mesh_file(folder_path):
+    """
+    Returns path where rest mesh file is stored within given mesh skin folder
+    :param folder_path: str
+    :return: str
+    """
+
+    return os.path.join(folder_path, MESH_FILE_NAME).replace('\\', '/')
+
+
+def has_mesh_file(folder_path):
+    """
+    Returns whether or not given mesh skin folder contains a rest mesh file
+    :param folder_path: str
+    :return: bool
+    """
+
+    return os.path.isfile(get_mesh_file(folder_path))
+
+
+def write_mesh(folder_path, points, triangles, compress=True):
+    """
+    Writes rest points and triangles of a skinned mesh. Used to transfer weights when topology changes
+    :param folder_path: str
+    :param points: numpy.array, (N, 3) array of world space rest points
+    :param triangles: numpy.array, (M, 3) array of triangle vertex indices
+    :param compress: bool
+    :return: str, path of the written file
+    """
+
+    file_path = get_mesh_file(folder_path)
+    _save_arrays(
+        file_path, compress, points=numpy.asarray(points, dtype='float64'),
+        triangles=numpy.asarray(triangles, dtype=VERTEX_DTYPE))
+
+    return file_path
+
+
+def read_mesh(folder_path):
+    """
+    Reads rest points and triangles of a skinned mesh stored in given folder
+    :param folder_path: str
+    :return: tuple(numpy.array, numpy.array) or None, rest points and triangles
+    """
+
+    file_path = get_mesh_file(folder_path)
+    if not os.path.isfile(file_path):
+        return None
+
+    with numpy.load(file_path) as npz_file:
+        return npz_file['points'], npz_file['triangles']
+
+
+def _save_arrays(file_path, compress, **arrays):
+    """
+    Internal function that stores given arrays into a .npz file
+    :param file_path: str
+    :param compress: bool
+    """
+
+    save_fn = numpy.savez_compressed if compress else numpy.savez
+    with open(file_path, 'wb') as fh:
+        save_fn(fh, **arrays)
+
+
+def _apply_delta(weights_data, changed, vertices, influences, weights):
+    """
+    Internal function that replaces the weights of the changed vertices of the given weights data
+    :param weights_data: dict
+    :param changed: numpy.array, indices of the vertices whose weights are replaced
+    :param vertices: numpy.array
+    :param influences: numpy.array
+    :param weights: numpy.array
+    """
+
+    keep = ~numpy.isin(weights_data['vertices'], changed)
+    weights_data['vertices'] = numpy.concatenate([weights_data['vertices'][keep], vertices])
+    weights_data['influences'] = numpy.concatenate([weights_data['influences'][keep], influences])
+    weights_data['weights'] = numpy.concatenate([weights_data['weights'][keep], weights])
+
+
+def _memmap_npz(file_path):
+    """
+    Internal function that memory-maps all arrays of an uncompressed .npz file
+    :param file_path: str
+    :return: dict(str, numpy.memmap) or None if the file is compressed
+    """
+
+    arrays = dict()
+    with zipfile.ZipFile(file_path, 'r') as zip_file:
+        infos = zip_file.infolist()
+    if any(info.compress_type != zipfile.ZIP_STORED for info in infos):
+        return None
+
+    with open(file_path, 'rb') as fh:
+        for info in infos:
+            # Local file header has a fixed size of 30 bytes followed by the file name and extra fields
+            fh.seek(info.header_offset)
+            local_header = fh.read(30)
+            name_length, extra_length = struct.unpack('<HH', local_header[26:30])
+            fh.seek(info.header_offset + 30 + name_length + extra_length)
+            version = numpy.lib.format.read_magic(fh)
+            if version == (1, 0):
+                shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(fh)
+            else:
+                shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(fh)
+            order = 'F' if fortran_order else 'C'
+            key = os.path.splitext(info.filename)[0]
+            if not shape or not int(numpy.prod(shape)):
+                arrays[key] = numpy.zeros(shape, dtype=dtype)
+                continue
+            arrays[key] = numpy.memmap(file_path, dtype=dtype, mode='r', offset=fh.tell(), shape=shape, order=order)
+
+    return arrays
@@ -8,24 +8,32 @@ Module that contains data Maya Skin Cluster weights widget
 from __future__ import print_function, division, absolute_import
 
 import os
+import gzip
 import json
+import time
+import shutil
 import logging
-import threading
+import tempfile
 from collections import OrderedDict
 
 import maya.cmds
 
 from tpDcc import dcc
-from tpDcc.dcc import progressbar
 from tpDcc.libs.python import fileio, folder, path as path_utils
 from tpDcc.dccs.maya.data import base
 from tpDcc.dccs.maya.core import helpers, shape as shape_utils, deformer as deform_utils
 from tpDcc.dccs.maya.core import decorators as maya_decorators, scene as scene_utils, geometry as geo_utils
 
 from tpRigToolkit.core import data
+from tpRigToolkit.dccs.maya.core import skin as skin_utils, mesh as mesh_utils
+from tpRigToolkit.dccs.maya.data import codec, progress, skinarray, skintransfer, workers
 
 LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
 
+MESH_FINGERPRINT_FILE = 'mesh.info'
+NG_DATA_FILE = 'ngdata.json'
+COMPRESSED_FILE_EXTENSION = '.gz'
+
 
 class SkinWeightsData(base.MayaCustomData, object):
     def __init__(self, name=None, path=None):
@@ -62,12 +70,34 @@ class SkinWeightsData(base.MayaCustomData, object):
 
         file_folder = os.path.dirname(file_path)
 
+        # Binary format stores all the weights of a mesh in a single sparse array file instead of one file per
+        # influence. If NumPy is not available we fallback to legacy per influence weight files
+        use_binary = kwargs.get('binary', True)
+        if use_binary and not skinarray.is_available():
+            LOGGER.warning('NumPy is not available. Exporting skin weights using legacy weights format ...')
+            use_binary = False
+        compress = kwargs.get('compress', True)
+
+        # Incremental exports only store the weights of the vertices that changed since last export as weights deltas
+        incremental = kwargs.get('incremental', False) and use_binary
+        max_deltas = kwargs.get('max_deltas', 10)
+
+        # Binary weights are pruned and, optionally, limited to a maximum number of influences per vertex. Remaining
+        # weights of modified vertices are scaled to keep vertex weights total
+        prune_threshold = kwargs.get('prune_threshold', skinarray.PRUNE_THRESHOLD)
+        max_influences = kwargs.get('max_influences', None)
+
         # Check that all objects that we are going to export have at least one skin cluster node associated
         # Make sure also that all objects skin output folder have been created
+        # Skin clusters, influences and influence positions of all objects are gathered in a single pass and cached
+        skin_query = skin_utils.SkinClusterQuery()
         obj_dirs = OrderedDict()
         skin_nodes = OrderedDict()
         geo_paths = OrderedDict()
         skin_weights = OrderedDict()
+        mesh_fingerprints = dict()
+        reuse_mesh_objs = dict()
+        stored_influences = dict()
         for obj in objects:
             if shape_utils.is_a_shape(obj):
                 obj = dcc.node_parent(obj, full_path=True)
@@ -79,65 +109,115 @@ class SkinWeightsData(base.MayaCustomData, object):
             if obj_filename.find(':') > -1:
                 obj_filename = obj_filename.replace(':', '-')
 
-            skin = deform_utils.find_deformer_by_type(obj, 'skinCluster')
+            skin = skin_query.get_skin_cluster(obj)
             if not skin:
                 LOGGER.warning('Skin exported failed! No skinCluster node found on "{}"'.format(obj))
                 return False
 
+            # If mesh did not change since last export, we keep the already exported OBJ mesh
             geo_path = path_utils.join_path(file_folder, obj_filename)
-            if path_utils.is_dir(geo_path):
-                folder.delete_folder(obj_filename, file_folder)
-            geo_path = folder.create_folder(obj_filename, file_folder)
+            keep_files = list()
+            if shape_utils.has_shape_of_type(obj, 'mesh'):
+                mesh_fingerprints[obj] = self._get_mesh_fingerprint(obj, skin)
+                if mesh_utils.is_same_mesh(mesh_fingerprints[obj], self._read_mesh_fingerprint(geo_path)) and \
+                        path_utils.is_file(path_utils.join_path(geo_path, 'mesh.obj')):
+                    keep_files = ['mesh.obj', MESH_FINGERPRINT_FILE, skinarray.MESH_FILE_NAME]
+            if incremental and skinarray.has_weights_file(geo_path):
+                stored_influences[obj] = self._get_influence_indices(geo_path)
+            elif path_utils.is_dir(geo_path):
+                if keep_files:
+                    self._clean_data_folder(geo_path, keep_files)
+                else:
+                    folder.delete_folder(obj_filename, file_folder)
+            if not path_utils.is_dir(geo_path):
+                geo_path = folder.create_folder(obj_filename, file_folder)
             if not geo_path:
                 LOGGER.error(
                     'Unable to create skin weights directory: "{}" in "{}"'.format(obj_filename, file_folder))
                 return False
 
-            weights = deform_utils.get_skin_weights(skin)
+            weights = skin_query.get_weights(skin)
 
             obj_dirs[obj] = obj_filename
+            reuse_mesh_objs[obj] = bool(keep_files)
             skin_nodes[obj] = skin
             geo_paths[obj] = geo_path
             skin_weights[obj] = weights
 
-        for (obj, skin_node), (_, geo_path), (_, skin_weights) in zip(
-                skin_nodes.items(), geo_paths.items(), skin_weights.items()):
-
-            LOGGER.info('Exporting weights: {} > {} --> "{}"'.format(obj, skin_node, geo_path))
-
-            info_lines = list()
-            info_file = fileio.create_file('influence.info', geo_path)
-
-            for influence in skin_weights:
-                if influence is None or influence == 'None':
-                    continue
-                weight_list = skin_weights[influence]
-                if not weight_list:
-                    continue
-                thread = MayaLoadWeightFileThread()
-                influence_line = thread.run(influence, skin_node, skin_weights[influence], geo_path)
-                if influence_line:
-                    info_lines.append(influence_line)
-
-            writer = fileio.FileWriter(info_file)
-            writer.write(info_lines)
-
-            settings_file = fileio.create_file('settings.info', geo_path)
-            setting_lines = list()
-            if shape_utils.has_shape_of_type(obj, 'mesh'):
-                self._export_mesh_obj(obj, geo_path)
-
-            if dcc.attribute_exists(skin_node, 'blendWeights'):
-                blend_weights = deform_utils.get_skin_blend_weights(skin_node)
-                setting_lines.append("['blendWeights', {}]".format(blend_weights))
-            if dcc.attribute_exists(skin_node, 'skinningMethod'):
-                skin_method = dcc.get_attribute_value(skin_node, 'skinningMethod')
-                setting_lines.append("['skinningMethod', {}]".format(skin_method))
-
-            write_settings = fileio.FileWriter(settings_file)
-            write_settings.write(setting_lines)
+        # Maya queries are done in the main thread while weight files encoding and writing is done in the worker pool
+        with progress.DataProgress('Export Skin', len(skin_nodes)) as export_progress, \
+                workers.WorkerPool(max_workers=kwargs.get('max_workers', None)) as pool:
+            for (obj, skin_node), (_, geo_path), (_, skin_weights) in zip(
+                    skin_nodes.items(), geo_paths.items(), skin_weights.items()):
+                if export_progress.is_cancelled():
+                    break
+
+                LOGGER.info('Exporting weights: {} > {} --> "{}"'.format(obj, skin_node, geo_path))
+
+                info_lines = list()
+                binary_weights = list()
+                influence_indices = dict()
+                influence_names = skin_query.get_influences(skin_node)
+                for influence in skin_weights:
+                    if influence is None or influence == 'None':
+                        continue
+                    weight_list = skin_weights[influence]
+                    if weight_list is None or not len(weight_list):
+                        continue
+                    influence_name = influence_names.get(influence, None)
+                    if not influence_name:
+                        continue
+                    influence_position = skin_query.get_influence_position(influence_name)
+                    if use_binary:
+                        influence_index = len(binary_weights)
+                        influence_indices[influence_name] = influence_index
+                        info_lines.append(codec.encode(
+                            {influence_name: {'position': influence_position, 'index': influence_index}}))
+                        binary_weights.append((influence_index, weight_list))
+                    else:
+                        info_lines.append(codec.encode({influence_name: {'position': influence_position}}))
+                        pool.submit(write_weight_file, geo_path, influence_name, weight_list)
+
+                pool.submit(write_info_file, geo_path, 'influence.info', info_lines)
+                if binary_weights:
+                    # Deltas can only be stored if influences did not change since last export
+                    write_delta = incremental and stored_influences.get(obj, None) == influence_indices
+                    pool.submit(
+                        write_sparse_weights_file, geo_path, binary_weights, compress, write_delta, max_deltas,
+                        prune_threshold, max_influences)
+
+                setting_lines = list()
+                if reuse_mesh_objs[obj]:
+                    LOGGER.info('Mesh "{}" did not change since last export. Skipping OBJ export ...'.format(obj))
+                elif shape_utils.has_shape_of_type(obj, 'mesh'):
+                    self._export_mesh_obj(obj, geo_path)
+                if mesh_fingerprints.get(obj):
+                    pool.submit(
+                        codec.write_values, path_utils.join_path(geo_path, MESH_FINGERPRINT_FILE),
+                        [mesh_fingerprints[obj]])
+                    # Rest mesh is used to transfer weights if mesh topology changes before import
+                    if use_binary and not (reuse_mesh_objs[obj] and skinarray.has_mesh_file(geo_path)):
+                        rest_mesh = skin_utils.get_skin_input_shape(skin_node) or obj
+                        pool.submit(
+                            skinarray.write_mesh, geo_path, mesh_utils.get_mesh_points(rest_mesh, world=True),
+                            mesh_utils.get_mesh_triangles(rest_mesh), compress)
+
+                if dcc.attribute_exists(skin_node, 'blendWeights'):
+                    blend_weights = deform_utils.get_skin_blend_weights(skin_node)
+                    setting_lines.append(codec.encode(['blendWeights', blend_weights]))
+                if dcc.attribute_exists(skin_node, 'skinningMethod'):
+                    skin_method = dcc.get_attribute_value(skin_node, 'skinningMethod')
+                    setting_lines.append(codec.encode(['skinningMethod', skin_method]))
+
+                pool.submit(write_info_file, geo_path, 'settings.info', setting_lines)
+                export_progress.step(status='Exporting skin weights: {}', status_args=(obj,))
+
+        if export_progress.cancelled:
+            LOGGER.warning('Skin weights export cancelled by user')
+            return False
 
-            LOGGER.info('Skin weights exported successfully: {} > {} --> "{}"'.format(obj, skin_node, geo_path))
+        for obj, skin_node in skin_nodes.items():
+            LOGGER.info('Skin weights exported successfully: {} > {} --> "{}"'.format(obj, skin_node, geo_paths[obj]))
 
         data_to_save = OrderedDict()
         for obj, obj_filename in obj_dirs.items():
@@ -185,6 +265,7 @@ class SkinWeightsData(base.MayaCustomData, object):
                 continue
             skin_data[obj] = {'folder': dcc.node_short_name(obj), 'enabled': True}
 
+        obj_paths = OrderedDict()
         for obj, obj_data in skin_data.items():
             obj_folder = obj_data.get('folder', None)
             if not obj_folder:
@@ -196,8 +277,25 @@ class SkinWeightsData(base.MayaCustomData, object):
             obj_exists = dcc.node_exists(obj)
             if not obj_exists:
                 continue
-
-            self._import_skin_weights(obj_path, obj)
+            obj_paths[obj] = obj_path
+
+        # Influences data files are read in the background while skin weights are applied in the main thread. Only
+        # a sliding window of meshes is read ahead, so decoded weights of at most that many meshes are kept in memory
+        with progress.DataProgress('Import Skin', len(obj_paths)) as import_progress:
+            with workers.WorkerPool(max_workers=2) as pool:
+                influence_results = pool.imap(self._read_skin_data, list(obj_paths.values()))
+                for obj, obj_path in obj_paths.items():
+                    if import_progress.is_cancelled():
+                        LOGGER.warning('Skin weights import cancelled by user')
+                        influence_results.close()
+                        pool.terminate()
+                        break
+                    with import_progress.phase('read'):
+                        influence_dict, skin_weights = next(influence_results)
+                    with import_progress.phase('apply'):
+                        self._import_skin_weights(
+                            obj_path, obj, influence_dict=influence_dict, skin_weights=skin_weights)
+                    import_progress.step(status='Importing skin weights: {}', status_args=(obj,))
 
         self._center_view()
 
@@ -205,6 +303,33 @@ class SkinWeightsData(base.MayaCustomData, object):
 
         return True
 
+    def compact_data(self, file_path=None, compress=True):
+        """
+        Folds the weight deltas stored by incremental exports into the weights file of each mesh
+        :param file_path: str
+        :param compress: bool
+        :return: bool
+        """
+
+        if not skinarray.is_available():
+            LOGGER.warning('NumPy is not available. Impossible to compact skin weights data!')
+            return False
+
+        file_path = file_path or self.get_file()
+        if not file_path or not os.path.isfile(file_path):
+            return False
+
+        file_folder = os.path.dirname(file_path)
+        with workers.WorkerPool() as pool:
+            compacted = pool.map(
+                lambda mesh_folder: skinarray.compact_weights(
+                    path_utils.join_path(file_folder, mesh_folder), compress=compress),
+                folder.get_folders(file_folder) or list())
+
+        LOGGER.info('Compacted skin weights deltas of {} meshes'.format(compacted.count(True)))
+
+        return True
+
     def get_skin_meshes(self, file_path=None):
         """
         Returns all skinned meshes fro ma .skin file
@@ -281,6 +406,83 @@ class SkinWeightsData(base.MayaCustomData, object):
 
         deform_utils.set_skin_envelope(mesh, envelope_value)
 
+    def _get_mesh_fingerprint(self, mesh, skin_cluster):
+        """
+        Internal function that returns the fingerprint (topology and rest points hashes) of the given skinned mesh
+        :param mesh: str
+        :param skin_cluster: str
+        :return: dict
+        """
+
+        return mesh_utils.get_mesh_fingerprint(mesh, rest_mesh=skin_utils.get_skin_input_shape(skin_cluster))
+
+    def _read_mesh_fingerprint(self, data_path):
+        """
+        Internal function that returns the mesh fingerprint stored in given path
+        :param data_path: str
+        :return: dict or None
+        """
+
+        fingerprint_path = path_utils.join_path(data_path, MESH_FINGERPRINT_FILE)
+        if not path_utils.is_file(fingerprint_path):
+            return None
+
+        try:
+            return codec.read_value(fingerprint_path)
+        except Exception as exc:
+            LOGGER.warning('Impossible to read mesh fingerprint file: "{}" | {}'.format(fingerprint_path, exc))
+            return None
+
+    def _is_mesh_fingerprint_compatible(self, mesh, data_path):
+        """
+        Internal function that returns whether or not given mesh has the same topology as the one stored in the mesh
+        fingerprint of the given path. If no fingerprint is stored, False is returned
+        :param mesh: str
+        :param data_path: str
+        :return: bool
+        """
+
+        fingerprint = self._read_mesh_fingerprint(data_path)
+        if not fingerprint:
+            return False
+
+        return fingerprint.get('topology') == mesh_utils.get_topology_hash(mesh)
+
+    def _get_influence_indices(self, data_path):
+        """
+        Internal function that returns the sparse weights influence indices stored in the influence file of the
+        given path
+        :param data_path: str
+        :return: dict(str, int)
+        """
+
+        influence_indices = dict()
+        info_file = path_utils.join_path(data_path, 'influence.info')
+        if not path_utils.is_file(info_file):
+            return influence_indices
+
+        for line_dict in codec.iterate_values(info_file):
+            for influence_name, influence_data in line_dict.items():
+                influence_indices[influence_name] = influence_data.get('index', None)
+
+        return influence_indices
+
+    def _clean_data_folder(self, data_path, keep_files):
+        """
+        Internal function that removes all the files and folders of the given path but the given ones
+        :param data_path: str
+        :param keep_files: list(str)
+        """
+
+        for file_name in os.listdir(data_path):
+            if file_name in keep_files:
+                continue
+            file_path = path_utils.join_path(data_path, file_name)
+            if path_utils.is_dir(file_path):
+                folder.delete_folder(file_name, data_path)
+            else:
+                os.remove(file_path)
+
     def _import_mesh_obj(self, data_path):
         """
         Internal function that imports mesh object stored in given path
@@ -301,7 +503,7 @@ class SkinWeightsData(base.MayaCustomData, object):
 
         return delta
 
-    def _import_skin_weights(self, data_path, mesh):
+    def _import_skin_weights(self, data_path, mesh, influence_dict=None, skin_weights=None):
 
         if not dcc.node_exists(mesh) or not os.path.isdir(data_path):
             return False
@@ -318,8 +520,11 @@ class SkinWeightsData(base.MayaCustomData, object):
             return False
 
         LOGGER.info('Importing skin clusters {} --> "{}"'.format(mesh, data_path))
+        start_time = time.time()
 
-        influence_dict = self._get_influences(data_path)
+        if influence_dict is None:
+            influence_dict = self._get_influences(data_path)
+            skin_weights = self._get_skin_weights(data_path)
         if not influence_dict:
             LOGGER.warning('No influences data found for: {}'.format(mesh))
             return False
@@ -334,8 +539,15 @@ class SkinWeightsData(base.MayaCustomData, object):
         short_name = dcc.node_short_name(mesh)
         transfer_mesh = None
 
-        if shape_utils.has_shape_of_type(mesh, 'mesh'):
-            orig_mesh = self._import_mesh_obj(data_path)
+        if shape_utils.has_shape_of_type(mesh, 'mesh') and not self._is_mesh_fingerprint_compatible(mesh, data_path):
+            orig_mesh = None
+            transferred_weights = self._transfer_influence_weights(data_path, mesh, skin_weights)
+            if transferred_weights is not None:
+                skin_weights = transferred_weights
+                LOGGER.info(
+                    'Import skin weights: mesh topology does not match. Weights transferred from stored rest mesh')
+            else:
+                orig_mesh = self._import_mesh_obj(data_path)
             if orig_mesh:
                 mesh_match = geo_utils.is_mesh_compatible(orig_mesh, mesh)
                 if not mesh_match:
@@ -374,52 +586,42 @@ class SkinWeightsData(base.MayaCustomData, object):
         dcc.set_attribute_value(skin_cluster, 'normalizeWeights', 0)
         deform_utils.set_skin_weights_to_zero(skin_cluster)
 
-        influence_index = 0
         influence_index_dict = deform_utils.get_skin_influences(skin_cluster, return_dict=True)
-        progress_bar = progressbar.ProgressBar('Import Skin', len(influence_dict.keys()))
+        influence_weights = dict()
+        stored_indices = dict()
         for influence in influences:
             orig_influence = influence
             if influence.count('|') > 1:
                 split_influence = influence.split('|')
                 if len(split_influence) > 1:
                     influence = split_influence[-1]
-            progress_bar.status('Importing skin mesh: {}, influence: {}'.format(short_name, influence))
+            if skin_weights is not None:
+                stored_index = influence_dict[orig_influence].get('index', None)
+                if stored_index is None:
+                    LOGGER.warning('Weights msissing for influence: {}. Skipping it ...'.format(influence))
+                elif influence in influence_index_dict:
+                    stored_indices[stored_index] = influence_index_dict[influence]
+                continue
             if 'weights' not in influence_dict[orig_influence]:
                 LOGGER.warning('Weights msissing for influence: {}. Skipping it ...'.format(influence))
                 continue
             weights = influence_dict[orig_influence]['weights']
-            if influence not in influence_index_dict:
+            if influence not in influence_index_dict or weights is None:
                 continue
-            index = influence_index_dict[influence]
+            influence_weights[influence_index_dict[influence]] = weights
 
-            # attr = '{}.weightList[*].weights[{}]'.format(skin_cluster, index)
-            # NOTE: his was not faster, zipping zero weights is much faster than setting all the weights
-            # maya.cmds.setAttr(attr, *weights )
-
-            for i in range(len(weights)):
-                weight = float(weights[i])
-                if weight == 0 or weight < 0.0001:
-                    continue
-                attr = '{}.weightList[{}].weights[{}]'.format(skin_cluster, i, index)
-                maya.cmds.setAttr(attr, weight)
-            progress_bar.inc()
-
-            if progress_bar.break_signaled():
-                break
-            influence_index += 1
-        progress_bar.end()
+        # All weights are pushed to the skin cluster in a single API call
+        if skin_weights is not None:
+            self._set_sparse_skin_weights(skin_cluster, skin_weights, stored_indices)
+        else:
+            skin_utils.set_skin_weights(skin_cluster, influence_weights)
 
         maya.cmds.skinCluster(skin_cluster, edit=True, normalizeWeights=1)
         maya.cmds.skinCluster(skin_cluster, edit=True, forceNormalizeWeights=True)
 
         settings_path = path_utils.join_path(data_path, 'settings.info')
         if path_utils.is_file(settings_path):
-            lines = fileio.get_file_lines(settings_path)
-            for line in lines:
-                test_line = line.strip()
-                if not test_line:
-                    continue
-                line_list = eval(line)
+            for line_list in codec.iterate_values(settings_path):
                 attr_name = line_list[0]
                 value = line_list[1]
                 if attr_name == 'blendWeights':
@@ -433,15 +635,96 @@ class SkinWeightsData(base.MayaCustomData, object):
             deform_utils.skin_mesh_from_mesh(mesh, transfer_mesh)
             dcc.delete_node(mesh)
 
-        LOGGER.info('Import skinCluster weights: {} from {}'.format(short_name, data_path))
+        LOGGER.info('Import skinCluster weights: {} from {} ({:.2f} seconds)'.format(
+            short_name, data_path, time.time() - start_time))
 
         return True
 
-    def _get_influences(self, folder_path):
+    def _transfer_influence_weights(self, data_path, mesh, skin_weights):
+        """
+        Internal function that transfers given sparse weights into the points of the given mesh
+        Weights are transferred from the rest mesh stored in given path using closest point barycentric interpolation
+        :param data_path: str
+        :param mesh: str
+        :param skin_weights: SkinWeights or None, sparse weights read from given path
+        :return: SkinWeights or None, transferred weights or None if weights cannot be transferred
+        """
+
+        if skin_weights is None or not skintransfer.is_available():
+            return None
+        rest_mesh = skinarray.read_mesh(data_path)
+        if rest_mesh is None:
+            return None
+
+        # Target points are sampled from the undeformed shape of the mesh, so they are compared with the stored rest
+        # mesh in the same (bind) pose. Existing skin cluster input shape is used to match the exported rest mesh
+        skin_cluster = deform_utils.find_deformer_by_type(mesh, 'skinCluster')
+        target_shape = (skin_utils.get_skin_input_shape(skin_cluster) if skin_cluster else None) or \
+            mesh_utils.get_original_shape(mesh) or mesh
+        rest_points, rest_triangles = rest_mesh
+        target_points = mesh_utils.get_mesh_points(target_shape, world=True)
+        if skintransfer.has_kdtree():
+            triangle_ids, barycentric = skintransfer.get_closest_triangles(rest_points, rest_triangles, target_points)
+        else:
+            triangle_ids = mesh_utils.get_closest_triangles(rest_points, rest_triangles, target_points)
+            barycentric = skintransfer.get_triangle_barycentric(
+                rest_points, rest_triangles, triangle_ids, target_points)
+
+        return skintransfer.transfer_weights(
+            skin_weights, rest_triangles, triangle_ids, barycentric, threshold=skinarray.PRUNE_THRESHOLD)
+
+    def _set_sparse_skin_weights(self, skin_cluster, skin_weights, stored_indices):
+        """
+        Internal function that sets given sparse weights into the given skin cluster
+        Stored influence indices are remapped to the logical indices of the skin cluster influences
+        :param skin_cluster: str
+        :param skin_weights: SkinWeights
+        :param stored_indices: dict(int, int), dictionary mapping stored influence indices with skin cluster
+            influence logical indices
+        :return: bool
+        """
+
+        skin_weights = skin_weights.remap_influences(stored_indices)
+
+        return skin_utils.set_sparse_skin_weights(
+            skin_cluster, skin_weights.get_vertices(), skin_weights.influences, skin_weights.weights)
+
+    def _read_skin_data(self, folder_path):
+        """
+        Internal function that reads the influences data and the sparse weights (if available) stored in the given
+        directory. This function is called from worker threads, so it must not use Maya API
+        :param folder_path: str
+        :return: tuple(dict, SkinWeights or None)
+        """
+
+        return self._get_influences(folder_path, parallel=False), self._get_skin_weights(folder_path)
+
+    def _get_skin_weights(self, folder_path, mmap=False):
+        """
+        Internal function that returns the sparse weights stored in the given directory
+        :param folder_path: str
+        :param mmap: bool, Whether to memory-map sparse weights file
+        :return: SkinWeights or None, sparse weights or None if directory does not contain a sparse weights file
+        """
+
+        if not skinarray.has_weights_file(folder_path):
+            return None
+        if not skinarray.is_available():
+            LOGGER.warning(
+                'NumPy is not available. Impossible to read skin weights file: "{}"'.format(
+                    skinarray.get_weights_file(folder_path)))
+            return None
+
+        return skinarray.SkinWeights.from_data(skinarray.read_weights(folder_path, mmap=mmap))
+
+    def _get_influences(self, folder_path, mmap=False, parallel=True):
         """
         Internal function that returns a dictionary containing influences data from influence files
         contained in the given directory
         :param folder_path: str, path that contains influence file
+        :param mmap: bool, Whether to memory-map sparse weights file (if available)
+        :param parallel: bool, Whether to read legacy weight files in a worker pool. Should be False if this
+            function is already running in a worker pool
         :return: dict, influence data
         """
 
@@ -454,66 +737,24 @@ class SkinWeightsData(base.MayaCustomData, object):
         if not path_utils.is_file(info_file):
             return influence_dict
 
-        info_lines = fileio.get_file_lines(info_file)
-        for line in info_lines:
-            if not line:
-                continue
-            line_dict = eval(line)
+        for line_dict in codec.iterate_values(info_file):
             influence_dict.update(line_dict)
 
-        for influence in files:
-            if not influence.endswith('.weights') or influence == 'influence.info':
-                continue
-            read_thread = MayaReadWeightFileThread()
-            try:
-                influence_dict = read_thread.run(influence_dict, folder_path, influence)
-            except Exception as exc:
-                LOGGER.error(
-                    'Errors with influence "{}" while reading weight file: "{}" | {}'.format(influence, info_file, exc))
-
-        return influence_dict
-
-
-class MayaLoadWeightFileThread(threading.Thread, object):
-    def __init__(self):
-        super(MayaLoadWeightFileThread, self).__init__()
-
-    def run(self, influence_index, skin, weights, file_path):
-        influence_name = deform_utils.get_skin_influence_at_index(influence_index, skin)
-        if not influence_name or not dcc.node_exists(influence_name):
-            return
-        weight_path = fileio.create_file('{}.weights'.format(influence_name), file_path)
-        if not path_utils.is_file(weight_path):
-            LOGGER.warning('"{}" is not a valid path to save skin weights into!'.format(file_path))
-            return
-
-        writer = fileio.FileWriter(weight_path)
-        writer.write_line(weights)
-
-        influence_position = dcc.node_world_space_translation(influence_name)
-
-        return "{'%s' : {'position' : %s}}" % (influence_name, str(influence_position))
-
-
-class MayaReadWeightFileThread(threading.Thread):
-    def __init__(self):
-        super(MayaReadWeightFileThread, self).__init__()
-
-    def run(self, influence_dict, folder_path, influence):
-        file_path = path_utils.join_path(folder_path, influence)
-
-        influence = influence.split('.')[0]
-
-        lines = fileio.get_file_lines(file_path)
-
-        if not lines:
-            influence_dict[influence]['weights'] = None
+        # Sparse weights are not densified per influence: they are read by _get_skin_weights function
+        if skinarray.has_weights_file(folder_path):
             return influence_dict
 
-        weights = eval(lines[0])
-
-        if influence in influence_dict:
-            influence_dict[influence]['weights'] = weights
+        weight_files = [weight_file for weight_file in files if weight_file.endswith('.weights')]
+        weight_paths = [path_utils.join_path(folder_path, weight_file) for weight_file in weight_files]
+        if parallel:
+            with workers.WorkerPool() as pool:
+                weights_list = pool.map(read_weight_file, weight_paths)
+        else:
+            weights_list = [read_weight_file(weight_path) for weight_path in weight_paths]
+        for weight_file, weights in zip(weight_files, weights_list):
+            influence = weight_file.split('.')[0]
+            if influence in influence_dict:
+                influence_dict[influence]['weights'] = weights
 
         return influence_dict
 
@@ -588,12 +829,19 @@ class NgSkinWeightsData(SkinWeightsData, object):
 
         file_folder = os.path.dirname(file_path)
 
+        # NgSkinTools layers data is compressed in the worker pool after the data of all meshes is retrieved
+        compress = kwargs.get('compress', True)
+
         # Check that all objects that we are going to export have at least one skin cluster node associated
         # Make sure also that all objects skin output folder have been created
+        # Skin clusters, influences and influence positions of all objects are gathered in a single pass and cached
+        # Skin weights are not exported: they are already stored within NgSkinTools layers data
+        skin_query = skin_utils.SkinClusterQuery()
         obj_dirs = OrderedDict()
         skin_nodes = OrderedDict()
         geo_paths = OrderedDict()
-        skin_weights = OrderedDict()
+        mesh_fingerprints = dict()
+        reuse_mesh_objs = dict()
         for obj in objects:
             if shape_utils.is_a_shape(obj):
                 obj = dcc.node_parent(obj, full_path=True)
@@ -605,73 +853,92 @@ class NgSkinWeightsData(SkinWeightsData, object):
             if obj_filename.find(':') > -1:
                 obj_filename = obj_filename.replace(':', '-')
 
-            skin = deform_utils.find_deformer_by_type(obj, 'skinCluster')
+            skin = skin_query.get_skin_cluster(obj)
             if not skin:
                 LOGGER.warning('Skin exported failed! No skinCluster node found on "{}"'.format(obj))
                 return False
 
+            # If mesh did not change since last export, we keep the already exported OBJ mesh
             geo_path = path_utils.join_path(file_folder, obj_filename)
+            keep_files = list()
+            if shape_utils.has_shape_of_type(obj, 'mesh'):
+                mesh_fingerprints[obj] = self._get_mesh_fingerprint(obj, skin)
+                if mesh_utils.is_same_mesh(mesh_fingerprints[obj], self._read_mesh_fingerprint(geo_path)) and \
+                        path_utils.is_file(path_utils.join_path(geo_path, 'mesh.obj')):
+                    keep_files = ['mesh.obj', MESH_FINGERPRINT_FILE]
             if path_utils.is_dir(geo_path):
-                folder.delete_folder(obj_filename, file_folder)
-            geo_path = folder.create_folder(obj_filename, file_folder)
+                if keep_files:
+                    self._clean_data_folder(geo_path, keep_files)
+                else:
+                    folder.delete_folder(obj_filename, file_folder)
+            if not path_utils.is_dir(geo_path):
+                geo_path = folder.create_folder(obj_filename, file_folder)
             if not geo_path:
                 LOGGER.error(
                     'Unable to create skin weights directory: "{}" in "{}"'.format(obj_filename, file_folder))
                 return False
 
-            weights = deform_utils.get_skin_weights(skin)
-
             obj_dirs[obj] = obj_filename
+            reuse_mesh_objs[obj] = bool(keep_files)
             skin_nodes[obj] = skin
             geo_paths[obj] = geo_path
-            skin_weights[obj] = weights
-
-        for (obj, skin_node), (_, geo_path), (_, skin_weights) in zip(
-                skin_nodes.items(), geo_paths.items(), skin_weights.items()):
-
-            LOGGER.info('Exporting weights: {} > {} --> "{}"'.format(obj, skin_node, geo_path))
-
-            info_lines = list()
-            info_file = fileio.create_file('influence.info', geo_path)
-
-            for influence in skin_weights:
-                if influence is None or influence == 'None':
-                    continue
-                weight_list = skin_weights[influence]
-                if not weight_list:
-                    continue
-
-                influence_name = deform_utils.get_skin_influence_at_index(influence, skin_node)
-                if not influence_name or not dcc.node_exists(influence_name):
-                    continue
-
-                influence_position = dcc.node_world_space_translation(influence_name)
-                influence_line = "{'%s' : {'position' : %s}}" % (influence_name, str(influence_position))
-                info_lines.append(influence_line)
-
-            writer = fileio.FileWriter(info_file)
-            writer.write(info_lines)
 
-            settings_file = fileio.create_file('settings.info', geo_path)
-            setting_lines = list()
-            if shape_utils.has_shape_of_type(obj, 'mesh'):
-                self._export_mesh_obj(obj, geo_path)
-
-            setting_lines.append("['skinNodeName', '{}']".format(dcc.node_short_name(skin_node)))
-            if dcc.attribute_exists(skin_node, 'blendWeights'):
-                blend_weights = deform_utils.get_skin_blend_weights(skin_node)
-                setting_lines.append("['blendWeights', {}]".format(blend_weights))
-            if dcc.attribute_exists(skin_node, 'skinningMethod'):
-                skin_method = dcc.get_attribute_value(skin_node, 'skinningMethod')
-                setting_lines.append("['skinningMethod', {}]".format(skin_method))
-
-            write_settings = fileio.FileWriter(settings_file)
-            write_settings.write(setting_lines)
-
-            ng_skin_file_name = os.path.join(geo_path, 'ngdata.json')
-            ngst_api.export_json(obj, file=ng_skin_file_name)
+        # NgSkinTools layers data of all meshes is retrieved first, in the main thread
+        ng_data_files = OrderedDict()
+        with progress.DataProgress('Export Ng Layers', len(skin_nodes)) as layers_progress:
+            for obj, geo_path in geo_paths.items():
+                if not layers_progress.step(status='Exporting Ng layers: {}', status_args=(obj,)):
+                    LOGGER.warning('Skin weights export cancelled by user')
+                    return False
+                ng_data_files[obj] = path_utils.join_path(geo_path, NG_DATA_FILE)
+                ngst_api.export_json(obj, file=ng_data_files[obj])
+
+        with progress.DataProgress('Export Skin', len(skin_nodes)) as export_progress, \
+                workers.WorkerPool(max_workers=kwargs.get('max_workers', None)) as pool:
+            for obj, skin_node in skin_nodes.items():
+                geo_path = geo_paths[obj]
+                if export_progress.is_cancelled():
+                    break
+
+                LOGGER.info('Exporting weights: {} > {} --> "{}"'.format(obj, skin_node, geo_path))
+
+                if compress:
+                    pool.submit(compress_file, ng_data_files[obj])
+
+                info_lines = list()
+                for influence_name in skin_query.get_influences(skin_node).values():
+                    influence_position = skin_query.get_influence_position(influence_name)
+                    info_lines.append(codec.encode({influence_name: {'position': influence_position}}))
+
+                pool.submit(write_info_file, geo_path, 'influence.info', info_lines)
+
+                setting_lines = list()
+                if reuse_mesh_objs[obj]:
+                    LOGGER.info('Mesh "{}" did not change since last export. Skipping OBJ export ...'.format(obj))
+                elif shape_utils.has_shape_of_type(obj, 'mesh'):
+                    self._export_mesh_obj(obj, geo_path)
+                if mesh_fingerprints.get(obj):
+                    pool.submit(
+                        codec.write_values, path_utils.join_path(geo_path, MESH_FINGERPRINT_FILE),
+                        [mesh_fingerprints[obj]])
+
+                setting_lines.append(codec.encode(['skinNodeName', dcc.node_short_name(skin_node)]))
+                if dcc.attribute_exists(skin_node, 'blendWeights'):
+                    blend_weights = deform_utils.get_skin_blend_weights(skin_node)
+                    setting_lines.append(codec.encode(['blendWeights', blend_weights]))
+                if dcc.attribute_exists(skin_node, 'skinningMethod'):
+                    skin_method = dcc.get_attribute_value(skin_node, 'skinningMethod')
+                    setting_lines.append(codec.encode(['skinningMethod', skin_method]))
+
+                pool.submit(write_info_file, geo_path, 'settings.info', setting_lines)
+                export_progress.step(status='Exporting skin weights: {}', status_args=(obj,))
+
+        if export_progress.cancelled:
+            LOGGER.warning('Skin weights export cancelled by user')
+            return False
 
-            LOGGER.info('Skin weights exported successfully: {} > {} --> "{}"'.format(obj, skin_node, geo_path))
+        for obj, skin_node in skin_nodes.items():
+            LOGGER.info('Skin weights exported successfully: {} > {} --> "{}"'.format(obj, skin_node, geo_paths[obj]))
 
         data_to_save = OrderedDict()
         for obj, obj_filename in obj_dirs.items():
@@ -688,7 +955,7 @@ class NgSkinWeightsData(SkinWeightsData, object):
 
         return True
 
-    def _import_skin_weights(self, data_path, mesh):
+    def _import_skin_weights(self, data_path, mesh, influence_dict=None, skin_weights=None):
         if not dcc.node_exists(mesh) or not os.path.isdir(data_path):
             return False
 
@@ -701,7 +968,10 @@ class NgSkinWeightsData(SkinWeightsData, object):
             LOGGER.warning('NgSkinTools 2.0 is not installed. Impossible to import ngSkin data')
             return False
 
-        ng_skin_data_path = path_utils.join_path(data_path, 'ngdata.json')
+        ng_skin_data_path = path_utils.join_path(data_path, NG_DATA_FILE)
+        ng_compressed_data_path = '{}{}'.format(ng_skin_data_path, COMPRESSED_FILE_EXTENSION)
+        if path_utils.is_file(ng_compressed_data_path):
+            ng_skin_data_path = ng_compressed_data_path
         if not path_utils.is_file(ng_skin_data_path):
             LOGGER.warning(
                 'No Ng Skin Data file found: "{}", aborting import skin weights operation ...'.format(
@@ -721,7 +991,8 @@ class NgSkinWeightsData(SkinWeightsData, object):
 
         LOGGER.info('Importing skin clusters {} --> "{}"'.format(mesh, data_path))
 
-        influence_dict = self._get_influences(data_path)
+        if influence_dict is None:
+            influence_dict = self._get_influences(data_path)
         if not influence_dict:
             LOGGER.warning('No influences data found for: {}'.format(mesh))
             return False
@@ -736,7 +1007,7 @@ class NgSkinWeightsData(SkinWeightsData, object):
         short_name = dcc.node_short_name(mesh)
         transfer_mesh = None
 
-        if shape_utils.has_shape_of_type(mesh, 'mesh'):
+        if shape_utils.has_shape_of_type(mesh, 'mesh') and not self._is_mesh_fingerprint_compatible(mesh, data_path):
             orig_mesh = self._import_mesh_obj(data_path)
             if orig_mesh:
                 mesh_match = geo_utils.is_mesh_compatible(orig_mesh, mesh)
@@ -770,12 +1041,7 @@ class NgSkinWeightsData(SkinWeightsData, object):
         settings_data = dict()
         settings_path = path_utils.join_path(data_path, 'settings.info')
         if path_utils.is_file(settings_path):
-            lines = fileio.get_file_lines(settings_path)
-            for line in lines:
-                test_line = line.strip()
-                if not test_line:
-                    continue
-                line_list = eval(line)
+            for line_list in codec.iterate_values(settings_path):
                 attr_name = line_list[0]
                 value = line_list[1]
                 settings_data[attr_name] = value
@@ -798,7 +1064,15 @@ class NgSkinWeightsData(SkinWeightsData, object):
         config.use_label_matching = True
         config.use_name_matching = True
 
-        ngst_api.import_json(mesh, file=ng_skin_data_path, influences_mapping_config=config)
+        if ng_skin_data_path.endswith(COMPRESSED_FILE_EXTENSION):
+            temp_folder = tempfile.mkdtemp()
+            try:
+                ngst_api.import_json(
+                    mesh, file=decompress_file(ng_skin_data_path, temp_folder), influences_mapping_config=config)
+            finally:
+                shutil.rmtree(temp_folder, ignore_errors=True)
+        else:
+            ngst_api.import_json(mesh, file=ng_skin_data_path, influences_mapping_config=config)
 
         maya.cmds.skinCluster(skin_cluster, edit=True, normalizeWeights=1)
         maya.cmds.skinCluster(skin_cluster, edit=True, forceNormalizeWeights=True)
@@ -819,18 +1093,14 @@ class NgSkinWeightsData(SkinWeightsData, object):
 
         return True
 
-    def _get_influences(self, folder_path):
+    def _get_influences(self, folder_path, mmap=False, parallel=True):
         influence_dict = dict()
 
         info_file = path_utils.join_path(folder_path, 'influence.info')
         if not path_utils.is_file(info_file):
             return influence_dict
 
-        info_lines = fileio.get_file_lines(info_file)
-        for line in info_lines:
-            if not line:
-                continue
-            line_dict = eval(line)
+        for line_dict in codec.iterate_values(info_file):
             influence_dict.update(line_dict)
 
         return influence_dict
@@ -855,3 +1125,115 @@ class NgSkinClusterWeights(data.DataItem, object):
         super(NgSkinClusterWeights, self).__init__(*args, **kwargs)
 
         self.set_data_class(NgSkinWeightsData)
+
+
+def write_weight_file(folder_path, influence_name, weights):
+    """
+    Writes legacy per influence skin weights file
+    :param folder_path: str, mesh skin data folder
+    :param influence_name: str
+    :param weights: list(float) or numpy.array
+    :return: str, path of the written file
+    """
+
+    weight_path = fileio.create_file('{}.weights'.format(influence_name), folder_path)
+    if not path_utils.is_file(weight_path):
+        LOGGER.warning('"{}" is not a valid path to save skin weights into!'.format(folder_path))
+        return None
+
+    writer = fileio.FileWriter(weight_path)
+    writer.write_line(codec.encode(weights if hasattr(weights, 'tolist') else list(weights)))
+
+    return weight_path
+
+
+def read_weight_file(file_path):
+    """
+    Reads legacy per influence skin weights file
+    :param file_path: str
+    :return: list(float) or None
+    """
+
+    try:
+        return codec.read_value(file_path)
+    except Exception as exc:
+        LOGGER.error('Errors while reading weight file: "{}" | {}'.format(file_path, exc))
+        return None
+
+
+def write_sparse_weights_file(
+        folder_path, influence_weights, compress=True, delta=False, max_deltas=10,
+        prune_threshold=skinarray.PRUNE_THRESHOLD, max_influences=None):
+    """
+    Encodes given per influence weights into sparse weight arrays and writes them into disk
+    :param folder_path: str, mesh skin data folder
+    :param influence_weights: list(tuple(int, list(float)))
+    :param compress: bool
+    :param delta: bool, Whether to only write the weights that changed since last export as a weights delta
+    :param max_deltas: int, number of stored weights deltas after which deltas are folded into the weights file
+    :param prune_threshold: float, weights lower or equal than this value are not stored
+    :param max_influences: int or None, maximum number of influences stored per vertex
+    :return: str or None, path of the written file
+    """
+
+    vertices, influences, weights, vertex_count = skinarray.pack_weights(
+        influence_weights, threshold=prune_threshold, max_influences=max_influences)
+    if not delta:
+        return skinarray.write_weights(
+            folder_path, vertices, influences, weights, vertex_count, len(influence_weights), compress=compress)
+
+    delta_file = skinarray.write_delta_weights(
+        folder_path, vertices, influences, weights, vertex_count, len(influence_weights), compress=compress)
+    if len(skinarray.get_delta_files(folder_path)) > max_deltas:
+        skinarray.compact_weights(folder_path, compress=compress)
+
+    return delta_file
+
+
+def compress_file(file_path, remove_source=True):
+    """
+    Compresses given file using gzip. Compressed file is stored next to the given one with .gz extension
+    :param file_path: str
+    :param remove_source: bool, Whether to remove the uncompressed file after compressing it
+    :return: str, path of the compressed file
+    """
+
+    compressed_path = '{}{}'.format(file_path, COMPRESSED_FILE_EXTENSION)
+    with open(file_path, 'rb') as source_file, gzip.open(compressed_path, 'wb') as compressed_file:
+        shutil.copyfileobj(source_file, compressed_file)
+    if remove_source:
+        os.remove(file_path)
+
+    return compressed_path
+
+
+def decompress_file(file_path, folder_path):
+    """
+    Decompresses given gzip file into the given folder
+    :param file_path: str
+    :param folder_path: str
+    :return: str, path of the decompressed file
+    """
+
+    decompressed_path = path_utils.join_path(
+        folder_path, os.path.basename(file_path)[:-len(COMPRESSED_FILE_EXTENSION)])
+    with gzip.open(file_path, 'rb') as compressed_file, open(decompressed_path, 'wb') as decompressed_file:
+        shutil.copyfileobj(compressed_file, decompressed_file)
+
+    return decompressed_path
+
+
+def write_info_file(folder_path, file_name, lines):
+    """
+    Writes given lines into an info file (influence.info, settings.info, ...)
+    :param folder_path: str, mesh skin data folder
+    :param file_name: str
+    :param lines: list(str)
+    :return: str, path of the written file
+    """
+
+    info_file = fileio.create_file(file_name, folder_path)
+    writer = fileio.FileWriter(info_file)
+    writer.write(lines)
+
+    return info_file
@@ -0,0 +1,215 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to transfer sparse skin weights between meshes with different topology
+Each target point is mapped to the closest point of the closest triangle of the source rest mesh and its weights
+are blended from the weights of the triangle vertices using barycentric coordinates
+All the operations are vectorized using NumPy. If SciPy is available, a KD-tree is used to find closest triangles
+"""
+
+from __future__ import print_function, division, absolute_import
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+from tpRigToolkit.dccs.maya.data import skinarray
+
+# Number of closest triangle candidates (by centroid) tested for each target point
+TRIANGLE_CANDIDATES = 8
+
+# Number of target points processed at once. Bounds the memory used by candidate arrays
+CHUNK_SIZE = 65536
+
+
+def is_available():
+    """
+    Returns whether or not skin weights transfer is available
+    :return: bool
+    """
+
+    return numpy is not None
+
+
+def has_kdtree():
+    """
+    Returns whether or not KD-tree closest triangles lookup is available
+    :return: bool
+    """
+
+    return numpy is not None and cKDTree is not None
+
+
+def get_closest_triangles(points, triangles, target_points, candidates=TRIANGLE_CANDIDATES):
+    """
+    Returns, for each one of the target points, the closest triangle and the barycentric coordinates of the closest
+    point in that triangle. Requires SciPy
+    :param points: numpy.array, (N, 3) array of source mesh points
+    :param triangles: numpy.array, (M, 3) array of source triangle vertex indices
+    :param target_points: numpy.array, (P, 3) array of target points
+    :param candidates: int, number of closest triangles (by centroid) tested for each target point
+    :return: tuple(numpy.array, numpy.array), (P, ) triangle indices and (P, 3) barycentric coordinates
+    """
+
+    points = numpy.asarray(points, dtype='float64')
+    triangles = numpy.asarray(triangles, dtype='int64')
+    target_points = numpy.asarray(target_points, dtype='float64')
+
+    tree = cKDTree(points[triangles].mean(axis=1))
+    candidates = max(1, min(candidates, len(triangles)))
+
+    triangle_ids = numpy.empty(len(target_points), dtype='int64')
+    barycentric = numpy.empty((len(target_points), 3), dtype='float64')
+    for start in range(0, len(target_points), CHUNK_SIZE):
+        end = min(start + CHUNK_SIZE, len(target_points))
+        chunk_points = target_points[start:end]
+        _, candidate_ids = tree.query(chunk_points, k=candidates)
+        candidate_ids = candidate_ids.reshape(len(chunk_points), candidates)
+
+        corners = points[triangles[candidate_ids]]
+        query_points = numpy.repeat(chunk_points, candidates, axis=0)
+        chunk_barycentric = get_barycentric_coordinates(
+            query_points, corners[:, :, 0].reshape(-1, 3), corners[:, :, 1].reshape(-1, 3),
+            corners[:, :, 2].reshape(-1, 3))
+        closest_points = numpy.einsum('nk,nkj->nj', chunk_barycentric, corners.reshape(-1, 3, 3))
+        distances = ((closest_points - query_points) ** 2).sum(axis=1).reshape(len(chunk_points), candidates)
+
+        best = distances.argmin(axis=1)
+        rows = numpy.arange(len(chunk_points))
+        triangle_ids[start:end] = candidate_ids[rows, best]
+        barycentric[start:end] = chunk_barycentric.reshape(len(chunk_points), candidates, 3)[rows, best]
+
+    return triangle_ids, barycentric
+
+
+def get_triangle_barycentric(points, triangles, triangle_ids, target_points):
+    """
+    Returns barycentric coordinates of the closest point of the given triangles to each one of the target points
+    :param points: numpy.array, (N, 3) array of source mesh points
+    :param triangles: numpy.array, (M, 3) array of source triangle vertex indices
+    :param triangle_ids: numpy.array, (P, ) array with the triangle index of each target point
+    :param target_points: numpy.array, (P, 3) array of target points
+    :return: numpy.array, (P, 3) barycentric coordinates
+    """
+
+    points = numpy.asarray(points, dtype='float64')
+    corners = points[numpy.asarray(triangles, dtype='int64')[triangle_ids]]
+
+    return get_barycentric_coordinates(
+        numpy.asarray(target_points, dtype='float64'), corners[:, 0], corners[:, 1], corners[:, 2])
+
+
+def get_barycentric_coordinates(points, a, b, c):
+    """
+    Returns barycentric coordinates of the closest point of each triangle (a, b, c) to each one of the given points
+    Vectorized version of the closest point on triangle test from Real-Time Collision Detection (Ericson)
+    :param points: numpy.array, (N, 3) array of points
+    :param a: numpy.array, (N, 3) array with first vertex of each triangle
+    :param b: numpy.array, (N, 3) array with second vertex of each triangle
+    :param c: numpy.array, (N, 3) array with third vertex of each triangle
+    :return: numpy.array, (N, 3) barycentric coordinates
+    """
+
+    ab = b - a
+    ac = c - a
+    ap = points - a
+    bp = points - b
+    cp = points - c
+    d1 = (ab * ap).sum(axis=1)
+    d2 = (ac * ap).sum(axis=1)
+    d3 = (ab * bp).sum(axis=1)
+    d4 = (ac * bp).sum(axis=1)
+    d5 = (ab * cp).sum(axis=1)
+    d6 = (ac * cp).sum(axis=1)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    # Point projects inside the face region
+    denom = va + vb + vc
+    v = _safe_divide(vb, denom)
+    w = _safe_divide(vc, denom)
+    barycentric = numpy.stack((1.0 - v - w, v, w), axis=1)
+
+    # Regions are applied from lowest to highest priority, so the first matching region of the original test wins
+    mask = (va <= 0.0) & ((d4 - d3) >= 0.0) & ((d5 - d6) >= 0.0)
+    w = _safe_divide((d4 - d3), (d4 - d3) + (d5 - d6))
+    barycentric[mask] = numpy.stack((numpy.zeros_like(w), 1.0 - w, w), axis=1)[mask]
+    mask = (vb <= 0.0) & (d2 >= 0.0) & (d6 <= 0.0)
+    w = _safe_divide(d2, d2 - d6)
+    barycentric[mask] = numpy.stack((1.0 - w, numpy.zeros_like(w), w), axis=1)[mask]
+    barycentric[(d6 >= 0.0) & (d5 <= d6)] = (0.0, 0.0, 1.0)
+    mask = (vc <= 0.0) & (d1 >= 0.0) & (d3 <= 0.0)
+    v = _safe_divide(d1, d1 - d3)
+    barycentric[mask] = numpy.stack((1.0 - v, v, numpy.zeros_like(v)), axis=1)[mask]
+    barycentric[(d3 >= 0.0) & (d4 <= d3)] = (0.0, 1.0, 0.0)
+    barycentric[(d1 <= 0.0) & (d2 <= 0.0)] = (1.0, 0.0, 0.0)
+
+    return barycentric
+
+
+def transfer_weights(skin_weights, triangles, triangle_ids, barycentric, threshold=0.0, max_influences=None):
+    """
+    Transfers given sparse skin weights into target points
+    :param skin_weights: skinarray.SkinWeights, sparse skin weights of the source mesh
+    :param triangles: numpy.array, (M, 3) array of source triangle vertex indices
+    :param triangle_ids: numpy.array, (P, ) array with the closest source triangle of each target point
+    :param barycentric: numpy.array, (P, 3) array with the barycentric coordinates of each target point
+    :param threshold: float, transferred weights lower or equal than this value are discarded
+    :param max_influences: int or None, maximum number of influences per target point
+    :return: skinarray.SkinWeights, sparse skin weights of the target points
+    """
+
+    target_count = len(triangle_ids)
+    influence_count = max(1, skin_weights.influence_count)
+    starts = skin_weights.offsets[:-1]
+    counts = skin_weights.get_counts()
+    influences = skin_weights.influences.astype('int64')
+    weights = skin_weights.weights.astype('float64')
+
+    corners = numpy.asarray(triangles, dtype='int64')[triangle_ids]
+    target_range = numpy.arange(target_count)
+    rows, columns, values = list(), list(), list()
+    for corner in range(3):
+        source_vertices = corners[:, corner]
+        corner_counts = counts[source_vertices]
+        total = int(corner_counts.sum())
+        offsets = numpy.arange(total) - numpy.repeat(numpy.cumsum(corner_counts) - corner_counts, corner_counts)
+        ids = numpy.repeat(starts[source_vertices], corner_counts) + offsets
+        rows.append(numpy.repeat(target_range, corner_counts))
+        columns.append(influences[ids])
+        values.append(weights[ids] * numpy.repeat(barycentric[:, corner], corner_counts))
+
+    # Sum contributions of the same influence coming from different triangle vertices
+    keys = numpy.concatenate(rows) * influence_count + numpy.concatenate(columns)
+    keys, inverse = numpy.unique(keys, return_inverse=True)
+    values = numpy.bincount(inverse.ravel(), weights=numpy.concatenate(values))
+    target_weights = skinarray.SkinWeights.from_triplets(
+        keys // influence_count, keys % influence_count, values, target_count, skin_weights.influence_count)
+
+    target_weights = target_weights.prune(threshold, normalize=False)
+    if max_influences:
+        target_weights = target_weights.limit_influences(max_influences, normalize=False)
+
+    return target_weights.normalize()
+
+
+def _safe_divide(numerator, denominator):
+    """
+    Internal function that divides given arrays element wise returning zero where denominator is zero
+    :param numerator: numpy.array
+    :param denominator: numpy.array
+    :return: numpy.array
+    """
+
+    result = numpy.zeros_like(numerator, dtype='float64')
+    numpy.divide(numerator, denominator, out=result, where=denominator != 0)
+
+    return result
@@ -0,0 +1,151 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains bounded worker pool used by data classes to run file I/O tasks in parallel
+Only disk I/O, encoding and decoding tasks should be submitted: Maya API calls must stay in the main thread
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import logging
+import traceback
+import multiprocessing
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
+LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
+
+MAX_WORKERS = 8
+
+
+def get_default_worker_count():
+    """
+    Returns the default number of workers used by worker pools
+    :return: int
+    """
+
+    try:
+        cpu_count = multiprocessing.cpu_count()
+    except NotImplementedError:
+        cpu_count = 1
+
+    return max(1, min(MAX_WORKERS, cpu_count))
+
+
+class WorkerPool(object):
+    """
+    Bounded thread pool that runs tasks in the background while the main thread keeps working
+    Submitted tasks are waited for when the pool is closed
+    """
+
+    def __init__(self, max_workers=None):
+        self._max_workers = max_workers or get_default_worker_count()
+        self._pool = None
+        self._results = list()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.terminate()
+            return False
+        self.wait()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Submits a new task into the pool
+        :param fn: callable
+        :return: multiprocessing.pool.AsyncResult
+        """
+
+        result = self._apply(fn, args, kwargs)
+        self._results.append(result)
+
+        return result
+
+    def imap(self, fn, items, window=None):
+        """
+        Generator that runs given function for each one of the given items in the pool and yields the results in
+        the same order as the given items. Only a sliding window of items is submitted at once, so no more than
+        window results are kept in memory waiting to be consumed
+        :param fn: callable
+        :param items: iterable
+        :param window: int or None, maximum number of submitted items not consumed yet. Defaults to twice the number
+            of workers
+        :return: generator
+        """
+
+        window = max(1, window or self._max_workers * 2)
+        pending = deque()
+        for item in items:
+            pending.append(self._apply(fn, (item,), dict()))
+            if len(pending) >= window:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+    def map(self, fn, items):
+        """
+        Runs given function for each one of the given items in the pool and waits for all of them to finish
+        :param fn: callable
+        :param items: list
+        :return: list, results in the same order as the given items
+        """
+
+        return [result.get() for result in [self.submit(fn, item) for item in items]]
+
+    def wait(self):
+        """
+        Waits until all submitted tasks are finished and closes the pool
+        Raises the first error raised by any of the tasks
+        :return: list, result of all submitted tasks
+        """
+
+        try:
+            return [result.get() for result in self._results]
+        finally:
+            self._results = list()
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+
+    def _apply(self, fn, args, kwargs):
+        """
+        Internal function that runs given function in the pool without tracking its result
+        :param fn: callable
+        :param args: tuple
+        :param kwargs: dict
+        :return: multiprocessing.pool.AsyncResult
+        """
+
+        if self._pool is None:
+            self._pool = ThreadPool(self._max_workers)
+
+        return self._pool.apply_async(_run_task, (fn, args, kwargs))
+
+    def terminate(self):
+        """
+        Cancels all pending tasks and closes the pool
+        """
+
+        self._results = list()
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+
+def _run_task(fn, args, kwargs):
+    """
+    Internal function that runs a pool task logging the traceback of the errors raised in the worker thread
+    """
+
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        LOGGER.error('Error while running worker task "{}": {}'.format(
+            getattr(fn, '__name__', repr(fn)), traceback.format_exc()))
+        raise
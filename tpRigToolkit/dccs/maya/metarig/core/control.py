@@ -19,6 +19,7 @@ from tpDcc.dccs.maya.core import transform, attribute, shape
 from tpDcc.dccs.maya.meta import metaobject, metautils
 
 from tpRigToolkit.managers import names
+from tpRigToolkit.dccs.maya.core import control as control_utils
 
 LOGGER = logging.getLogger('tpRigToolkit-dccs-maya')
 
@@ -605,9 +606,16 @@ class RigControl(metaobject.MetaObject, object):
         # Axis order
         axis_order = control_data.get('axis_order', 'XYZ')
 
-        curveslib.create_curve(
-            curve_type=curve_type, curves_path=controls_path, curve_name='tempControl', curve_size=size,
-            translate_offset=offset, axis_order=axis_order, mirror=None, color=color, parent=self.meta_node)
+        # Shapes are resolved from the shared control shapes cache. Curves library is only used for control types
+        # that are not stored in the controls path libraries or for axis orders not supported by the cached path
+        control_shape = control_utils.get_control_shape(curve_type, controls_path=controls_path)
+        if control_shape and axis_order == 'XYZ':
+            control_utils.set_control_shapes(
+                self.meta_node, control_utils.scale_control_shapes(control_shape, size, offset=offset), color=color)
+        else:
+            curveslib.create_curve(
+                curve_type=curve_type, curves_path=controls_path, curve_name='tempControl', curve_size=size,
+                translate_offset=offset, axis_order=axis_order, mirror=None, color=color, parent=self.meta_node)
 
         if self.has_attr('create_root_group') and self.create_root_group:
             self.create_root()